@@ -0,0 +1,199 @@
+"""
+Analysis Cache - content-addressed cache for extracted text and profile-independent analysis
+Entries are keyed by the SHA-256 of the uploaded bytes plus the engine version, so
+re-uploads of the same file only rerun the cheap job-match / scoring stage
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from database import get_cached_value, set_cached_value, add_cache_stats, get_cache_stats
+
+HASH_CHUNK_SIZE = 64 * 1024
+
+# Seconds between writes of a process's pending hit/miss counts to analysis_cache_stats
+STATS_FLUSH_INTERVAL = 30
+
+
+def file_sha256(file_path):
+    """Hash a file's bytes in fixed-size chunks"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as fh:
+        for chunk in iter(lambda: fh.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class LRUCacheBackend:
+    """In-process cache evicting least recently used entries above max_bytes"""
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = OrderedDict()
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            if key in self._entries:
+                self.size -= len(self._entries.pop(key))
+            self._entries[key] = value
+            self.size += len(value)
+            while self.size > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+
+    def incr_stat(self, name):
+        with self._lock:
+            self._stats[name] = self._stats.get(name, 0) + 1
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, entries=len(self._entries), bytes=self.size)
+
+
+class SQLiteCacheBackend:
+    """Cache stored in the analysis_cache table, shared by every process using the database
+
+    Lookups only read. Hits and misses are counted in process and written with
+    the next cache write, every flush_interval seconds, or when stats are read.
+    """
+
+    def __init__(self, flush_interval=STATS_FLUSH_INTERVAL):
+        self.flush_interval = flush_interval
+        self._pending = {}
+        self._flushed_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _take_pending(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._flushed_at = time.monotonic()
+            return pending
+
+    def _restore_pending(self, pending):
+        with self._lock:
+            for name, count in pending.items():
+                self._pending[name] = self._pending.get(name, 0) + count
+
+    def _flush(self):
+        pending = self._take_pending()
+        try:
+            add_cache_stats(pending)
+        except Exception:
+            self._restore_pending(pending)
+            raise
+
+    def get(self, key):
+        return get_cached_value(key)
+
+    def set(self, key, value):
+        pending = self._take_pending()
+        try:
+            set_cached_value(key, value, pending)
+        except Exception:
+            self._restore_pending(pending)
+            raise
+
+    def incr_stat(self, name):
+        with self._lock:
+            self._pending[name] = self._pending.get(name, 0) + 1
+            due = time.monotonic() - self._flushed_at >= self.flush_interval
+        if due:
+            self._flush()
+
+    def stats(self):
+        self._flush()
+        return get_cache_stats()
+
+
+class RedisCacheBackend:
+    """Cache stored in Redis with an expiry, shared by the API and all workers"""
+
+    def __init__(self, client, ttl=7 * 24 * 3600, prefix='analysis_cache'):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get(self, key):
+        return self.client.get(f"{self.prefix}:{key}")
+
+    def set(self, key, value):
+        self.client.set(f"{self.prefix}:{key}", value, ex=self.ttl)
+
+    def incr_stat(self, name):
+        self.client.hincrby(f"{self.prefix}:stats", name, 1)
+
+    def stats(self):
+        return {name: int(count) for name, count in self.client.hgetall(f"{self.prefix}:stats").items()}
+
+
+class AnalysisCache:
+    def __init__(self, backend, engine_version):
+        self.backend = backend
+        self.engine_version = engine_version
+
+    def _key(self, kind, content_hash):
+        return f"{kind}:{self.engine_version}:{content_hash}"
+
+    def _get(self, kind, content_hash):
+        try:
+            value = self.backend.get(self._key(kind, content_hash))
+            self.backend.incr_stat(f"{kind}_hits" if value is not None else f"{kind}_misses")
+            return value
+        except Exception as e:
+            print(f"Analysis cache read failed: {e}")
+            return None
+
+    def _set(self, kind, content_hash, value):
+        try:
+            self.backend.set(self._key(kind, content_hash), value)
+        except Exception as e:
+            print(f"Analysis cache write failed: {e}")
+
+    def get_text(self, content_hash):
+        return self._get('text', content_hash)
+
+    def set_text(self, content_hash, text):
+        self._set('text', content_hash, text)
+
+    def get_features(self, content_hash):
+        value = self._get('features', content_hash)
+        return json.loads(value) if value is not None else None
+
+    def set_features(self, content_hash, features):
+        self._set('features', content_hash, json.dumps(features))
+
+    def stats(self):
+        try:
+            stats = self.backend.stats()
+        except Exception as e:
+            return {'error': str(e)}
+        stats['backend'] = type(self.backend).__name__
+        stats['engineVersion'] = self.engine_version
+        return stats
+
+
+def make_cache(kind, engine_version, redis_client=None, max_bytes=64 * 1024 * 1024):
+    """Build a cache from a config name: 'lru', 'sqlite', 'redis' or 'none'"""
+    if kind == 'lru':
+        return AnalysisCache(LRUCacheBackend(max_bytes), engine_version)
+    if kind == 'sqlite':
+        return AnalysisCache(SQLiteCacheBackend(), engine_version)
+    if kind == 'redis':
+        if redis_client is None:
+            print("❌ Redis cache requested but Redis is unavailable; analysis cache disabled")
+            return None
+        return AnalysisCache(RedisCacheBackend(redis_client), engine_version)
+    return None
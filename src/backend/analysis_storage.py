@@ -0,0 +1,92 @@
+"""
+Analysis storage - split an analysis result into columns, skill rows and a compressed remainder
+Scores, the job match and section scores become resumes columns and skills
+become resume_skills rows, so analytics read them without parsing documents.
+Everything else (personal info, experience, education, ...) is kept as
+zlib-compressed JSON. Unpacking gives back the same dict: a field is only
+rebuilt from columns when that reproduces it exactly, otherwise it stays in
+the compressed part.
+"""
+
+import json
+import zlib
+
+# Section score columns, in calculate_section_scores order
+SECTION_COLUMNS = {
+    'Experience': 'experience_score',
+    'Education': 'education_score',
+    'Skills': 'skills_score',
+    'Projects': 'projects_score',
+    'Certifications': 'certifications_score'
+}
+
+# resumes columns written for every analysis
+ANALYSIS_COLUMNS = ('overall_score', 'job_match_percentage', 'skill_count', 'job_match',
+                    *SECTION_COLUMNS.values(), 'analysis_extra')
+
+COMPRESSION_LEVEL = 6
+
+
+def section_status(score):
+    """Status label shown for a section score"""
+    return 'excellent' if score >= 90 else 'good' if score >= 70 else 'average' if score >= 50 else 'poor'
+
+
+def _derived_fields(columns, skills):
+    """The analysis fields that columns and skill rows can rebuild"""
+    skill_list = [{'name': name, 'confidence': confidence, 'category': category}
+                  for name, category, confidence in skills]
+    fields = {
+        'overallScore': columns['overall_score'],
+        'skills': skill_list,
+        'sections': [
+            {'name': name, 'score': columns[column], 'status': section_status(columns[column]),
+             'found': columns[column] > 0}
+            for name, column in SECTION_COLUMNS.items() if columns[column] is not None
+        ]
+    }
+    if columns['job_match'] is not None:
+        job_match = json.loads(columns['job_match'])
+        fields['jobMatch'] = job_match
+        if isinstance(job_match, dict):
+            fields['keywords'] = {
+                'found': [skill['name'] for skill in skill_list],
+                'missing': job_match.get('missingSkills', []),
+                'density': len(skill_list)
+            }
+    return fields
+
+
+def pack_analysis(analysis):
+    """Return (columns, skills): resumes column values and (name, category, confidence) rows"""
+    skills = [(skill.get('name'), skill.get('category'), skill.get('confidence'))
+              for skill in analysis.get('skills', [])]
+
+    columns = dict.fromkeys(SECTION_COLUMNS.values())
+    for section in analysis.get('sections', []):
+        column = SECTION_COLUMNS.get(section.get('name'))
+        if column and isinstance(section.get('score'), int):
+            columns[column] = section['score']
+
+    job_match = analysis.get('jobMatch')
+    columns.update(
+        overall_score=analysis.get('overallScore', 0),
+        job_match_percentage=(job_match or {}).get('matchPercentage', 0),
+        skill_count=len(skills),
+        job_match=json.dumps(job_match) if 'jobMatch' in analysis else None
+    )
+
+    # Keep every key (in order) and only the values the columns cannot reproduce
+    derived = _derived_fields(columns, skills)
+    rest = {key: value for key, value in analysis.items() if key not in derived or derived[key] != value}
+    extra = json.dumps({'keys': list(analysis), 'values': rest}, separators=(',', ':'))
+    columns['analysis_extra'] = zlib.compress(extra.encode('utf-8'), COMPRESSION_LEVEL)
+    return columns, skills
+
+
+def unpack_analysis(columns, skills):
+    """Rebuild the analysis dict from pack_analysis's columns and skill rows"""
+    extra = json.loads(zlib.decompress(columns['analysis_extra']))
+    values = extra['values']
+    derived = _derived_fields(columns, skills)
+    return {key: values[key] if key in values else derived[key] for key in extra['keys']}
@@ -0,0 +1,205 @@
+"""
+Analysis tasks - the bodies of the resume analysis jobs, independent of Flask
+Celery tasks in app.py and the local process pool in executor.py both call these,
+reporting progress through a ProgressReporter.
+"""
+
+import os
+
+from analysis_cache import make_cache
+from ats_processor import ATSProcessor, ENGINE_VERSION
+from database import iter_export_rows, update_resume_analysis, update_resume_status
+from exporters import FILE_FORMATS
+from job_tracking import record_results
+from metrics import make_instrumentation
+from embedding_store import EmbeddingStore
+from pdf_extraction import PDFExtractor
+from profile_store import ProfileStore
+from progress_events import publish_progress
+from storage import make_file_store
+
+# app.config keys needed to build a processor in another process
+PROCESSOR_SETTINGS = ('EMBEDDING_BATCH_SIZE', 'TORCH_THREADS', 'ANALYSIS_CACHE', 'ANALYSIS_CACHE_MAX_BYTES',
+                      'METRICS_SINKS', 'PDF_MAX_PAGES', 'PDF_PARALLEL_MIN_PAGES', 'PDF_WORKERS',
+                      'EMBEDDING_STORE', 'EMBEDDING_DTYPE', 'PROFILE_CHECK_INTERVAL', 'FILE_STORE', 'UPLOAD_FOLDER',
+                      'INFERENCE_BACKEND', 'ONNX_DIR')
+
+
+def build_processor(settings, redis_client=None, profile_store=None, buffer_metrics=False):
+    """Create an ATSProcessor (cache, metrics, file store, PDF extraction, embeddings, job profiles) from config settings
+
+    buffer_metrics keeps stage timings in the process for the caller to collect (see make_instrumentation).
+    """
+    # Quantized backends find slightly different keywords, so their cached features are kept apart
+    engine_version = ENGINE_VERSION
+    if settings['INFERENCE_BACKEND'] != 'torch':
+        engine_version = f"{ENGINE_VERSION}+{settings['INFERENCE_BACKEND']}"
+    analysis_cache = make_cache(settings['ANALYSIS_CACHE'], engine_version, redis_client,
+                                settings['ANALYSIS_CACHE_MAX_BYTES'])
+    instrumentation = make_instrumentation(settings['METRICS_SINKS'], redis_client, buffer_metrics)
+    pdf_extractor = PDFExtractor(max_pages=settings['PDF_MAX_PAGES'],
+                                 parallel_min_pages=settings['PDF_PARALLEL_MIN_PAGES'],
+                                 workers=settings['PDF_WORKERS'])
+    embedding_store = profile_embedding_store = None
+    if settings['EMBEDDING_STORE']:
+        embedding_store = EmbeddingStore(settings['EMBEDDING_STORE'], dtype=settings['EMBEDDING_DTYPE'])
+        profile_embedding_store = EmbeddingStore(settings['EMBEDDING_STORE'] + '-profiles')
+    processor = ATSProcessor(batch_size=settings['EMBEDDING_BATCH_SIZE'], cache=analysis_cache,
+                             instrumentation=instrumentation, pdf_extractor=pdf_extractor,
+                             embedding_store=embedding_store, profile_embedding_store=profile_embedding_store,
+                             profile_store=profile_store or ProfileStore(settings['PROFILE_CHECK_INTERVAL']),
+                             file_store=make_file_store(settings['FILE_STORE'], settings['UPLOAD_FOLDER']))
+    processor.models.set_backend(settings['INFERENCE_BACKEND'], settings['ONNX_DIR'])
+    processor.models.set_torch_threads(settings['TORCH_THREADS'])
+    return processor
+
+
+class ProgressReporter:
+    """Reports a job's progress to its Celery task state, Redis subscribers and/or an in-memory store"""
+
+    def __init__(self, job_id, redis_client=None, task=None, store=None):
+        self.job_id = job_id
+        self.redis_client = redis_client
+        self.task = task
+        self.store = store
+
+    def _record(self, state, status):
+        if self.task is not None:
+            self.task.update_state(state=state, meta=status)
+        if self.store is not None:
+            self.store[self.job_id] = status
+
+    def progress(self, progress, message, publish=True):
+        self._record('PROGRESS', {'status': 'processing', 'progress': progress, 'message': message})
+        if publish:
+            publish_progress(self.redis_client, self.job_id,
+                             {'status': 'processing', 'progress': progress, 'message': message})
+
+    def completed(self, message, publish=True):
+        self._record('PROGRESS', {'status': 'completed', 'progress': 100, 'message': message})
+        if publish:
+            publish_progress(self.redis_client, self.job_id,
+                             {'status': 'completed', 'progress': 100, 'message': message})
+
+    def failed(self, error, message, publish=True):
+        self._record('FAILURE', {'status': 'failed', 'error': str(error), 'message': message})
+        if publish:
+            publish_progress(self.redis_client, self.job_id,
+                             {'status': 'failed', 'error': str(error), 'message': message})
+
+
+def run_resume_analysis(processor, reporter, resume_id, file_path, job_profile_id=None, content_hash=None,
+                        profile=False, deadline=None):
+    """Analyze one resume and store the result
+
+    With profile=True the analysis runs under cProfile and the report is kept
+    for /api/metrics/profiles/<resume_id>. With a deadline (epoch seconds) the
+    stored analysis may be partial; the returned 'partial' flag tells the
+    caller to queue complete_analysis.
+    """
+    try:
+        # Update progress
+        reporter.progress(10, 'Starting analysis...')
+
+        if not processor:
+            raise Exception("ATS Processor not available")
+
+        # Process the resume
+        reporter.progress(30, 'Extracting text...')
+
+        if profile:
+            instrumentation = processor.instrumentation
+            analysis_result, report = instrumentation.profile(
+                processor.analyze_resume, file_path, job_profile_id, content_hash, resume_id, deadline)
+            instrumentation.save_profile(resume_id, report)
+        else:
+            analysis_result = processor.analyze_resume(file_path, job_profile_id, content_hash, resume_id, deadline)
+
+        reporter.progress(80, 'Finalizing analysis...')
+
+        # Save analysis to database
+        update_resume_analysis(resume_id, analysis_result)
+
+        reporter.completed('Analysis complete!')
+
+        return {'status': 'completed', 'analysis': analysis_result, 'partial': bool(analysis_result.get('partial'))}
+
+    except Exception as e:
+        update_resume_status(resume_id, 'failed')
+        reporter.failed(e, f'Analysis failed: {str(e)}')
+        return {'status': 'failed', 'error': str(e)}
+
+
+def complete_analysis(processor, resume_id, file_path, job_profile_id=None, content_hash=None):
+    """Rerun a partial analysis without a deadline and store the full result
+
+    The upload's job already reported the partial analysis, so nothing is
+    reported here, and a failure leaves the partial analysis in place.
+    """
+    try:
+        if not processor:
+            raise Exception("ATS Processor not available")
+
+        analysis_result = processor.analyze_resume(file_path, job_profile_id, content_hash, resume_id)
+        # A no-op if the resume was deleted in the meantime
+        update_resume_analysis(resume_id, analysis_result)
+        print(f"✅ Partial analysis completed: {resume_id}")
+        return {'status': 'completed'}
+
+    except Exception as e:
+        print(f"❌ Completing partial analysis {resume_id} failed: {e}")
+        return {'status': 'failed', 'error': str(e)}
+
+
+def write_export(format_type, filters, export_id, export_folder):
+    """Write an Excel / PDF export of the matching analyses to export_folder/<export_id>.<ext>"""
+    writer, _, extension = FILE_FORMATS[format_type]
+    file_path = os.path.join(export_folder, f"{export_id}.{extension}")
+    writer(iter_export_rows(**filters), file_path)
+    return {'status': 'completed', 'file_path': file_path}
+
+
+def run_batch_analysis(processor, reporter, items, job_profile_id=None, batch_id=None, redis_client=None):
+    """Analyze a chunk of (resume_id, file_path, content_hash) with batched model inference
+
+    Batch-level progress is counted in job_tracking, so per-chunk updates are not published.
+    """
+    completed = []
+    failed = {}
+    try:
+        if not processor:
+            raise Exception("ATS Processor not available")
+
+        reporter.progress(10, f'Analyzing {len(items)} resumes...', publish=False)
+
+        resume_ids = [resume_id for resume_id, _, _ in items]
+        results = processor.analyze_resumes([file_path for _, file_path, _ in items], job_profile_id,
+                                            [content_hash for _, _, content_hash in items], resume_ids)
+
+        reporter.progress(80, 'Saving analyses...', publish=False)
+
+        for resume_id, result in zip(resume_ids, results):
+            if isinstance(result, Exception):
+                failed[resume_id] = str(result)
+                update_resume_status(resume_id, 'failed')
+                continue
+            update_resume_analysis(resume_id, result)
+            completed.append(resume_id)
+
+        reporter.completed('Batch analysis complete!', publish=False)
+
+        return {'status': 'completed', 'completed': completed, 'failed': failed}
+
+    except Exception as e:
+        for resume_id, _, _ in items:
+            if resume_id not in completed and resume_id not in failed:
+                failed[resume_id] = str(e)
+                update_resume_status(resume_id, 'failed')
+        reporter.failed(e, f'Batch analysis failed: {str(e)}', publish=False)
+        return {'status': 'failed', 'error': str(e)}
+
+    finally:
+        try:
+            record_results(redis_client, batch_id, len(completed), len(failed))
+        except Exception as e:
+            print(f"❌ Batch progress update failed: {e}")
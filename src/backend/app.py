@@ -4,23 +4,38 @@ Requirements: pip install flask flask-cors pdfplumber PyMuPDF docx2txt spacy key
 python -m spacy download en_core_web_sm
 """
 
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, request, jsonify, send_file, Response, stream_with_context
 from flask_cors import CORS
-from werkzeug.utils import secure_filename
 import os
 import uuid
 import json
+import time
 from datetime import datetime
-import sqlite3
 import redis
 from celery import Celery
-import io
-import pandas as pd
-from reportlab.pdfgen import canvas
+from celery.signals import celeryd_init, worker_process_init
+from kombu import Queue
 
 # Import our ATS processing modules
-from ats_processor import ATSProcessor
-from database import init_db, add_resume, get_resume, update_resume_analysis, get_all_resumes
+from analysis_tasks import (PROCESSOR_SETTINGS, ProgressReporter, build_processor, complete_analysis,
+                            run_resume_analysis, run_batch_analysis, write_export)
+from executor import CeleryExecutor, ProcessPoolAnalysisExecutor
+from database import (init_db, get_resume, get_all_resumes,
+                      get_resume_analysis, get_analysis_stats, iter_export_rows,
+                      iter_resume_skills, get_resume_skills,
+                      get_resume_summaries, seed_job_profiles, delete_resume as delete_resume_record)
+from deadlines import deadline_after
+from exporters import STREAM_FORMATS, FILE_FORMATS
+from ingestion import receive_uploads, register_uploads
+from job_tracking import start_batch, get_batch_progress, describe_progress
+from metrics import RedisSink
+from profile_store import ProfileStore, ProfileError
+from progress_events import ProgressBroker, get_snapshot, TERMINAL_STATUSES
+from rescoring import start_rescore, rescore_profile
+from scheduler import INTERACTIVE, BULK, BrokerScheduler, QueueMetrics, RedisFairShareQueue
+from storage import make_file_store
+from scoring import DEFAULT_JOB_PROFILES
+from skill_index import SkillIndex, QueryError
 
 app = Flask(__name__)
 
@@ -28,10 +43,64 @@ app = Flask(__name__)
 CORS(app, origins=["*"], supports_credentials=True)
 
 # Configuration
-app.config['UPLOAD_FOLDER'] = 'uploads'
+# Uploaded files: store backend ('local') and its root, sharded by content hash (see storage.py)
+app.config['FILE_STORE'] = os.environ.get('ATS_FILE_STORE', 'local')
+app.config['UPLOAD_FOLDER'] = os.environ.get('ATS_UPLOAD_FOLDER', 'uploads')
+app.config['EXPORT_FOLDER'] = 'exports'
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
 app.config['CELERY_BROKER_URL'] = 'redis://localhost:6379/0'
 app.config['CELERY_RESULT_BACKEND'] = 'redis://localhost:6379/0'
+app.config['REDIS_URL'] = 'redis://localhost:6379/1'
+# Where analyses run: 'celery' (broker + workers) or 'process' (local process pool,
+# no Redis/Celery needed; ATS_EXECUTOR_WORKERS defaults to the core count)
+app.config['EXECUTOR'] = os.environ.get('ATS_EXECUTOR', 'celery')
+app.config['EXECUTOR_WORKERS'] = int(os.environ.get('ATS_EXECUTOR_WORKERS', 0)) or None
+# Load NLP models at import time so gunicorn --preload / the Celery parent
+# process shares them with forked workers (copy-on-write) instead of each
+# worker loading its own copy on first use
+app.config['PRELOAD_MODELS'] = os.environ.get('ATS_PRELOAD_MODELS', 'false').lower() in ('1', 'true', 'yes')
+# Batch analysis: resumes per Celery task, embedding mini-batch size and torch threads per worker
+app.config['ANALYSIS_CHUNK_SIZE'] = int(os.environ.get('ATS_ANALYSIS_CHUNK_SIZE', 16))
+app.config['EMBEDDING_BATCH_SIZE'] = int(os.environ.get('ATS_EMBEDDING_BATCH_SIZE', 32))
+app.config['TORCH_THREADS'] = int(os.environ.get('ATS_TORCH_THREADS', 0)) or None
+# Embedding inference backend: 'torch' (fp32), 'torch-int8' (dynamically quantized),
+# 'onnx' or 'onnx-int8' (ONNX Runtime; the model is exported to ONNX_DIR on first use)
+app.config['INFERENCE_BACKEND'] = os.environ.get('ATS_INFERENCE_BACKEND', 'torch')
+app.config['ONNX_DIR'] = os.environ.get('ATS_ONNX_DIR', os.path.join('models', 'onnx'))
+# PDF extraction: pages read per file (0 = all), page count that switches to the
+# process pool, and pool size (pool is skipped inside daemonic Celery workers)
+app.config['PDF_MAX_PAGES'] = int(os.environ.get('ATS_PDF_MAX_PAGES', 30))
+app.config['PDF_PARALLEL_MIN_PAGES'] = int(os.environ.get('ATS_PDF_PARALLEL_MIN_PAGES', 8))
+app.config['PDF_WORKERS'] = int(os.environ.get('ATS_PDF_WORKERS', 0)) or None
+# Semantic search: path prefix of the memory-mapped resume embedding matrix
+# (empty disables) and its storage type, 'float16' or 'int8' (half the size)
+app.config['EMBEDDING_STORE'] = os.environ.get('ATS_EMBEDDING_STORE', 'embeddings/resumes')
+app.config['EMBEDDING_DTYPE'] = os.environ.get('ATS_EMBEDDING_DTYPE', 'float16')
+# Seconds between checks of the job profile version (profile edits reach workers within this)
+app.config['PROFILE_CHECK_INTERVAL'] = float(os.environ.get('ATS_PROFILE_CHECK_INTERVAL', 2))
+# Analysis cache backend: 'lru' (per process), 'sqlite', 'redis' or 'none'
+app.config['ANALYSIS_CACHE'] = os.environ.get('ATS_ANALYSIS_CACHE', 'sqlite')
+app.config['ANALYSIS_CACHE_MAX_BYTES'] = int(os.environ.get('ATS_ANALYSIS_CACHE_MAX_MB', 64)) * 1024 * 1024
+# Stage metrics sinks: any of memory, log, redis (redis aggregates across Celery workers); empty disables
+app.config['METRICS_SINKS'] = os.environ.get('ATS_METRICS', 'memory,redis')
+# Scheduling: single uploads run on the interactive queue and batch chunks on the bulk
+# queue, released round-robin per batch ('batch') or per job profile ('profile'). The
+# process executor caps the workers each queue may hold (0 = all of them); with Celery,
+# start a worker per queue instead (-Q interactive -c N, -Q bulk -c M)
+app.config['FAIR_SHARE'] = os.environ.get('ATS_FAIR_SHARE', 'batch')
+app.config['INTERACTIVE_WORKERS'] = int(os.environ.get('ATS_INTERACTIVE_WORKERS', 0)) or None
+app.config['BULK_WORKERS'] = int(os.environ.get('ATS_BULK_WORKERS', 0)) or None
+# Celery workers started without -Q consume every queue; one prefetched message per
+# worker process keeps the bulk queue's round robin from being reserved in advance
+app.config['CELERY_QUEUES'] = [Queue(INTERACTIVE), Queue(BULK), Queue('celery')]
+app.config['CELERYD_PREFETCH_MULTIPLIER'] = 1
+# Time budget of a single upload's analysis in ms, queue wait included (0 = none; a
+# deadlineMs form field overrides it per upload). KeyBERT is skipped when it would not
+# fit, and the partial analysis is completed later on the bulk queue
+app.config['ANALYSIS_DEADLINE_MS'] = int(os.environ.get('ATS_ANALYSIS_DEADLINE_MS', 0))
+# Progress push: longest long-poll hold and SSE keepalive interval, in seconds
+app.config['PROGRESS_MAX_WAIT'] = 60
+app.config['PROGRESS_KEEPALIVE'] = 15
 
 # Initialize Celery
 def make_celery(app):
@@ -47,16 +116,24 @@ celery = make_celery(app)
 
 # Initialize Redis for job tracking
 try:
-    redis_client = redis.Redis(host='localhost', port=6379, db=1, decode_responses=True)
+    redis_client = redis.Redis.from_url(app.config['REDIS_URL'], decode_responses=True)
     redis_client.ping()  # Test connection
     print("✅ Redis connected successfully")
 except redis.ConnectionError:
     print("❌ Redis connection failed. Please start Redis server.")
     redis_client = None
 
+# One pub/sub listener per API process feeds every SSE / long-poll client
+progress_broker = ProgressBroker(redis_client) if redis_client else None
+
+# Job profiles from the job_profiles table, compiled and cached per process (loaded on first use)
+profile_store = ProfileStore(app.config['PROFILE_CHECK_INTERVAL'])
+
 # Initialize ATS Processor
 try:
-    ats_processor = ATSProcessor()
+    ats_processor = build_processor(app.config, redis_client, profile_store)
+    if app.config['PRELOAD_MODELS']:
+        ats_processor.models.warm_up()
     print("✅ ATS Processor initialized successfully")
 except Exception as e:
     print(f"❌ ATS Processor initialization failed: {e}")
@@ -64,46 +141,98 @@ except Exception as e:
 
 # Create upload folder
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+os.makedirs(app.config['EXPORT_FOLDER'], exist_ok=True)
+
+# Content-addressed upload storage; files are shared by identical uploads and reference counted
+file_store = make_file_store(app.config['FILE_STORE'], app.config['UPLOAD_FOLDER'])
 
 # Initialize database
 try:
     init_db()
+    seed_job_profiles(DEFAULT_JOB_PROFILES)
     print("✅ Database initialized successfully")
 except Exception as e:
     print(f"❌ Database initialization failed: {e}")
 
+# Skill bitmaps for /api/resumes/search, synced from the SQLite postings on each query
+skill_index = SkillIndex()
+
 ALLOWED_EXTENSIONS = {'pdf', 'doc', 'docx'}
 
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+@celeryd_init.connect
+def size_worker_threads(options=None, **kwargs):
+    """Split the cores between a Celery worker's processes unless ATS_TORCH_THREADS is set"""
+    if not app.config['TORCH_THREADS']:
+        concurrency = (options or {}).get('concurrency') or os.cpu_count() or 1
+        app.config['TORCH_THREADS'] = max(1, (os.cpu_count() or 1) // concurrency)
+
+@worker_process_init.connect
+def apply_worker_threads(**kwargs):
+    """Give each forked worker process its share of the cores for inference"""
+    if ats_processor and app.config['TORCH_THREADS']:
+        ats_processor.models.set_torch_threads(app.config['TORCH_THREADS'])
+
 @celery.task(bind=True)
-def process_resume_task(self, resume_id, file_path, job_profile_id=None):
-    """Background task to process resume"""
-    try:
-        # Update progress
-        self.update_state(state='PROGRESS', meta={'progress': 10, 'message': 'Starting analysis...'})
-        
-        if not ats_processor:
-            raise Exception("ATS Processor not available")
-        
-        # Process the resume
-        self.update_state(state='PROGRESS', meta={'progress': 30, 'message': 'Extracting text...'})
-        
-        analysis_result = ats_processor.analyze_resume(file_path, job_profile_id)
-        
-        self.update_state(state='PROGRESS', meta={'progress': 80, 'message': 'Finalizing analysis...'})
-        
-        # Save analysis to database
-        update_resume_analysis(resume_id, analysis_result)
-        
-        self.update_state(state='PROGRESS', meta={'progress': 100, 'message': 'Analysis complete!'})
-        
-        return {'status': 'completed', 'analysis': analysis_result}
-    
-    except Exception as e:
-        self.update_state(state='FAILURE', meta={'error': str(e), 'message': f'Analysis failed: {str(e)}'})
-        return {'status': 'failed', 'error': str(e)}
+def process_resume_task(self, resume_id, file_path, job_profile_id=None, content_hash=None, profile=False,
+                        queued_at=None, deadline=None):
+    """Background task to process resume (see analysis_tasks.run_resume_analysis)"""
+    analysis_executor.task_started(INTERACTIVE, queued_at)
+    reporter = ProgressReporter(self.request.id, redis_client, task=self)
+    result = run_resume_analysis(ats_processor, reporter, resume_id, file_path, job_profile_id, content_hash,
+                                 profile, deadline)
+    if result.get('partial'):
+        analysis_executor.submit_completion(resume_id, file_path, job_profile_id, content_hash)
+    return result
+
+@celery.task
+def complete_analysis_task(resume_id, file_path, job_profile_id=None, content_hash=None, queued_at=None):
+    """Background task rerunning an analysis that was cut short by its deadline, in full"""
+    analysis_executor.task_started(BULK, queued_at)
+    return complete_analysis(ats_processor, resume_id, file_path, job_profile_id, content_hash)
+
+@celery.task(bind=True)
+def process_resume_batch_task(self, items, job_profile_id=None, batch_id=None, queued_at=None):
+    """Background task to process a chunk of resumes with batched model inference"""
+    analysis_executor.task_started(BULK, queued_at)
+    reporter = ProgressReporter(self.request.id, redis_client, task=self)
+    return run_batch_analysis(ats_processor, reporter, items, job_profile_id, batch_id, redis_client)
+
+@celery.task
+def rescore_profile_task(job_id, job_profile_id):
+    """Background task recomputing the job match of a profile's stored analyses (see rescoring.py)"""
+    analysis_executor.task_started(BULK)
+    return rescore_profile(ats_processor, job_profile_id, job_id, redis_client=redis_client)
+
+@celery.task(bind=True)
+def export_analysis_task(self, format_type, filters):
+    """Background task writing an Excel / PDF export to the exports folder"""
+    self.update_state(state='PROGRESS', meta={'progress': 10, 'message': 'Writing export...'})
+    return write_export(format_type, filters, self.request.id, app.config['EXPORT_FOLDER'])
+
+# Select the analysis executor
+if app.config['EXECUTOR'] == 'process':
+    # Workers build their own processor from the same settings (and connect to Redis when it is up)
+    executor_settings = {key: app.config[key] for key in PROCESSOR_SETTINGS}
+    executor_settings.update(PRELOAD_MODELS=app.config['PRELOAD_MODELS'], EXPORT_FOLDER=app.config['EXPORT_FOLDER'],
+                             REDIS_URL=app.config['REDIS_URL'] if redis_client else None)
+    analysis_executor = ProcessPoolAnalysisExecutor(executor_settings, app.config['EXECUTOR_WORKERS'],
+                                                    app.config['INTERACTIVE_WORKERS'], app.config['BULK_WORKERS'],
+                                                    app.config['FAIR_SHARE'],
+                                                    ats_processor.instrumentation if ats_processor else None)
+    print(f"✅ Process pool executor: {analysis_executor.workers} workers")
+else:
+    # Held bulk chunks and queue wait histograms live in Redis, shared with the workers
+    broker_scheduler = BrokerScheduler()
+    if redis_client and app.config['CELERY_BROKER_URL'].startswith('redis'):
+        broker_scheduler = BrokerScheduler(RedisFairShareQueue(redis_client),
+                                           redis.Redis.from_url(app.config['CELERY_BROKER_URL']),
+                                           QueueMetrics(RedisSink(redis_client, 'queue_metrics')))
+    analysis_executor = CeleryExecutor(process_resume_task, process_resume_batch_task, rescore_profile_task,
+                                       complete_analysis_task, export_analysis_task, broker_scheduler,
+                                       app.config['FAIR_SHARE'])
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
@@ -115,47 +244,115 @@ def health_check():
             'database': True,
             'redis': redis_client is not None,
             'ats_processor': ats_processor is not None,
-            'celery': True
-        }
+            'celery': analysis_executor.name == 'celery'
+        },
+        'executor': analysis_executor.name,
+        'models': ats_processor.models.loaded() if ats_processor else {},
+        'inferenceBackend': ats_processor.models.backend if ats_processor else None,
+        'cache': ats_processor.cache.stats() if ats_processor and ats_processor.cache else None
     }
     
-    # Check if any critical services are down
-    if not all(status['services'].values()):
+    # Check if any critical services are down (the process pool executor needs neither Redis nor Celery)
+    optional = ('redis', 'celery') if analysis_executor.name == 'process' else ()
+    if not all(up for name, up in status['services'].items() if name not in optional):
         status['status'] = 'degraded'
     
     return jsonify(status)
 
+@app.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    """Stage latency percentiles (JSON) or histograms (?format=prometheus)"""
+    try:
+        if not ats_processor:
+            return jsonify({'error': 'ATS Processor not available'}), 503
+        
+        instrumentation = ats_processor.instrumentation
+        if request.args.get('format') == 'prometheus':
+            return Response(instrumentation.prometheus(), mimetype='text/plain; version=0.0.4')
+        
+        return jsonify(instrumentation.snapshot())
+    
+    except Exception as e:
+        print(f"❌ Metrics error: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/queues', methods=['GET'])
+def get_queues():
+    """Depth, running jobs and wait-time percentiles of the interactive and bulk queues"""
+    try:
+        return jsonify({
+            'executor': analysis_executor.name,
+            'fairShare': app.config['FAIR_SHARE'],
+            'queues': analysis_executor.queue_stats()
+        })
+    
+    except Exception as e:
+        print(f"❌ Queue stats error: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/metrics/profiles/<resume_id>', methods=['GET'])
+def get_profile_report(resume_id):
+    """cProfile report for an upload made with profile=1"""
+    report = ats_processor.instrumentation.get_profile(resume_id) if ats_processor else None
+    if not report:
+        return jsonify({'error': 'No profile captured for this resume'}), 404
+    return Response(report, mimetype='text/plain')
+
+def read_uploads(file_field, max_files=None):
+    """Stream the request's file_field parts into the file store; returns (form fields, uploads, skipped)"""
+    if request.mimetype != 'multipart/form-data' or not request.mimetype_params.get('boundary'):
+        return {}, [], []
+    return receive_uploads(request.stream, request.mimetype_params['boundary'], file_store,
+                           file_field, allowed_file, max_files)
+
 @app.route('/api/upload', methods=['POST'])
 def upload_resume():
-    """Upload and queue single resume for analysis"""
+    """Upload and queue single resume for analysis
+    
+    A file already analyzed for the same job profile is not queued again; the
+    response carries the existing resume's analysis and no job id.
+    """
     try:
-        if 'resume' not in request.files:
+        # Save the file while hashing it, straight from the request body
+        form, uploads, skipped = read_uploads('resume', max_files=1)
+        job_profile_id = form.get('jobProfileId')
+        profile = form.get('profile', '').lower() in ('1', 'true', 'yes')
+        
+        try:
+            budget_ms = int(form.get('deadlineMs') or app.config['ANALYSIS_DEADLINE_MS'])
+        except ValueError:
+            for upload in uploads:
+                upload.discard()
+            return jsonify({'error': 'deadlineMs must be a whole number of milliseconds'}), 400
+        
+        if not uploads:
+            if any(skipped):
+                return jsonify({'error': 'Invalid file type. Please upload PDF, DOC, or DOCX files.'}), 400
+            if skipped:
+                return jsonify({'error': 'No file selected'}), 400
             return jsonify({'error': 'No file provided'}), 400
         
-        file = request.files['resume']
-        job_profile_id = request.form.get('jobProfileId')
-        
-        if file.filename == '':
-            return jsonify({'error': 'No file selected'}), 400
-        
-        if not allowed_file(file.filename):
-            return jsonify({'error': 'Invalid file type. Please upload PDF, DOC, or DOCX files.'}), 400
-        
-        # Generate unique IDs
-        resume_id = str(uuid.uuid4())
-        filename = secure_filename(file.filename)
-        file_path = os.path.join(app.config['UPLOAD_FOLDER'], f"{resume_id}_{filename}")
-        
-        # Save file
-        file.save(file_path)
-        print(f"📄 File saved: {file_path}")
+        # Add to database unless it is a duplicate
+        new, duplicates = register_uploads(uploads, job_profile_id)
+        if duplicates:
+            upload, resume_id = duplicates[0]
+            # Nothing to queue: answer with the existing analysis instead of a job to poll
+            print(f"📋 Duplicate upload {upload.filename}: already analyzed as {resume_id}")
+            return jsonify({
+                'resumeId': resume_id,
+                'status': 'completed',
+                'duplicate': True,
+                'analysis': get_resume_analysis(resume_id),
+                'message': 'Identical resume already analyzed'
+            })
         
-        # Add to database
-        add_resume(resume_id, filename, file_path, 'processing', job_profile_id)
+        upload = new[0]
+        resume_id = upload.resume_id
+        print(f"📄 File saved: {upload.file_path}")
         
-        # Queue for processing
-        task = process_resume_task.delay(resume_id, file_path, job_profile_id)
-        job_id = task.id
+        # Queue for processing; the time budget starts once the file is stored
+        job_id = analysis_executor.submit_resume(resume_id, upload.file_path, job_profile_id, upload.content_hash,
+                                                 profile, deadline_after(budget_ms))
         
         # Store job mapping in Redis
         if redis_client:
@@ -177,121 +374,134 @@ def upload_resume():
 
 @app.route('/api/batch-upload', methods=['POST'])
 def batch_upload():
-    """Upload multiple resumes for batch processing"""
+    """Upload multiple resumes for batch processing
+    
+    Files are streamed to disk and hashed as the body arrives, exact duplicates
+    are dropped, all rows are inserted in one transaction and the analysis
+    chunks are queued in one publish.
+    """
     try:
-        files = request.files.getlist('resumes')
-        job_profile_id = request.form.get('jobProfileId')
+        form, uploads, skipped = read_uploads('resumes')
+        job_profile_id = form.get('jobProfileId')
         
-        if not files:
+        if not uploads and not skipped:
             return jsonify({'error': 'No files provided'}), 400
         
         job_id = str(uuid.uuid4())
-        resume_ids = []
-        task_ids = []
-        
-        print(f"📦 Batch upload started: {len(files)} files")
-        
-        for file in files:
-            if file and allowed_file(file.filename):
-                resume_id = str(uuid.uuid4())
-                filename = secure_filename(file.filename)
-                file_path = os.path.join(app.config['UPLOAD_FOLDER'], f"{resume_id}_{filename}")
-                
-                file.save(file_path)
-                add_resume(resume_id, filename, file_path, 'processing', job_profile_id)
-                
-                # Queue individual processing task
-                task = process_resume_task.delay(resume_id, file_path, job_profile_id)
-                task_ids.append(task.id)
-                resume_ids.append(resume_id)
-                
-                print(f"  📄 Queued: {filename}")
+        
+        print(f"📦 Batch upload received: {len(uploads)} files")
+        
+        new, duplicates = register_uploads(uploads, job_profile_id)
+        items = [(upload.resume_id, upload.file_path, upload.content_hash) for upload in new]
+        resume_ids = [upload.resume_id for upload in new]
+        
+        # Progress counters must exist before any task can report back
+        start_batch(redis_client, job_id, len(items))
         
         # Store batch job mapping in Redis
         if redis_client:
             redis_client.set(f"batch:{job_id}:resumes", json.dumps(resume_ids), ex=3600)
-            redis_client.set(f"batch:{job_id}:tasks", json.dumps(task_ids), ex=3600)
         
-        print(f"✅ Batch upload complete: {len(resume_ids)} files queued")
+        # Queue chunks of resumes so model inference runs batched inside each task
+        chunk_size = app.config['ANALYSIS_CHUNK_SIZE']
+        chunks = [items[start:start + chunk_size] for start in range(0, len(items), chunk_size)]
+        if chunks:
+            analysis_executor.submit_batches(chunks, job_profile_id, job_id)
+        
+        message = f'{len(resume_ids)} resumes uploaded and queued for analysis'
+        if duplicates:
+            message += f' ({len(duplicates)} duplicates skipped)'
+        print(f"✅ Batch upload complete: {message}")
         
         return jsonify({
             'jobId': job_id,
             'resumeIds': resume_ids,
+            'duplicates': [{'filename': upload.filename, 'resumeId': resume_id} for upload, resume_id in duplicates],
             'status': 'queued',
-            'message': f'{len(resume_ids)} resumes uploaded and queued for analysis'
+            'message': message
         })
     
     except Exception as e:
         print(f"❌ Batch upload error: {e}")
         return jsonify({'error': str(e)}), 500
 
+def build_job_status(job_id):
+    """Current status payload for a single or batch analysis job"""
+    # Batch jobs keep aggregate counters: one read regardless of batch size
+    batch_progress = get_batch_progress(redis_client, job_id)
+    if batch_progress:
+        return describe_progress(batch_progress)
+    
+    # Single resume job
+    return analysis_executor.get_status(job_id)
+
+def current_job_status(job_id):
+    """Latest pushed snapshot if there is one, else a status computed from the backends"""
+    return get_snapshot(redis_client, job_id) or dict(build_job_status(job_id), version=0)
+
+def etag_version(header):
+    """Progress version from an If-None-Match value ("3" or W/"3"); None for *, lists and other tags"""
+    value = header.strip()
+    if value.startswith('W/'):
+        value = value[2:]
+    try:
+        return int(value.strip('"'))
+    except ValueError:
+        return None
+
 @app.route('/api/analysis/<job_id>/status', methods=['GET'])
 def get_analysis_status(job_id):
-    """Get analysis progress status"""
+    """Get analysis progress status
+    
+    Long-poll: send the last seen version as If-None-Match (or ?version=) with
+    ?wait=<seconds> and the request is held until the job changes; 304 if it does not.
+    """
     try:
-        # Check if it's a batch job
-        if redis_client:
-            batch_resumes = redis_client.get(f"batch:{job_id}:resumes")
-            if batch_resumes:
-                task_ids = json.loads(redis_client.get(f"batch:{job_id}:tasks") or '[]')
-                completed = 0
-                total = len(task_ids)
-                
-                for task_id in task_ids:
-                    task = process_resume_task.AsyncResult(task_id)
-                    if task.state == 'SUCCESS':
-                        completed += 1
-                
-                progress = (completed / total) * 100 if total > 0 else 0
-                status = 'completed' if completed == total else 'processing'
-                
-                return jsonify({
-                    'status': status,
-                    'progress': progress,
-                    'completed': completed,
-                    'total': total,
-                    'message': f'Processed {completed} of {total} resumes'
-                })
-        
-        # Single resume job
-        task = process_resume_task.AsyncResult(job_id)
-        
-        if task.state == 'PENDING':
-            return jsonify({
-                'status': 'queued', 
-                'progress': 0,
-                'message': 'Analysis queued and waiting to start'
-            })
-        elif task.state == 'PROGRESS':
-            info = task.info or {}
-            return jsonify({
-                'status': 'processing',
-                'progress': info.get('progress', 0),
-                'message': info.get('message', 'Processing...')
-            })
-        elif task.state == 'SUCCESS':
-            return jsonify({
-                'status': 'completed', 
-                'progress': 100,
-                'message': 'Analysis completed successfully'
-            })
-        elif task.state == 'FAILURE':
-            info = task.info or {}
-            return jsonify({
-                'status': 'failed', 
-                'error': str(info.get('error', 'Unknown error')),
-                'message': info.get('message', 'Analysis failed')
-            })
-        
-        return jsonify({
-            'status': 'unknown',
-            'message': 'Job status could not be determined'
-        })
+        wait = min(request.args.get('wait', 0, type=float), app.config['PROGRESS_MAX_WAIT'])
+        known_version = request.args.get('version', type=int)
+        if known_version is None and request.headers.get('If-None-Match'):
+            known_version = etag_version(request.headers['If-None-Match'])
+        
+        status = current_job_status(job_id)
+        
+        if known_version is not None and status.get('version', 0) <= known_version:
+            if wait > 0 and progress_broker and status.get('status') not in TERMINAL_STATUSES:
+                status = progress_broker.wait(job_id, known_version, wait) or status
+            if status.get('version', 0) <= known_version:
+                return '', 304
+        
+        response = jsonify(status)
+        response.headers['ETag'] = f'"{status.get("version", 0)}"'
+        return response
     
     except Exception as e:
         print(f"❌ Status check error: {e}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/analysis/<job_id>/events', methods=['GET'])
+def stream_analysis_events(job_id):
+    """Server-sent events stream of job progress, closed once the job finishes"""
+    if not progress_broker:
+        return jsonify({'error': 'Progress streaming requires Redis'}), 503
+    
+    def generate():
+        status = current_job_status(job_id)
+        yield f"id: {status.get('version', 0)}\ndata: {json.dumps(status)}\n\n"
+        
+        while status.get('status') not in TERMINAL_STATUSES:
+            update = progress_broker.wait(job_id, status.get('version', 0), app.config['PROGRESS_KEEPALIVE'])
+            if update is None:
+                # Idle: re-check the stored snapshot in case an event was missed, then keep the connection alive
+                update = get_snapshot(redis_client, job_id)
+                if not update or update.get('version', 0) <= status.get('version', 0):
+                    yield ": keepalive\n\n"
+                    continue
+            status = update
+            yield f"id: {status['version']}\ndata: {json.dumps(status)}\n\n"
+    
+    return Response(stream_with_context(generate()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
 @app.route('/api/analysis/<resume_id>', methods=['GET'])
 def get_analysis_result(resume_id):
     """Get analysis result for a specific resume"""
@@ -300,10 +510,10 @@ def get_analysis_result(resume_id):
         if not resume:
             return jsonify({'error': 'Resume not found'}), 404
         
-        if not resume['analysis']:
+        analysis = get_resume_analysis(resume_id)
+        if not analysis:
             return jsonify({'error': 'Analysis not completed yet'}), 404
         
-        analysis = json.loads(resume['analysis'])
         print(f"📊 Analysis retrieved for resume {resume_id}")
         
         return jsonify(analysis)
@@ -336,6 +546,86 @@ def get_resumes():
         print(f"❌ Get resumes error: {e}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/resumes/search', methods=['GET'])
+def search_resumes():
+    """Boolean skill search over analyzed resumes
+    
+    ?q=kubernetes AND python AND NOT java&minScore=70&maxScore=100&sort=recent|score&limit=50&offset=0
+    """
+    try:
+        started = time.perf_counter()
+        query = request.args.get('q', '')
+        limit = max(1, min(request.args.get('limit', 50, type=int), 500))
+        offset = max(0, request.args.get('offset', 0, type=int))
+        
+        total, results = skill_index.search(query,
+                                            min_score=request.args.get('minScore', type=int),
+                                            max_score=request.args.get('maxScore', type=int),
+                                            offset=offset, limit=limit,
+                                            sort=request.args.get('sort', 'recent'))
+        
+        return jsonify({
+            'query': query,
+            'total': total,
+            'offset': offset,
+            'limit': limit,
+            'results': results,
+            'tookMs': round((time.perf_counter() - started) * 1000, 2)
+        })
+    
+    except QueryError as e:
+        return jsonify({'error': f'Invalid query: {e}'}), 400
+    except Exception as e:
+        print(f"❌ Resume search error: {e}")
+        return jsonify({'error': str(e)}), 500
+
+def semantic_results(matches):
+    """Resume summaries for (resume_id, similarity) pairs, in match order"""
+    summaries = get_resume_summaries([resume_id for resume_id, _ in matches])
+    return [
+        {**summaries[resume_id], 'similarity': round(similarity, 4)}
+        for resume_id, similarity in matches if resume_id in summaries
+    ]
+
+@app.route('/api/resumes/semantic-search', methods=['POST'])
+def semantic_search_resumes():
+    """Resumes closest in meaning to a free-text job description
+    
+    Body: {"description": "...", "limit": 20}
+    """
+    try:
+        if not ats_processor or not ats_processor.embedding_store:
+            return jsonify({'error': 'Semantic search not available'}), 503
+        
+        data = request.json or {}
+        description = (data.get('description') or '').strip()
+        if not description:
+            return jsonify({'error': 'No description provided'}), 400
+        limit = max(1, min(int(data.get('limit', 20)), 500))
+        
+        started = time.perf_counter()
+        matches = ats_processor.semantic_search(description, limit=limit)
+        
+        return jsonify({
+            'results': semantic_results(matches),
+            'tookMs': round((time.perf_counter() - started) * 1000, 2)
+        })
+    
+    except Exception as e:
+        print(f"❌ Semantic search error: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/stats', methods=['GET'])
+def get_stats():
+    """Get dashboard statistics, optionally for one job profile"""
+    try:
+        stats = get_analysis_stats(request.args.get('jobProfileId'))
+        return jsonify(stats)
+    
+    except Exception as e:
+        print(f"❌ Stats error: {e}")
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/resumes/<resume_id>', methods=['DELETE'])
 def delete_resume(resume_id):
     """Delete a resume and its analysis"""
@@ -344,17 +634,11 @@ def delete_resume(resume_id):
         if not resume:
             return jsonify({'error': 'Resume not found'}), 404
         
-        # Delete file
-        if os.path.exists(resume['file_path']):
-            os.remove(resume['file_path'])
+        # Delete from database, and the file with its last reference
+        if delete_resume_record(resume_id, file_store.remove):
             print(f"🗑️ File deleted: {resume['file_path']}")
-        
-        # Delete from database
-        conn = sqlite3.connect('ats.db')
-        cursor = conn.cursor()
-        cursor.execute('DELETE FROM resumes WHERE id = ?', (resume_id,))
-        conn.commit()
-        conn.close()
+        if ats_processor and ats_processor.embedding_store:
+            ats_processor.embedding_store.remove(resume_id)
         
         print(f"🗑️ Resume deleted: {resume_id}")
         return jsonify({'message': 'Resume deleted successfully'})
@@ -365,97 +649,71 @@ def delete_resume(resume_id):
 
 @app.route('/api/export', methods=['POST'])
 def export_analysis():
-    """Export analysis results in various formats"""
+    """Export analysis results in various formats
+    
+    csv / ndjson stream rows straight from the database; excel / pdf are
+    generated by a background task and downloaded from /api/export/<export_id>.
+    """
     try:
-        data = request.json
-        resume_ids = data.get('resumeIds', [])
+        data = request.json or {}
         format_type = data.get('format', 'csv')
+        filters = {
+            'resume_ids': data.get('resumeIds'),
+            'job_profile_id': data.get('jobProfileId'),
+            'date_from': data.get('from'),
+            'date_to': data.get('to')
+        }
         
-        print(f"📤 Exporting {len(resume_ids)} analyses as {format_type}")
-        
-        # Collect analysis data
-        analysis_data = []
-        for resume_id in resume_ids:
-            resume = get_resume(resume_id)
-            if resume and resume['analysis']:
-                analysis = json.loads(resume['analysis'])
-                analysis_data.append({
-                    'filename': resume['filename'],
-                    'overall_score': analysis['overallScore'],
-                    'skills_score': next((s['score'] for s in analysis['sections'] if s['name'] == 'Skills Match'), 0),
-                    'experience_score': next((s['score'] for s in analysis['sections'] if s['name'] == 'Experience'), 0),
-                    'education_score': next((s['score'] for s in analysis['sections'] if s['name'] == 'Education'), 0),
-                    'job_match': analysis['jobMatch']['matchPercentage'],
-                    'detected_skills': ', '.join([s['name'] for s in analysis['skills']]),
-                    'missing_skills': ', '.join(analysis['jobMatch']['missingSkills']),
-                    'upload_date': resume['upload_date']
-                })
-        
-        if format_type == 'csv':
-            df = pd.DataFrame(analysis_data)
-            output = io.StringIO()
-            df.to_csv(output, index=False)
-            output.seek(0)
-            
-            return send_file(
-                io.BytesIO(output.getvalue().encode()),
-                mimetype='text/csv',
-                as_attachment=True,
-                download_name='ats_analysis.csv'
-            )
+        print(f"📤 Exporting analyses as {format_type}")
         
-        elif format_type == 'excel':
-            df = pd.DataFrame(analysis_data)
-            output = io.BytesIO()
-            with pd.ExcelWriter(output, engine='openpyxl') as writer:
-                df.to_excel(writer, index=False, sheet_name='ATS Analysis')
-            output.seek(0)
-            
-            return send_file(
-                output,
-                mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-                as_attachment=True,
-                download_name='ats_analysis.xlsx'
+        if format_type in STREAM_FORMATS:
+            stream, mimetype, download_name = STREAM_FORMATS[format_type]
+            return Response(
+                stream_with_context(stream(iter_export_rows(**filters))),
+                mimetype=mimetype,
+                headers={'Content-Disposition': f'attachment; filename={download_name}'}
             )
         
-        elif format_type == 'pdf':
-            output = io.BytesIO()
-            p = canvas.Canvas(output)
-            
-            # Simple PDF generation
-            y = 800
-            p.drawString(100, y, "ATS Analysis Report")
-            p.drawString(100, y-20, f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-            y -= 60
-            
-            for item in analysis_data:
-                if y < 100:
-                    p.showPage()
-                    y = 800
-                
-                p.drawString(100, y, f"File: {item['filename']}")
-                y -= 20
-                p.drawString(120, y, f"Overall Score: {item['overall_score']}%")
-                y -= 20
-                p.drawString(120, y, f"Job Match: {item['job_match']}%")
-                y -= 20
-                p.drawString(120, y, f"Top Skills: {item['detected_skills'][:60]}...")
-                y -= 40
-            
-            p.save()
-            output.seek(0)
-            
+        if format_type in FILE_FORMATS:
+            export_id = analysis_executor.submit_export(format_type, filters)
+            return jsonify({
+                'exportId': export_id,
+                'status': 'queued',
+                'message': f'{format_type} export queued'
+            }), 202
+        
+        return jsonify({'error': 'Unsupported format'}), 400
+    
+    except Exception as e:
+        print(f"❌ Export error: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/export/<export_id>', methods=['GET'])
+def download_export(export_id):
+    """Get the status of a background export, or the file once it is ready"""
+    try:
+        export = analysis_executor.get_export(export_id)
+        if export is None:
+            return jsonify({'error': 'Export not found'}), 404
+        
+        if export['status'] == 'completed':
+            file_path = export['file_path']
+            extension = os.path.splitext(file_path)[1].lstrip('.')
+            mimetype = next(mime for _, mime, ext in FILE_FORMATS.values() if ext == extension)
             return send_file(
-                output,
-                mimetype='application/pdf',
+                os.path.abspath(file_path),
+                mimetype=mimetype,
                 as_attachment=True,
-                download_name='ats_analysis.pdf'
+                download_name=f'ats_analysis.{extension}'
             )
         
-        return jsonify({'error': 'Unsupported format'}), 400
+        if export['status'] == 'failed':
+            return jsonify({'status': 'failed', 'error': export['error']}), 500
+        
+        return jsonify({'status': export['status']}), 202
     
     except Exception as e:
-        print(f"❌ Export error: {e}")
+        print(f"❌ Export download error: {e}")
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/job-profiles', methods=['GET', 'POST'])
@@ -463,59 +721,156 @@ def job_profiles():
     """Get or create job profiles"""
     try:
         if request.method == 'GET':
-            # Return predefined job profiles
-            profiles = [
-                {
-                    'id': 'fullstack',
-                    'title': 'Full Stack Developer',
-                    'requiredSkills': ['JavaScript', 'React', 'Node.js', 'HTML', 'CSS'],
-                    'preferredSkills': ['Python', 'TypeScript', 'PostgreSQL', 'AWS'],
-                    'minimumExperience': 3,
-                    'description': 'Full stack web developer with modern JavaScript technologies'
-                },
-                {
-                    'id': 'frontend',
-                    'title': 'Frontend Developer',
-                    'requiredSkills': ['JavaScript', 'React', 'HTML', 'CSS'],
-                    'preferredSkills': ['TypeScript', 'Vue.js', 'Sass', 'Webpack'],
-                    'minimumExperience': 2,
-                    'description': 'Frontend developer focused on user interface development'
-                },
-                {
-                    'id': 'backend',
-                    'title': 'Backend Developer',
-                    'requiredSkills': ['Python', 'Node.js', 'SQL', 'API Development'],
-                    'preferredSkills': ['Django', 'Flask', 'PostgreSQL', 'Redis'],
-                    'minimumExperience': 3,
-                    'description': 'Backend developer for server-side applications'
-                },
-                {
-                    'id': 'datascientist',
-                    'title': 'Data Scientist',
-                    'requiredSkills': ['Python', 'Machine Learning', 'SQL', 'Statistics'],
-                    'preferredSkills': ['TensorFlow', 'PyTorch', 'R', 'Spark'],
-                    'minimumExperience': 2,
-                    'description': 'Data scientist with machine learning expertise'
-                }
-            ]
+            profiles = profile_store.list()
             print(f"📋 Retrieved {len(profiles)} job profiles")
             return jsonify(profiles)
         
         elif request.method == 'POST':
-            # Create new job profile
-            data = request.json
-            profile_id = str(uuid.uuid4())
-            profile = {
-                'id': profile_id,
-                **data
-            }
+            # Create and persist a new job profile; workers pick it up on their next version check
+            profile = profile_store.create(request.json or {})
             print(f"✅ Created job profile: {profile['title']}")
             return jsonify(profile)
     
+    except ProfileError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         print(f"❌ Job profiles error: {e}")
         return jsonify({'error': str(e)}), 500
 
+# Profile fields that change job match scores; updating any of them rescores the stored analyses
+SCORING_FIELDS = ('requiredSkills', 'preferredSkills', 'weights')
+
+def queue_rescore(profile_id):
+    """Register and queue a rescoring job for a profile; returns (job_id, analyses to rescore)"""
+    job_id, total = start_rescore(ats_processor, profile_id)
+    analysis_executor.submit_rescore(job_id, profile_id)
+    print(f"📋 Queued rescoring of {total} analyses for job profile {profile_id}")
+    return job_id, total
+
+@app.route('/api/job-profiles/<profile_id>', methods=['GET', 'PUT'])
+def job_profile(profile_id):
+    """Get or update one job profile (PUT accepts any subset of the fields)
+    
+    An update that changes skills or weights queues a rescoring job for the
+    profile's analyses; its id is returned as rescoreJobId.
+    """
+    try:
+        if request.method == 'GET':
+            profile = profile_store.get(profile_id)
+            if not profile:
+                return jsonify({'error': 'Job profile not found'}), 404
+            return jsonify(profile)
+        
+        previous = profile_store.get(profile_id)
+        profile = profile_store.update(profile_id, request.json or {})
+        if not profile:
+            return jsonify({'error': 'Job profile not found'}), 404
+        
+        print(f"✅ Updated job profile: {profile['title']}")
+        if any(profile[field] != previous[field] for field in SCORING_FIELDS):
+            job_id, _ = queue_rescore(profile_id)
+            profile = dict(profile, rescoreJobId=job_id)
+        return jsonify(profile)
+    
+    except ProfileError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        print(f"❌ Job profile error: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/job-profiles/<profile_id>/rescore', methods=['POST'])
+def rescore_job_profile(profile_id):
+    """Recompute the job match of every stored analysis for a profile (progress via the status endpoint)"""
+    try:
+        if not profile_store.get(profile_id):
+            return jsonify({'error': 'Job profile not found'}), 404
+        
+        job_id, total = queue_rescore(profile_id)
+        
+        return jsonify({
+            'jobId': job_id,
+            'status': 'queued',
+            'message': f'{total} analyses queued for rescoring'
+        })
+    
+    except Exception as e:
+        print(f"❌ Rescore error: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/job-profiles/<profile_id>/candidates', methods=['GET'])
+def rank_candidates(profile_id):
+    """Rank every analyzed resume against one job profile (?limit=50&minScore=0)"""
+    try:
+        scorer = profile_store.scorer
+        if profile_id not in scorer.index:
+            return jsonify({'error': 'Job profile not found'}), 404
+        
+        limit = request.args.get('limit', 50, type=int)
+        min_score = request.args.get('minScore', 0, type=int)
+        
+        resume_ids, filenames, skill_lists = [], {}, []
+        for resume_id, filename, skills in iter_resume_skills():
+            resume_ids.append(resume_id)
+            filenames[resume_id] = filename
+            skill_lists.append(skills)
+        
+        ranked = scorer.rank_candidates(profile_id, resume_ids, skill_lists, limit, min_score)
+        
+        return jsonify({
+            'profileId': profile_id,
+            'title': scorer.profiles[profile_id]['title'],
+            'total': len(resume_ids),
+            'candidates': [
+                {'resumeId': resume_id, 'filename': filenames[resume_id], 'matchPercentage': score}
+                for resume_id, score in ranked
+            ]
+        })
+    
+    except Exception as e:
+        print(f"❌ Candidate ranking error: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/job-profiles/<profile_id>/semantic-candidates', methods=['GET'])
+def semantic_candidates(profile_id):
+    """Resumes closest in meaning to a job profile's description and skills (?limit=20)"""
+    try:
+        if not ats_processor or not ats_processor.embedding_store:
+            return jsonify({'error': 'Semantic search not available'}), 503
+        
+        if profile_id not in ats_processor.job_profiles:
+            return jsonify({'error': 'Job profile not found'}), 404
+        
+        limit = max(1, min(request.args.get('limit', 20, type=int), 500))
+        matches = ats_processor.semantic_search(profile_id=profile_id, limit=limit)
+        
+        return jsonify({
+            'profileId': profile_id,
+            'title': ats_processor.job_profiles[profile_id]['title'],
+            'candidates': semantic_results(matches)
+        })
+    
+    except Exception as e:
+        print(f"❌ Semantic candidate error: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/resumes/<resume_id>/job-matches', methods=['GET'])
+def rank_job_profiles(resume_id):
+    """Score one analyzed resume against every job profile, best fit first"""
+    try:
+        skills = get_resume_skills(resume_id)
+        if skills is None:
+            return jsonify({'error': 'Analysis not found'}), 404
+        
+        scorer = profile_store.scorer
+        return jsonify([
+            {'profileId': profile_id, 'title': scorer.profiles[profile_id]['title'], 'matchPercentage': score}
+            for profile_id, score in scorer.rank_profiles(skills, request.args.get('limit', type=int))
+        ])
+    
+    except Exception as e:
+        print(f"❌ Job match error: {e}")
+        return jsonify({'error': str(e)}), 500
+
 # Error handlers
 @app.errorhandler(413)
 def too_large(e):
@@ -535,16 +890,30 @@ if __name__ == '__main__':
     print("  GET  /api/health - Health check")
     print("  POST /api/upload - Upload single resume")
     print("  POST /api/batch-upload - Upload multiple resumes")
-    print("  GET  /api/analysis/<job_id>/status - Check analysis status")
+    print("  GET  /api/analysis/<job_id>/status - Check analysis status (long-poll with ?wait=)")
+    print("  GET  /api/analysis/<job_id>/events - Stream analysis progress (SSE)")
     print("  GET  /api/analysis/<resume_id> - Get analysis result")
     print("  GET  /api/resumes - List all resumes")
+    print("  GET  /api/resumes/search - Boolean skill search (?q=python AND NOT java&minScore=70)")
+    print("  POST /api/resumes/semantic-search - Resumes closest to a free-text job description")
     print("  DELETE /api/resumes/<resume_id> - Delete resume")
+    print("  GET  /api/resumes/<resume_id>/job-matches - Fit of a resume for every job profile")
+    print("  GET  /api/stats - Dashboard statistics")
+    print("  GET  /api/metrics - Stage latency percentiles (?format=prometheus)")
+    print("  GET  /api/queues - Interactive / bulk queue depths and wait times")
     print("  POST /api/export - Export analysis results")
+    print("  GET  /api/export/<export_id> - Download a background export")
     print("  GET  /api/job-profiles - List job profiles")
     print("  POST /api/job-profiles - Create job profile")
+    print("  GET  /api/job-profiles/<profile_id> - Get job profile")
+    print("  PUT  /api/job-profiles/<profile_id> - Update job profile (rescores its analyses)")
+    print("  POST /api/job-profiles/<profile_id>/rescore - Recompute job matches for a profile")
+    print("  GET  /api/job-profiles/<profile_id>/candidates - Rank all resumes for a job profile")
+    print("  GET  /api/job-profiles/<profile_id>/semantic-candidates - Resumes closest to a job profile")
     print("\n💡 Make sure to start Redis and Celery worker before uploading files!")
     print("   Redis: redis-server")
     print("   Celery: celery -A app.celery worker --loglevel=info")
+    print("   (or one worker per queue: -Q interactive -c 2, -Q bulk -c 4)")
     print("\n🌐 Frontend should connect to: http://localhost:5000/api")
     
     # Start Flask development server
@@ -4,35 +4,58 @@ Handles PDF/DOCX parsing, NLP analysis, and skill matching
 """
 
 import os
-import re
-import fitz  # PyMuPDF
-import pdfplumber
+import time
+import hashlib
 import docx2txt
-import spacy
-from keybert import KeyBERT
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-from transformers import AutoTokenizer, AutoModel
-import torch
-import numpy as np
 from datetime import datetime
 import json
 
+from analysis_storage import section_status
+from deadlines import CostEstimator, DEFAULT_KEYWORD_RATE
+from embedding_store import encode_vector, decode_vector
+from metrics import default_instrumentation, NULL_TIMINGS
+from model_registry import default_registry
+from pdf_extraction import PDFExtractor
+from resume_parser import ResumeParser, SECTION_PATTERNS
+from profile_store import ProfileStore
+from scoring import DEFAULT_JOB_PROFILES, profile_text
+from skill_matcher import SkillMatcher
+from storage import LocalFileStore
+
+# Bump whenever extraction or feature stages change so cached analyses are not reused
+ENGINE_VERSION = '2024.5'
+
+# Rough characters per page, used to bucket metrics when the real page count is unknown
+CHARS_PER_PAGE = 3000
+
 class ATSProcessor:
-    def __init__(self):
-        # Load spaCy model
-        try:
-            self.nlp = spacy.load("en_core_web_sm")
-        except OSError:
-            print("spaCy model 'en_core_web_sm' not found. Install with: python -m spacy download en_core_web_sm")
-            self.nlp = None
+    def __init__(self, models=None, batch_size=32, cache=None, instrumentation=None, pdf_extractor=None,
+                 embedding_store=None, profile_embedding_store=None, profile_store=None, file_store=None):
+        # Models are loaded lazily, on first use, from a registry shared across instances
+        self.models = models or default_registry
+        
+        # Optional AnalysisCache for text and profile-independent features
+        self.cache = cache
+        
+        # Stage timers and latency histograms (no-op unless sinks are configured)
+        self.instrumentation = instrumentation or default_instrumentation
         
-        # Initialize KeyBERT
-        self.kw_model = KeyBERT()
+        # Mini-batch size for document / candidate-phrase embedding passes
+        self.batch_size = batch_size
         
-        # Initialize BERT model for embeddings
-        self.tokenizer = AutoTokenizer.from_pretrained('sentence-transformers/all-MiniLM-L6-v2')
-        self.model = AutoModel.from_pretrained('sentence-transformers/all-MiniLM-L6-v2')
+        # Running estimate of KeyBERT's cost per character, to decide whether it fits a deadline
+        self.keyword_cost = CostEstimator(DEFAULT_KEYWORD_RATE)
+        
+        # Page-level PDF extraction strategy (page cap, process pool for long files)
+        self.pdf_extractor = pdf_extractor or PDFExtractor()
+        
+        # Uploaded files are opened by location through the file store (memory-mapped when local)
+        self.file_store = file_store or LocalFileStore('uploads')
+        
+        # Optional EmbeddingStores: each analyzed resume's document embedding, and
+        # job profile embeddings keyed by profile id + text hash (re-embedded on edit)
+        self.embedding_store = embedding_store
+        self.profile_embedding_store = profile_embedding_store
         
         # Predefined skill categories and patterns
         self.skill_patterns = {
@@ -62,140 +85,130 @@ class ATSProcessor:
             ]
         }
         
-        # Common section headers
-        self.section_patterns = {
-            'experience': r'(?i)(work\s+experience|professional\s+experience|employment|experience)',
-            'education': r'(?i)(education|academic|qualifications|degrees)',
-            'skills': r'(?i)(skills|technical\s+skills|competencies|expertise)',
-            'projects': r'(?i)(projects|portfolio|work\s+samples)',
-            'certifications': r'(?i)(certifications|certificates|licenses)',
-            'contact': r'(?i)(contact|personal\s+information|details)'
-        }
-    
-    def extract_text_from_pdf(self, file_path):
-        """Extract text from PDF using multiple methods for better accuracy"""
-        text = ""
-        
-        # Try pdfplumber first (better for complex layouts)
-        try:
-            with pdfplumber.open(file_path) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
-        except Exception as e:
-            print(f"pdfplumber failed: {e}")
+        # Single-pass matcher compiled from the skill taxonomy
+        self.skill_matcher = SkillMatcher(self.skill_patterns)
         
-        # If pdfplumber fails or returns little text, try PyMuPDF
-        if len(text.strip()) < 100:
-            try:
-                doc = fitz.open(file_path)
-                text = ""
-                for page in doc:
-                    text += page.get_text() + "\n"
-                doc.close()
-            except Exception as e:
-                print(f"PyMuPDF failed: {e}")
+        # Job profiles (the job_profiles table via ProfileStore, or the built-in defaults)
+        # compiled with their vectorized scorer (candidate x profile matrices)
+        self.profile_store = profile_store or ProfileStore(profiles=DEFAULT_JOB_PROFILES)
         
-        return text.strip()
+        # Precompiled extractors for personal info, sections, experience and education
+        self.section_patterns = SECTION_PATTERNS
+        self.parser = ResumeParser(self.section_patterns)
+    
+    @property
+    def job_profiles(self):
+        return self.profile_store.profiles
+    
+    @property
+    def match_scorer(self):
+        return self.profile_store.scorer
     
-    def extract_text_from_docx(self, file_path):
-        """Extract text from DOCX file"""
+    @property
+    def nlp(self):
+        return self.models.nlp
+    
+    @property
+    def kw_model(self):
+        return self.models.keybert
+    
+    def extract_text_from_pdf(self, document, info=None):
+        """Extract text from PDF: PyMuPDF per page, pdfplumber only for complex layouts"""
+        return self.pdf_extractor.extract(document, info)
+    
+    def extract_text_from_docx(self, document):
+        """Extract text from DOCX file (zipfile reads the mapped file in place)"""
         try:
-            return docx2txt.process(file_path)
+            return docx2txt.process(document)
         except Exception as e:
             print(f"DOCX extraction failed: {e}")
             return ""
     
-    def extract_text(self, file_path):
-        """Extract text based on file extension"""
-        file_ext = os.path.splitext(file_path)[1].lower()
+    def extract_text(self, file_path, info=None):
+        """Extract text based on file extension
         
-        if file_ext == '.pdf':
-            return self.extract_text_from_pdf(file_path)
-        elif file_ext in ['.docx', '.doc']:
-            return self.extract_text_from_docx(file_path)
-        else:
+        file_path is a file store location. info, when given, receives document
+        details such as the page count.
+        """
+        file_ext = os.path.splitext(file_path)[1].lower()
+        if file_ext not in ['.pdf', '.docx', '.doc']:
             raise ValueError(f"Unsupported file type: {file_ext}")
+        
+        with self.file_store.open(file_path) as document:
+            if file_ext == '.pdf':
+                return self.extract_text_from_pdf(document, info)
+            return self.extract_text_from_docx(document)
     
     def extract_personal_info(self, text):
         """Extract personal information using regex patterns"""
-        personal_info = {}
-        
-        # Email extraction
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        emails = re.findall(email_pattern, text)
-        if emails:
-            personal_info['email'] = emails[0]
-        
-        # Phone extraction
-        phone_pattern = r'(\+?\d{1,4}[-.\s]?)?\(?(\d{3})\)?[-.\s]?(\d{3})[-.\s]?(\d{4})'
-        phones = re.findall(phone_pattern, text)
-        if phones:
-            personal_info['phone'] = ''.join(phones[0])
-        
-        # Name extraction (first line or after "Name:" pattern)
-        lines = text.split('\n')
-        name_patterns = [
-            r'name[:\s]+(.+)',
-            r'(.+?)(?:\s*\n|\s*email|\s*phone|\s*address)',
-        ]
-        
-        for pattern in name_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                potential_name = match.group(1).strip()
-                if len(potential_name.split()) >= 2 and len(potential_name) < 50:
-                    personal_info['name'] = potential_name
-                    break
-        
-        # Location extraction
-        location_pattern = r'(?i)(location|address)[:\s]+(.+?)(?:\n|$)'
-        location_match = re.search(location_pattern, text)
-        if location_match:
-            personal_info['location'] = location_match.group(2).strip()
-        
-        return personal_info
+        return self.parser.personal_info(self.parser.view(text))
     
     def detect_sections(self, text):
         """Detect resume sections and their content"""
-        sections = {}
-        
-        for section_name, pattern in self.section_patterns.items():
-            matches = list(re.finditer(pattern, text, re.MULTILINE))
-            if matches:
-                sections[section_name] = {
-                    'found': True,
-                    'positions': [match.start() for match in matches]
-                }
-            else:
-                sections[section_name] = {'found': False, 'positions': []}
+        return self.parser.sections(self.parser.view(text))
+    
+    def embed_documents(self, texts):
+        """Unit-normalized MiniLM embeddings, one row per text"""
+        return self.models.embedding_model.encode(texts, batch_size=self.batch_size, normalize_embeddings=True)
+    
+    def extract_keywords_batch(self, texts, doc_embeddings=None):
+        """Run KeyBERT over several documents with shared, mini-batched embedding passes
+        
+        Candidate phrases are collected once for all documents, then documents and
+        candidates are embedded in padded mini-batches of self.batch_size instead
+        of one small forward pass per resume. doc_embeddings (from embed_documents)
+        skips the document pass.
+        """
+        if not texts:
+            return []
         
-        return sections
+        from sklearn.feature_extraction.text import CountVectorizer
+        
+        vectorizer = CountVectorizer(ngram_range=(1, 2), stop_words='english')
+        try:
+            candidates = vectorizer.fit(texts).get_feature_names_out().tolist()
+        except ValueError:
+            # Only stop words / empty documents: nothing to rank
+            return [[] for _ in texts]
+        
+        embedding_model = self.models.embedding_model
+        if doc_embeddings is None:
+            doc_embeddings = self.embed_documents(texts)
+        word_embeddings = embedding_model.encode(candidates, batch_size=self.batch_size)
+        
+        keywords = self.kw_model.extract_keywords(texts, vectorizer=vectorizer, top_n=20,
+                                                  doc_embeddings=doc_embeddings,
+                                                  word_embeddings=word_embeddings)
+        
+        # KeyBERT returns a flat list when given a single document
+        if len(texts) == 1:
+            keywords = [keywords]
+        return keywords
     
-    def extract_skills(self, text):
-        """Extract skills using multiple methods"""
+    def extract_skills(self, text, keywords=None):
+        """Extract skills using multiple methods
+        
+        keywords can carry KeyBERT results computed ahead of time (see analyze_resumes).
+        """
         skills = {}
         text_lower = text.lower()
         
-        # Pattern-based skill extraction
-        for category, skill_list in self.skill_patterns.items():
-            found_skills = []
-            for skill in skill_list:
-                # Create flexible pattern for skill matching
-                pattern = r'\b' + re.escape(skill.lower()) + r'\b'
-                if re.search(pattern, text_lower):
-                    found_skills.append({
-                        'name': skill,
-                        'confidence': 0.9,  # High confidence for pattern matches
-                        'category': category
-                    })
-            skills[category] = found_skills
+        # Pattern-based skill extraction (one scan over the text for all skills)
+        matched = self.skill_matcher.match(text_lower)
+        for category in self.skill_patterns:
+            skills[category] = [
+                {
+                    'name': skill['name'],
+                    'confidence': 0.9,  # High confidence for pattern matches
+                    'category': category
+                }
+                for skill in matched.get(category, [])
+            ]
         
         # KeyBERT keyword extraction for additional skills
         try:
-            keywords = self.kw_model.extract_keywords(text, keyphrase_ngram_range=(1, 2), 
-                                                    stop_words='english', top_k=20)
+            if keywords is None:
+                keywords = self.extract_keywords_batch([text])[0]
             
             for keyword, score in keywords:
                 if score > 0.3:  # Confidence threshold
@@ -219,6 +232,23 @@ class ATSProcessor:
         
         return all_skills
     
+    def add_skills(self, category, skills):
+        """Extend the skill taxonomy; the matcher recompiles on next use"""
+        category_skills = self.skill_patterns.setdefault(category, [])
+        for skill in skills:
+            if skill.lower() not in category_skills:
+                category_skills.append(skill.lower())
+        self.skill_matcher.add_skills(category, skills)
+    
+    def remove_skill(self, skill, category=None):
+        """Remove a skill from one taxonomy category (or from all when category is None)"""
+        categories = [category] if category is not None else list(self.skill_patterns)
+        for name in categories:
+            category_skills = self.skill_patterns.get(name, [])
+            if skill.lower() in category_skills:
+                category_skills.remove(skill.lower())
+        self.skill_matcher.remove_skill(skill, category)
+    
     def categorize_skill(self, skill):
         """Categorize a skill based on predefined patterns"""
         skill_lower = skill.lower()
@@ -231,101 +261,31 @@ class ATSProcessor:
     
     def extract_experience(self, text):
         """Extract work experience information"""
-        experience = {
-            'totalYears': 0,
-            'positions': []
-        }
-        
-        # Look for year patterns to estimate total experience
-        year_pattern = r'\b(19|20)\d{2}\b'
-        years = [int(year) for year in re.findall(year_pattern, text)]
-        
-        if years:
-            current_year = datetime.now().year
-            min_year = min(years)
-            max_year = max(years)
-            
-            # Estimate total years of experience
-            if min_year < current_year:
-                experience['totalYears'] = current_year - min_year
-        
-        # Extract position titles (simplified)
-        position_patterns = [
-            r'(?i)(developer|engineer|manager|analyst|specialist|coordinator|director|lead)',
-            r'(?i)(software|web|frontend|backend|full.?stack|data|systems)',
-        ]
-        
-        positions = []
-        for pattern in position_patterns:
-            matches = re.findall(f'.{{0,20}}{pattern}.{{0,20}}', text, re.IGNORECASE)
-            positions.extend(matches[:3])  # Limit to prevent noise
-        
-        experience['positions'] = [{'title': pos.strip(), 'company': 'Unknown', 'duration': 'Unknown', 'skills': []} 
-                                 for pos in positions[:5]]
-        
-        return experience
+        return self.parser.experience(self.parser.view(text))
     
     def extract_education(self, text):
         """Extract education information"""
-        education = []
-        
-        # Degree patterns
-        degree_patterns = [
-            r'(?i)(bachelor|master|phd|doctorate|diploma|certificate).{0,50}(computer|software|engineering|science|technology)',
-            r'(?i)(b\.?s\.?|m\.?s\.?|m\.?a\.?|b\.?a\.?|ph\.?d\.?)',
-        ]
-        
-        for pattern in degree_patterns:
-            matches = re.findall(pattern, text)
-            for match in matches[:3]:  # Limit results
-                education.append({
-                    'degree': ' '.join(match) if isinstance(match, tuple) else match,
-                    'institution': 'Unknown',
-                    'year': 'Unknown'
-                })
-        
-        return education
+        return self.parser.education(self.parser.view(text))
     
     def calculate_job_match(self, resume_skills, job_profile_id=None):
         """Calculate job matching score"""
-        # Default job profiles
-        job_profiles = {
-            'fullstack': {
-                'title': 'Full Stack Developer',
-                'required_skills': ['javascript', 'react', 'node.js', 'html', 'css'],
-                'preferred_skills': ['python', 'typescript', 'postgresql', 'aws'],
-                'weights': {'required': 0.7, 'preferred': 0.3}
-            },
-            'frontend': {
-                'title': 'Frontend Developer',
-                'required_skills': ['javascript', 'react', 'html', 'css'],
-                'preferred_skills': ['typescript', 'vue.js', 'sass', 'webpack'],
-                'weights': {'required': 0.8, 'preferred': 0.2}
-            },
-            'backend': {
-                'title': 'Backend Developer',
-                'required_skills': ['python', 'node.js', 'sql', 'api development'],
-                'preferred_skills': ['django', 'flask', 'postgresql', 'redis'],
-                'weights': {'required': 0.8, 'preferred': 0.2}
-            }
-        }
+        compiled = self.profile_store.compiled()
         
-        # Use default profile if none specified
-        if not job_profile_id or job_profile_id not in job_profiles:
-            job_profile_id = 'fullstack'
+        # Use default profile if none specified (or unknown)
+        job_profile_id = compiled.resolve(job_profile_id)
         
-        profile = job_profiles[job_profile_id]
-        resume_skill_names = [skill['name'].lower() for skill in resume_skills]
+        profile = compiled.profiles[job_profile_id]
+        required_keys = compiled.required_keys[job_profile_id]
+        preferred_keys = compiled.preferred_keys[job_profile_id]
+        resume_skill_names = {skill['name'].lower() for skill in resume_skills}
         
         # Calculate required skills match
-        required_matches = sum(1 for skill in profile['required_skills'] 
-                             if skill.lower() in resume_skill_names)
-        required_score = (required_matches / len(profile['required_skills'])) * 100
+        required_matches = sum(1 for skill in required_keys if skill in resume_skill_names)
+        required_score = (required_matches / len(required_keys)) * 100
         
         # Calculate preferred skills match
-        preferred_matches = sum(1 for skill in profile['preferred_skills'] 
-                              if skill.lower() in resume_skill_names)
-        preferred_score = (preferred_matches / len(profile['preferred_skills'])) * 100 if profile['preferred_skills'] else 0
+        preferred_matches = sum(1 for skill in preferred_keys if skill in resume_skill_names)
+        preferred_score = (preferred_matches / len(preferred_keys)) * 100 if preferred_keys else 0
         
         # Weighted final score
         weights = profile['weights']
@@ -333,18 +293,20 @@ class ATSProcessor:
                       preferred_score * weights['preferred'])
         
         # Find missing skills
-        missing_skills = [skill for skill in profile['required_skills'] + profile['preferred_skills']
-                         if skill.lower() not in resume_skill_names]
+        missing_skills = [skill for skill, key in zip(profile['required_skills'] + profile['preferred_skills'],
+                                                      required_keys + preferred_keys)
+                         if key not in resume_skill_names]
         
         # Find strengths
+        profile_skill_names = compiled.skill_keys[job_profile_id]
         strengths = [skill['name'] for skill in resume_skills 
-                    if skill['name'].lower() in [s.lower() for s in profile['required_skills'] + profile['preferred_skills']]]
+                    if skill['name'].lower() in profile_skill_names]
         
         # Generate recommendations
         recommendations = []
-        if required_matches < len(profile['required_skills']):
+        if required_matches < len(required_keys):
             recommendations.append("Focus on acquiring missing required skills")
-        if preferred_matches < len(profile['preferred_skills']) / 2:
+        if preferred_matches < len(preferred_keys) / 2:
             recommendations.append("Consider learning preferred skills to stand out")
         if len(resume_skills) < 10:
             recommendations.append("Add more technical skills to your resume")
@@ -377,14 +339,14 @@ class ATSProcessor:
             
             # Additional scoring based on content quality
             if found and section_name in ['experience', 'education', 'skills']:
-                # Simple content length check
-                section_content_length = len(text) // 10  # Rough estimate
+                # Body length under the section's headings (rough estimate without segmentation)
+                section_content_length = sections[section_name].get('length', len(text) // 10)
                 if section_content_length > 100:
                     score += 20
                 elif section_content_length > 50:
                     score += 10
             
-            status = 'excellent' if score >= 90 else 'good' if score >= 70 else 'average' if score >= 50 else 'poor'
+            status = section_status(score)
             
             section_scores.append({
                 'name': section_name.title(),
@@ -423,50 +385,284 @@ class ATSProcessor:
         
         return int(overall)
     
-    def analyze_resume(self, file_path, job_profile_id=None):
-        """Main analysis function"""
+    def load_text(self, file_path, content_hash=None, info=None):
+        """Extract text and reject documents that are too short to analyze"""
+        text = self.cache.get_text(content_hash) if self.cache and content_hash else None
+        
+        if text is None:
+            text = self.extract_text(file_path, info)
+            if self.cache and content_hash and text:
+                self.cache.set_text(content_hash, text)
+        
+        if not text or len(text.strip()) < 50:
+            raise ValueError("Could not extract sufficient text from resume")
+        
+        return text
+    
+    def keywords_fit(self, keyword_text, deadline):
+        """Whether KeyBERT over keyword_text is expected to finish before the deadline
+        
+        Loading the models takes seconds, so in a process where KeyBERT is not
+        loaded yet a deadline-bound analysis skips it and starts the load instead.
+        """
+        if deadline is None:
+            return True
+        if 'keybert' not in self.models.loaded():
+            self.models.load_in_background('keybert')
+            return False
+        return self.keyword_cost.fits(len(keyword_text), deadline)
+    
+    def extract_keywords(self, keyword_text):
+        """KeyBERT keywords and the document embedding of one resume's keyword text
+        
+        Runs with models already loaded are timed into keyword_cost.
+        """
+        warm = 'keybert' in self.models.loaded()
+        start = time.perf_counter()
         try:
-            # Extract text
-            text = self.extract_text(file_path)
-            
-            if not text or len(text.strip()) < 50:
-                raise ValueError("Could not extract sufficient text from resume")
-            
-            # Extract information
-            personal_info = self.extract_personal_info(text)
-            sections = self.detect_sections(text)
-            skills = self.extract_skills(text)
-            experience = self.extract_experience(text)
-            education = self.extract_education(text)
-            
-            # Calculate scores
+            doc_embedding = self.embed_documents([keyword_text])[0]
+            keywords = self.extract_keywords_batch([keyword_text], [doc_embedding])[0]
+        except Exception as e:
+            print(f"KeyBERT extraction failed: {e}")
+            return [], None
+        if warm:
+            self.keyword_cost.observe(time.perf_counter() - start, len(keyword_text))
+        return keywords, doc_embedding
+    
+    def extract_features(self, text, keywords=None, timings=NULL_TIMINGS, doc_embedding=None, view=None,
+                         deadline=None):
+        """Run the profile-independent stages (cacheable per file content)
+        
+        view is the text's ResumeText segmentation, when the caller already built it.
+        The cheap stages run first; with a deadline (epoch seconds), KeyBERT only
+        runs if it is expected to fit in the time left. Otherwise skills come from
+        the taxonomy patterns alone and the features are marked partial.
+        """
+        # Lines and section spans are found once and shared by the extractors
+        if view is None:
+            with timings.stage('segment'):
+                view = self.parser.view(text)
+        
+        with timings.stage('sections'):
+            sections = self.parser.sections(view)
             section_scores = self.calculate_section_scores(sections, text)
-            job_match = self.calculate_job_match(skills, job_profile_id)
-            overall_score = self.calculate_overall_score(section_scores, job_match['matchPercentage'], len(skills))
-            
-            # Build analysis result
-            analysis_result = {
-                'overallScore': overall_score,
-                'personalInfo': personal_info,
-                'sections': section_scores,
-                'skills': skills,
-                'experience': experience,
-                'education': education,
-                'jobMatch': job_match,
-                'keywords': {
-                    'found': [skill['name'] for skill in skills],
-                    'missing': job_match['missingSkills'],
-                    'density': len(skills)
-                },
-                'formatting': {
-                    'score': 85,
-                    'issues': []
-                },
-                'analysisDate': datetime.now().isoformat(),
-                'textLength': len(text)
-            }
+        with timings.stage('personal_info'):
+            personal_info = self.parser.personal_info(view)
+        with timings.stage('experience'):
+            experience = self.parser.experience(view)
+        with timings.stage('education'):
+            education = self.parser.education(view)
+        
+        partial = False
+        if keywords is None:
+            keyword_text = view.keyword_text()
+            if self.keywords_fit(keyword_text, deadline):
+                with timings.stage('keywords'):
+                    keywords, doc_embedding = self.extract_keywords(keyword_text)
+            else:
+                keywords = []
+                partial = True
+        
+        with timings.stage('skills'):
+            skills = self.extract_skills(text, keywords)
+        
+        features = {
+            'personalInfo': personal_info,
+            'sections': section_scores,
+            'skills': skills,
+            'experience': experience,
+            'education': education,
+            'textLength': len(text),
+            'embedding': encode_vector(doc_embedding) if doc_embedding is not None else None
+        }
+        if partial:
+            features['partial'] = True
+        return features
+    
+    def score_analysis(self, features, job_profile_id=None):
+        """Run the job-profile dependent stages and build the analysis result"""
+        skills = features['skills']
+        job_match = self.calculate_job_match(skills, job_profile_id)
+        overall_score = self.calculate_overall_score(features['sections'], job_match['matchPercentage'], len(skills))
+        
+        # Build analysis result
+        analysis_result = {
+            'overallScore': overall_score,
+            'personalInfo': features['personalInfo'],
+            'sections': features['sections'],
+            'skills': skills,
+            'experience': features['experience'],
+            'education': features['education'],
+            'jobMatch': job_match,
+            'keywords': {
+                'found': [skill['name'] for skill in skills],
+                'missing': job_match['missingSkills'],
+                'density': len(skills)
+            },
+            'formatting': {
+                'score': 85,
+                'issues': []
+            },
+            'analysisDate': datetime.now().isoformat(),
+            'textLength': features['textLength']
+        }
+        
+        # Keyword skills were skipped to meet a deadline; the analysis is completed later
+        if features.get('partial'):
+            analysis_result['partial'] = True
+        
+        return analysis_result
+    
+    def analyze_text(self, text, job_profile_id=None, keywords=None):
+        """Run the analysis stages on already extracted text"""
+        return self.score_analysis(self.extract_features(text, keywords), job_profile_id)
+    
+    def get_cached_features(self, content_hash):
+        if self.cache and content_hash:
+            return self.cache.get_features(content_hash)
+        return None
+    
+    def cache_features(self, content_hash, features):
+        if self.cache and content_hash:
+            self.cache.set_features(content_hash, features)
+    
+    def index_embedding(self, resume_id, features):
+        """Add the resume's document embedding to the embedding store, if one is configured"""
+        if not (self.embedding_store and resume_id and features.get('embedding')):
+            return
+        try:
+            self.embedding_store.add([resume_id], [decode_vector(features['embedding'])])
+        except Exception as e:
+            print(f"❌ Embedding store update failed: {e}")
+    
+    def profile_embedding(self, profile_id):
+        """Embedding of a job profile's text, computed once per version of the profile"""
+        text = profile_text(self.job_profiles[profile_id])
+        key = f"{profile_id}:{hashlib.sha1(text.encode('utf-8')).hexdigest()[:12]}"
+        store = self.profile_embedding_store
+        vector = store.get(key) if store else None
+        if vector is None:
+            vector = self.embed_documents([text])[0]
+            if store:
+                store.add([key], [vector])
+        return vector
+    
+    def semantic_search(self, description=None, profile_id=None, limit=50):
+        """Resumes closest in meaning to a free-text job description or a job profile
+        
+        Returns [(resume_id, cosine similarity)], most similar first.
+        """
+        if not self.embedding_store:
+            raise Exception("Embedding store not configured")
+        if profile_id is not None:
+            vector = self.profile_embedding(profile_id)
+        else:
+            vector = self.embed_documents([description])[0]
+        return self.embedding_store.search(vector, limit)
+    
+    def emit_timings(self, timings, file_path, info, features=None):
+        """Send one analysis' stage timings to the metrics sinks, labelled by file type and pages"""
+        if timings is NULL_TIMINGS:
+            return
+        pages = info.get('pages')
+        if pages is None and features:
+            pages = max(1, round(features['textLength'] / CHARS_PER_PAGE))
+        file_type = os.path.splitext(file_path)[1].lower().lstrip('.') or 'unknown'
+        self.instrumentation.emit(timings, file_type, pages)
+    
+    def analyze_resume(self, file_path, job_profile_id=None, content_hash=None, resume_id=None, deadline=None):
+        """Main analysis function
+        
+        content_hash (SHA-256 of the file bytes) enables the analysis cache: a
+        file seen before only reruns job matching and scoring. resume_id keys the
+        document embedding in the embedding store. deadline (epoch seconds) may
+        skip KeyBERT, returning a result marked partial (see extract_features).
+        """
+        timings = self.instrumentation.timings()
+        info = {}
+        features = None
+        try:
+            with timings.stage('cache_lookup'):
+                features = self.get_cached_features(content_hash)
+            if features is None:
+                with timings.stage('extract_text'):
+                    text = self.load_text(file_path, content_hash, info)
+                features = self.extract_features(text, timings=timings, deadline=deadline)
+                # Partial features are not cached, so completing the analysis recomputes them
+                if not features.get('partial'):
+                    self.cache_features(content_hash, features)
+            self.index_embedding(resume_id, features)
             
-            return analysis_result
+            with timings.stage('scoring'):
+                return self.score_analysis(features, job_profile_id)
             
         except Exception as e:
-            raise Exception(f"Analysis failed: {str(e)}")
\ No newline at end of file
+            raise Exception(f"Analysis failed: {str(e)}")
+        
+        finally:
+            self.emit_timings(timings, file_path, info, features)
+    
+    def analyze_resumes(self, file_paths, job_profile_id=None, content_hashes=None, resume_ids=None):
+        """Analyze several resumes, sharing batched KeyBERT / embedding inference
+        
+        Returns one entry per path, in order: the analysis dict, or the
+        exception raised for that file so one bad resume does not fail the batch.
+        """
+        content_hashes = content_hashes or [None] * len(file_paths)
+        resume_ids = resume_ids or [None] * len(file_paths)
+        features = [self.get_cached_features(content_hash) for content_hash in content_hashes]
+        timings = [self.instrumentation.timings() for _ in file_paths]
+        infos = [{} for _ in file_paths]
+        results = [None] * len(file_paths)
+        texts = {}
+        views = {}
+        
+        for index, file_path in enumerate(file_paths):
+            if features[index] is not None:
+                continue
+            try:
+                with timings[index].stage('extract_text'):
+                    texts[index] = self.load_text(file_path, content_hashes[index], infos[index])
+                with timings[index].stage('segment'):
+                    views[index] = self.parser.view(texts[index])
+            except Exception as e:
+                results[index] = Exception(f"Analysis failed: {str(e)}")
+        
+        indexes = list(views)
+        keywords_ok = True
+        start = time.perf_counter()
+        doc_embeddings = [None] * len(indexes)
+        try:
+            # KeyBERT and the document embedding read the skills/experience sections only
+            batch_texts = [views[index].keyword_text() for index in indexes]
+            if batch_texts:
+                doc_embeddings = self.embed_documents(batch_texts)
+            batch_keywords = self.extract_keywords_batch(batch_texts, doc_embeddings)
+        except Exception as e:
+            print(f"Batched KeyBERT extraction failed: {e}")
+            batch_keywords = [[] for _ in indexes]
+            keywords_ok = False
+        
+        # Attribute the shared inference time evenly to the resumes in the batch
+        keyword_seconds = (time.perf_counter() - start) / max(len(indexes), 1)
+        for index, keywords, doc_embedding in zip(indexes, batch_keywords, doc_embeddings):
+            timings[index].add('keywords', keyword_seconds)
+            try:
+                features[index] = self.extract_features(texts[index], keywords, timings[index], doc_embedding,
+                                                        views[index])
+                if keywords_ok:
+                    self.cache_features(content_hashes[index], features[index])
+            except Exception as e:
+                results[index] = Exception(f"Analysis failed: {str(e)}")
+        
+        for index, resume_features in enumerate(features):
+            if resume_features is not None:
+                self.index_embedding(resume_ids[index], resume_features)
+                try:
+                    with timings[index].stage('scoring'):
+                        results[index] = self.score_analysis(resume_features, job_profile_id)
+                except Exception as e:
+                    results[index] = Exception(f"Analysis failed: {str(e)}")
+            self.emit_timings(timings[index], file_paths[index], infos[index], resume_features)
+        
+        return results
@@ -0,0 +1,192 @@
+"""
+Benchmark: analyses as one JSON TEXT blob per resume vs. the columnar layout
+Fills a legacy-layout database and a current one with the same synthetic
+analyses, then compares on-disk size and the latency of typical reads
+Run from the backend directory: python benchmarks/bench_analysis_storage.py [--resumes 20000]
+"""
+
+import argparse
+import json
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database
+from analysis_storage import section_status
+
+SKILLS = [f'skill_{i:04d}' for i in range(2000)] + ['python', 'javascript', 'react', 'docker', 'sql', 'aws']
+CATEGORIES = ['programming', 'web', 'database', 'cloud', 'data_science', 'other']
+SECTIONS = ['Experience', 'Education', 'Skills', 'Projects', 'Certifications']
+
+# The pre-columnar queries, for comparison
+LEGACY_EXPORT = '''
+    SELECT id, filename, upload_date, overall_score, job_match_percentage,
+        (SELECT json_extract(value, '$.score') FROM json_each(analysis, '$.sections')
+         WHERE json_extract(value, '$.name') = 'Skills'),
+        (SELECT json_extract(value, '$.score') FROM json_each(analysis, '$.sections')
+         WHERE json_extract(value, '$.name') = 'Experience'),
+        (SELECT json_extract(value, '$.score') FROM json_each(analysis, '$.sections')
+         WHERE json_extract(value, '$.name') = 'Education'),
+        (SELECT group_concat(json_extract(value, '$.name'), ', ') FROM json_each(analysis, '$.skills')),
+        (SELECT group_concat(value, ', ') FROM json_each(analysis, '$.jobMatch.missingSkills'))
+    FROM resumes WHERE overall_score IS NOT NULL
+'''
+LEGACY_TOP_SKILLS = '''
+    SELECT json_extract(s.value, '$.name') AS name, COUNT(*) FROM resumes r, json_each(r.analysis, '$.skills') s
+    GROUP BY name ORDER BY 2 DESC LIMIT 20
+'''
+TOP_SKILLS = '''
+    SELECT s.name, COUNT(*) FROM resume_skills rs JOIN skills s ON s.id = rs.skill_id
+    GROUP BY rs.skill_id ORDER BY 2 DESC LIMIT 20
+'''
+LEGACY_SECTION_AVERAGE = '''
+    SELECT AVG(json_extract(s.value, '$.score')) FROM resumes r, json_each(r.analysis, '$.sections') s
+    WHERE json_extract(s.value, '$.name') = 'Experience'
+'''
+SECTION_AVERAGE = 'SELECT AVG(experience_score) FROM resumes'
+
+
+def make_analysis(rng):
+    skills = [{'name': name, 'confidence': rng.choice([0.9, round(rng.uniform(0.3, 0.8), 4)]),
+               'category': rng.choice(CATEGORIES)} for name in rng.sample(SKILLS, rng.randint(8, 40))]
+    scores = [rng.choice([0, 70, 80, 90]) for _ in SECTIONS]
+    job_match = {
+        'title': 'Full Stack Developer',
+        'matchPercentage': rng.randint(0, 100),
+        'missingSkills': rng.sample(SKILLS, 5),
+        'strengths': [skill['name'] for skill in skills[:5]],
+        'recommendations': ['Focus on acquiring missing required skills']
+    }
+    return {
+        'overallScore': rng.randint(20, 100),
+        'personalInfo': {'email': 'jane.candidate@example.com', 'phone': '5551234567', 'name': 'Jane Candidate'},
+        'sections': [{'name': name, 'score': score, 'status': section_status(score), 'found': score > 0}
+                     for name, score in zip(SECTIONS, scores)],
+        'skills': skills,
+        'experience': {'totalYears': rng.randint(0, 20), 'positions': [
+            {'title': 'Senior Software Engineer at Acme', 'company': 'Unknown', 'duration': 'Unknown', 'skills': []}
+        ] * rng.randint(1, 5)},
+        'education': [{'degree': 'Bachelor Computer Science', 'institution': 'Unknown', 'year': 'Unknown'}],
+        'jobMatch': job_match,
+        'keywords': {'found': [skill['name'] for skill in skills], 'missing': job_match['missingSkills'],
+                     'density': len(skills)},
+        'formatting': {'score': 85, 'issues': []},
+        'analysisDate': '2024-05-01T12:00:00',
+        'textLength': rng.randint(2000, 20000)
+    }
+
+
+def insert_json(cursor, analyses):
+    cursor.executemany('''
+        INSERT INTO resumes (id, filename, file_path, status, analysis, overall_score, job_match_percentage)
+        VALUES (?, ?, '', 'completed', ?, ?, ?)
+    ''', [(resume_id, f'{resume_id}.pdf', json.dumps(analysis), analysis['overallScore'],
+           analysis['jobMatch']['matchPercentage']) for resume_id, analysis in analyses])
+
+
+def table_sizes(conn):
+    """MB per table with its indexes (dbstat), or the whole file"""
+    try:
+        rows = conn.execute('''
+            SELECT COALESCE(m.tbl_name, d.name), SUM(d.pgsize) FROM dbstat d
+            LEFT JOIN sqlite_master m ON m.name = d.name GROUP BY 1
+        ''').fetchall()
+    except sqlite3.OperationalError:
+        rows = [('(file)', conn.execute('PRAGMA page_count').fetchone()[0] *
+                 conn.execute('PRAGMA page_size').fetchone()[0])]
+    return {name: size / 1024 / 1024 for name, size in rows}
+
+
+def timed(func, repeats=3):
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--resumes', type=int, default=20000)
+    parser.add_argument('--lookups', type=int, default=1000)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    analyses = [(str(uuid.uuid4()), make_analysis(rng)) for _ in range(args.resumes)]
+    sample = [resume_id for resume_id, _ in rng.sample(analyses, min(args.lookups, len(analyses)))]
+
+    with tempfile.TemporaryDirectory() as folder:
+        legacy = sqlite3.connect(os.path.join(folder, 'legacy.db'))
+        legacy.execute('''
+            CREATE TABLE resumes (
+                id TEXT PRIMARY KEY, filename TEXT NOT NULL, file_path TEXT NOT NULL,
+                upload_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP, status TEXT DEFAULT 'pending',
+                analysis TEXT, job_profile_id TEXT, overall_score INTEGER, job_match_percentage INTEGER
+            )
+        ''')
+        insert_json(legacy, analyses)
+        legacy.commit()
+        legacy.execute('VACUUM')
+
+        database.DATABASE_PATH = os.path.join(folder, 'columnar.db')
+        database.init_db()
+        with database.transaction() as cursor:
+            insert_json(cursor, analyses)
+        start = time.perf_counter()
+        database.convert_json_analyses()
+        database.rebuild_skill_index()
+        elapsed = time.perf_counter() - start
+        print(f"{args.resumes} analyses converted in {elapsed:.1f}s ({args.resumes / elapsed:.0f} rows/s)")
+        database.close_connection()
+        columnar = sqlite3.connect(database.DATABASE_PATH)
+        columnar.execute('VACUUM')
+
+        print("\nsize (MB)")
+        for name, conn in (('json', legacy), ('columnar', columnar)):
+            sizes = table_sizes(conn)
+            detail = ', '.join(f'{table} {size:.1f}' for table, size in sorted(sizes.items(), key=lambda item: -item[1])
+                               if size >= 0.1)
+            print(f"  {name:<9} {sum(sizes.values()):8.1f}   {detail}")
+
+        def legacy_lookup():
+            for resume_id in sample:
+                row = legacy.execute('SELECT analysis FROM resumes WHERE id = ?', (resume_id,)).fetchone()
+                json.loads(row[0])
+
+        def columnar_lookup():
+            for resume_id in sample:
+                database.get_resume_analysis(resume_id)
+
+        cases = [
+            (f'full analysis x{len(sample)}', legacy_lookup, columnar_lookup),
+            ('export rows', lambda: legacy.execute(LEGACY_EXPORT).fetchall(),
+             lambda: sum(1 for _ in database.iter_export_rows())),
+            ('skill lists (ranking)', lambda: legacy.execute(
+                "SELECT id, (SELECT json_group_array(json_extract(value, '$.name')) "
+                "FROM json_each(analysis, '$.skills')) FROM resumes").fetchall(),
+             lambda: sum(1 for _ in database.iter_resume_skills())),
+            ('top 20 skills', lambda: legacy.execute(LEGACY_TOP_SKILLS).fetchall(),
+             lambda: database.get_connection().execute(TOP_SKILLS).fetchall()),
+            ('avg experience score', lambda: legacy.execute(LEGACY_SECTION_AVERAGE).fetchall(),
+             lambda: database.get_connection().execute(SECTION_AVERAGE).fetchall()),
+        ]
+
+        print(f"\n{'query':<26} {'json ms':>10} {'columnar ms':>12} {'speedup':>8}")
+        for name, old, new in cases:
+            old_ms, new_ms = timed(old), timed(new)
+            print(f"{name:<26} {old_ms:>10.1f} {new_ms:>12.1f} {old_ms / new_ms:>7.1f}x")
+
+        legacy.close()
+        columnar.close()
+        database.close_connection()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""
+Benchmark: per-resume KeyBERT calls vs. batched keyword extraction
+Reports CPU throughput in resumes/sec for the keyword stage
+Run from the backend directory: python benchmarks/bench_batch_inference.py [--resumes 64] [--threads 4]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ats_processor import ATSProcessor
+from model_registry import ModelRegistry
+
+SKILLS = ['Python', 'JavaScript', 'React', 'Node.js', 'PostgreSQL', 'Docker', 'Kubernetes', 'AWS',
+          'Django', 'Flask', 'TensorFlow', 'PyTorch', 'Redis', 'GraphQL', 'TypeScript', 'Spark']
+PHRASES = ['Designed and shipped', 'Led a team building', 'Maintained services using',
+           'Migrated legacy systems to', 'Optimized pipelines with', 'Mentored engineers on']
+
+
+def make_resume(rng):
+    lines = ['Jane Doe', 'jane.doe@example.com', 'Experience']
+    for _ in range(rng.randint(15, 40)):
+        lines.append(f"{rng.choice(PHRASES)} {rng.choice(SKILLS)} and {rng.choice(SKILLS)} for {rng.randint(2, 9)} years")
+    lines.append('Skills')
+    lines.append(', '.join(rng.sample(SKILLS, 8)))
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--resumes', type=int, default=64)
+    parser.add_argument('--threads', type=int, default=None)
+    parser.add_argument('--batch-sizes', default='8,32,64')
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    texts = [make_resume(rng) for _ in range(args.resumes)]
+
+    processor = ATSProcessor(models=ModelRegistry(torch_threads=args.threads))
+    processor.models.warm_up(freeze=False)
+    processor.extract_keywords_batch(texts[:2])  # warm up kernels
+
+    start = time.perf_counter()
+    for text in texts:
+        processor.kw_model.extract_keywords(text, keyphrase_ngram_range=(1, 2), stop_words='english', top_n=20)
+    baseline = len(texts) / (time.perf_counter() - start)
+    print(f"per-resume KeyBERT:        {baseline:8.2f} resumes/sec")
+
+    for batch_size in [int(size) for size in args.batch_sizes.split(',')]:
+        processor.batch_size = batch_size
+        start = time.perf_counter()
+        processor.extract_keywords_batch(texts)
+        throughput = len(texts) / (time.perf_counter() - start)
+        print(f"batched (batch_size={batch_size:>3}): {throughput:8.2f} resumes/sec ({throughput / baseline:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""
+Benchmark: concurrent read/write throughput, connect-per-call vs. pooled WAL connections
+Writer processes stand in for Celery workers saving analyses, readers for dashboard polling
+Run from the backend directory: python benchmarks/bench_db_concurrency.py [--writers 4 --readers 4]
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database
+
+ANALYSIS = json.dumps({'overallScore': 72, 'skills': [{'name': 'python'}] * 20})
+
+
+def legacy_write(resume_id):
+    """The original access pattern: new connection, rollback journal, close per call"""
+    conn = sqlite3.connect(database.DATABASE_PATH)
+    cursor = conn.cursor()
+    cursor.execute("UPDATE resumes SET analysis = ?, status = 'completed' WHERE id = ?", (ANALYSIS, resume_id))
+    conn.commit()
+    conn.close()
+
+
+def legacy_read(_):
+    conn = sqlite3.connect(database.DATABASE_PATH)
+    cursor = conn.cursor()
+    cursor.execute('SELECT id, filename, status FROM resumes ORDER BY upload_date DESC LIMIT 50')
+    cursor.fetchall()
+    conn.close()
+
+
+def pooled_write(resume_id):
+    database.update_resume_analysis(resume_id, {'overallScore': 72, 'skills': [{'name': 'python'}] * 20})
+
+
+def pooled_read(_):
+    database.get_all_resumes(50, 0)
+
+
+def worker(args):
+    db_path, mode, role, resume_ids, duration = args
+    database.DATABASE_PATH = db_path
+    operation = {
+        ('legacy', 'write'): legacy_write, ('legacy', 'read'): legacy_read,
+        ('pooled', 'write'): pooled_write, ('pooled', 'read'): pooled_read
+    }[(mode, role)]
+
+    done = errors = 0
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        try:
+            operation(resume_ids[done % len(resume_ids)])
+            done += 1
+        except sqlite3.OperationalError:
+            errors += 1
+    return role, done, errors
+
+
+def setup(db_path, mode, rows):
+    database.DATABASE_PATH = db_path
+    database.init_db()
+    resume_ids = [str(uuid.uuid4()) for _ in range(rows)]
+    for resume_id in resume_ids:
+        database.add_resume(resume_id, 'resume.pdf', '/tmp/resume.pdf', 'processing')
+    database.close_connection()
+    if mode == 'legacy':
+        conn = sqlite3.connect(db_path)
+        conn.execute('PRAGMA journal_mode=DELETE')
+        conn.close()
+    return resume_ids
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--writers', type=int, default=4)
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--rows', type=int, default=2000)
+    parser.add_argument('--duration', type=float, default=5.0)
+    args = parser.parse_args()
+
+    for mode in ('legacy', 'pooled'):
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, 'bench.db')
+            resume_ids = setup(db_path, mode, args.rows)
+            jobs = ([(db_path, mode, 'write', resume_ids, args.duration)] * args.writers +
+                    [(db_path, mode, 'read', resume_ids, args.duration)] * args.readers)
+
+            with multiprocessing.get_context('fork').Pool(len(jobs)) as pool:
+                results = pool.map(worker, jobs)
+
+            totals = {'write': [0, 0], 'read': [0, 0]}
+            for role, done, errors in results:
+                totals[role][0] += done
+                totals[role][1] += errors
+
+            print(f"{mode:>7}: writes {totals['write'][0] / args.duration:9.1f}/s "
+                  f"reads {totals['read'][0] / args.duration:9.1f}/s "
+                  f"locked errors {totals['write'][1] + totals['read'][1]}")
+
+
+if __name__ == '__main__':
+    main()
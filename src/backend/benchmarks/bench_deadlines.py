@@ -0,0 +1,84 @@
+"""
+Benchmark: full analyses vs. deadline-bound analyses during a traffic spike
+Each simulated upload has already waited in the queue for a random time (longer
+as the spike builds), then runs the profile-independent stages and scoring with
+or without a deadline. Reports end-to-end latency percentiles (wait included),
+how many analyses came back partial and the skills they kept.
+Run from the backend directory: python benchmarks/bench_deadlines.py [--budget-ms 400] [--wait-ms 250]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ats_processor import ATSProcessor
+from deadlines import deadline_after
+from metrics import Histogram
+from model_registry import ModelRegistry
+
+SKILLS = ['Python', 'JavaScript', 'React', 'Node.js', 'PostgreSQL', 'Docker', 'Kubernetes', 'AWS',
+          'Django', 'Flask', 'TensorFlow', 'PyTorch', 'Redis', 'GraphQL', 'TypeScript', 'Spark']
+PHRASES = ['Designed and shipped', 'Led a team building', 'Maintained services using',
+           'Migrated legacy systems to', 'Optimized pipelines with', 'Mentored engineers on']
+
+
+def make_resume(rng):
+    lines = ['Jane Doe', 'jane.doe@example.com', 'Experience']
+    for _ in range(rng.randint(15, 40)):
+        lines.append(f"{rng.choice(PHRASES)} {rng.choice(SKILLS)} and {rng.choice(SKILLS)} for {rng.randint(2, 9)} years")
+    lines.append('Skills')
+    lines.append(', '.join(rng.sample(SKILLS, 8)))
+    lines.append('Education')
+    lines.append('BSc Computer Science, 2015')
+    return '\n'.join(lines)
+
+
+def run(processor, texts, waits, budget_ms):
+    latencies = Histogram()
+    partial = skills = 0
+    for text, wait in zip(texts, waits):
+        # The queue wait already spent part of the budget
+        deadline = deadline_after(budget_ms, time.time() - wait) if budget_ms else None
+        start = time.perf_counter()
+        analysis = processor.score_analysis(processor.extract_features(text, deadline=deadline))
+        latencies.observe(wait + time.perf_counter() - start)
+        partial += bool(analysis.get('partial'))
+        skills += len(analysis['skills'])
+    return latencies.summary(), partial, skills / len(texts)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--resumes', type=int, default=200)
+    parser.add_argument('--budget-ms', type=float, default=400)
+    parser.add_argument('--wait-ms', type=float, default=250, help='mean queue wait at the peak of the spike')
+    parser.add_argument('--threads', type=int, default=None)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    texts = [make_resume(rng) for _ in range(args.resumes)]
+    # Waits ramp up to the peak and back down, exponentially distributed around the ramp
+    ramp = [1 - abs(2 * index / max(args.resumes - 1, 1) - 1) for index in range(args.resumes)]
+    waits = [rng.expovariate(1000 / max(args.wait_ms * level, 1)) for level in ramp]
+
+    processor = ATSProcessor(models=ModelRegistry(torch_threads=args.threads))
+    processor.models.warm_up(freeze=False)
+    # Warm up kernels and the keyword cost estimate
+    for text in texts[:5]:
+        processor.extract_features(text)
+
+    print(f"{args.resumes} uploads, budget {args.budget_ms:.0f} ms, peak mean wait {args.wait_ms:.0f} ms, "
+          f"keyword cost ~{processor.keyword_cost.estimate(len(texts[0])) * 1000:.0f} ms/resume\n")
+    print(f"{'mode':<10} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'partial':>8} {'skills':>7}")
+    for mode, budget_ms in (('full', 0), ('deadline', args.budget_ms)):
+        latency, partial, skills = run(processor, texts, waits, budget_ms)
+        print(f"{mode:<10} {latency['p50_ms']:>8.1f} {latency['p95_ms']:>8.1f} {latency['p99_ms']:>8.1f} "
+              f"{partial:>8} {skills:>7.1f}")
+
+
+if __name__ == '__main__':
+    main()
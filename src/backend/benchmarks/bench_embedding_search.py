@@ -0,0 +1,86 @@
+"""
+Benchmark: top-k semantic search over the embedding store
+Appends synthetic unit vectors (clustered, like real resume embeddings) to a
+throwaway store and times queries for float16 and int8 storage, plus hnswlib if installed
+Run from the backend directory: python benchmarks/bench_embedding_search.py [--resumes 100000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from embedding_store import EmbeddingStore, normalize
+
+
+def make_vectors(rng, count, dim, clusters=200):
+    centers = normalize(rng.standard_normal((clusters, dim)))
+    vectors = centers[rng.integers(0, clusters, count)] + 0.6 * rng.standard_normal((count, dim)) / np.sqrt(dim)
+    return normalize(vectors)
+
+
+def fill(store, vectors, chunk=10000):
+    for start in range(0, len(vectors), chunk):
+        keys = [f'resume-{row}' for row in range(start, min(start + chunk, len(vectors)))]
+        store.add(keys, vectors[start:start + chunk])
+
+
+def exact_top(vectors, query, k):
+    scores = vectors @ query
+    return {f'resume-{row}' for row in np.argsort(-scores)[:k]}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--resumes', type=int, default=100000)
+    parser.add_argument('--queries', type=int, default=50)
+    parser.add_argument('--k', type=int, default=20)
+    parser.add_argument('--dim', type=int, default=384)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(7)
+    vectors = make_vectors(rng, args.resumes, args.dim)
+    queries = make_vectors(rng, args.queries, args.dim)
+    truth = [exact_top(vectors, query, args.k) for query in queries]
+
+    print(f"{args.resumes} resumes, {args.dim} dims, top {args.k}")
+    print(f"{'mode':<10} {'MB':>8} {'fill s':>8} {'first ms':>9} {'p50 ms':>8} {'p95 ms':>8} {'recall':>7}")
+    for dtype, use_ann in (('float16', False), ('int8', False), ('float16', True)):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'resumes')
+            store = EmbeddingStore(path, dim=args.dim, dtype=dtype, use_ann=use_ann)
+
+            start = time.perf_counter()
+            fill(store, vectors)
+            fill_seconds = time.perf_counter() - start
+
+            # First search maps the files (and builds the ANN index)
+            start = time.perf_counter()
+            store.search(queries[0], args.k)
+            first = (time.perf_counter() - start) * 1000
+            if use_ann and not store.use_ann:
+                print("hnsw       skipped (hnswlib not installed)")
+                continue
+
+            latencies = []
+            hits = 0
+            for query, expected in zip(queries, truth):
+                start = time.perf_counter()
+                results = store.search(query, args.k)
+                latencies.append((time.perf_counter() - start) * 1000)
+                hits += len(expected & {key for key, _ in results})
+
+            size = os.path.getsize(f'{path}.vec') / 1024 / 1024
+            mode = 'hnsw' if use_ann else dtype
+            print(f"{mode:<10} {size:>8.1f} {fill_seconds:>8.2f} {first:>9.1f} "
+                  f"{np.percentile(latencies, 50):>8.2f} {np.percentile(latencies, 95):>8.2f} "
+                  f"{hits / (args.k * len(queries)):>7.3f}")
+
+
+if __name__ == '__main__':
+    main()
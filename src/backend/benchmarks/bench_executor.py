@@ -0,0 +1,116 @@
+"""
+Benchmark: resume analysis throughput of the process pool executor for 1..N workers
+Models load once per worker before timing starts; uses a throwaway database and
+the analysis cache is disabled so every resume is analyzed
+Run from the backend directory: python benchmarks/bench_executor.py [--resumes 64] [--max-workers 4]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fitz  # PyMuPDF
+
+import database
+from executor import ProcessPoolAnalysisExecutor
+
+SKILLS = ['Python', 'JavaScript', 'React', 'Node.js', 'PostgreSQL', 'Docker', 'Kubernetes', 'AWS',
+          'Django', 'Flask', 'TensorFlow', 'PyTorch', 'Redis', 'GraphQL', 'TypeScript', 'Spark']
+PHRASES = ['Designed and shipped', 'Led a team building', 'Maintained services using',
+           'Migrated legacy systems to', 'Optimized pipelines with', 'Mentored engineers on']
+
+SETTINGS = {
+    'EMBEDDING_BATCH_SIZE': 32,
+    'TORCH_THREADS': None,
+    'ANALYSIS_CACHE': 'none',
+    'ANALYSIS_CACHE_MAX_BYTES': 0,
+    'METRICS_SINKS': '',
+    'PDF_MAX_PAGES': 30,
+    'PDF_PARALLEL_MIN_PAGES': 8,
+    'PDF_WORKERS': 1,
+    'EMBEDDING_STORE': '',
+    'EMBEDDING_DTYPE': 'float16',
+    'PROFILE_CHECK_INTERVAL': 2.0,
+    'FILE_STORE': 'local',
+    'UPLOAD_FOLDER': 'uploads',
+    'INFERENCE_BACKEND': 'torch',
+    'ONNX_DIR': 'models/onnx',
+    'PRELOAD_MODELS': True,
+    'REDIS_URL': None
+}
+
+
+def make_resume_pdf(path, rng):
+    lines = ['Jane Doe', 'jane.doe@example.com', '+1 555 010 2030', 'Experience']
+    for _ in range(rng.randint(15, 40)):
+        lines.append(f"{rng.choice(PHRASES)} {rng.choice(SKILLS)} and {rng.choice(SKILLS)} for {rng.randint(2, 9)} years")
+    lines += ['Education', 'Bachelor of Science in Computer Science, 2015', 'Skills', ', '.join(rng.sample(SKILLS, 8))]
+
+    doc = fitz.open()
+    page = doc.new_page()
+    y = 60
+    for line in lines:
+        if y > 780:
+            page = doc.new_page()
+            y = 60
+        page.insert_text((50, y), line, fontsize=10)
+        y += 14
+    doc.save(path)
+    doc.close()
+
+
+def run(workers, items, mode, chunk_size):
+    executor = ProcessPoolAnalysisExecutor(SETTINGS, workers)
+    try:
+        executor.start()  # fork workers and load their models outside the timed region
+
+        start = time.perf_counter()
+        if mode == 'batch':
+            job_ids = [executor.submit_batch(items[index:index + chunk_size])
+                       for index in range(0, len(items), chunk_size)]
+        else:
+            job_ids = [executor.submit_resume(resume_id, file_path) for resume_id, file_path, _ in items]
+        executor.join(job_ids)
+        return len(items) / (time.perf_counter() - start)
+    finally:
+        executor.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--resumes', type=int, default=64)
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--mode', choices=('single', 'batch'), default='single')
+    parser.add_argument('--chunk-size', type=int, default=8)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    with tempfile.TemporaryDirectory() as folder:
+        # Workers are forked, so they inherit this database path
+        database.DATABASE_PATH = os.path.join(folder, 'bench.db')
+        database.init_db()
+
+        items = []
+        for index in range(args.resumes):
+            resume_id = str(uuid.uuid4())
+            file_path = os.path.join(folder, f'resume_{index}.pdf')
+            make_resume_pdf(file_path, rng)
+            database.add_resume(resume_id, f'resume_{index}.pdf', file_path, 'processing')
+            items.append((resume_id, file_path, None))
+
+        baseline = None
+        print(f"{'workers':>8} {'resumes/s':>10} {'speedup':>8}")
+        for workers in range(1, args.max_workers + 1):
+            throughput = run(workers, items, args.mode, args.chunk_size)
+            baseline = baseline or throughput
+            print(f"{workers:>8} {throughput:>10.2f} {throughput / baseline:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
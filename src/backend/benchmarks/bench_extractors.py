@@ -0,0 +1,104 @@
+"""
+Benchmark: per-call regex extractors vs. the precompiled ResumeParser pipeline
+Times personal info, sections, experience and education extraction on 1, 10
+and 100 page resumes, plus an adversarial single-line document with no '@'
+Run from the backend directory: python benchmarks/bench_extractors.py
+"""
+
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from resume_parser import ResumeParser, SECTION_PATTERNS
+
+PAGES = [1, 10, 100]
+CHARS_PER_PAGE = 3000
+REPEATS = 5
+# The original extractors are quadratic on the adversarial document; skip them above this
+LEGACY_ADVERSARIAL_MAX_PAGES = 1
+
+HEADER = 'Jane Q. Candidate\njane.candidate@example.com | (555) 123-4567\nLocation: Berlin, Germany\n\n'
+BLOCKS = [
+    'Professional Experience\nSenior Software Engineer, Acme Corp (2018 - 2023)\n'
+    'Led a team building data pipelines with Python and Spark.\n',
+    'Education\nBachelor of Science in Computer Science, State University, 2014\n',
+    'Technical Skills\nPython, JavaScript, React, Docker, Kubernetes, PostgreSQL\n',
+    'Projects\nBuilt a web analytics dashboard used by 40 analysts.\n',
+    'Certifications\nAWS Certified Solutions Architect\n',
+    'Worked closely with product managers and frontend developers on backend systems.\n'
+]
+
+
+def make_resume(pages, rng):
+    parts = [HEADER]
+    length = len(HEADER)
+    while length < pages * CHARS_PER_PAGE:
+        block = rng.choice(BLOCKS)
+        parts.append(block)
+        length += len(block)
+    return ''.join(parts)
+
+
+def make_adversarial(pages):
+    """One huge line of e-mail-like characters with no '@' and no contact keyword"""
+    return 'a.b-c_d ' * (pages * CHARS_PER_PAGE // 8)
+
+
+def legacy_extract(text):
+    """The original extractors: patterns looked up per call, every stage rescanning the text"""
+    re.findall(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text)
+    re.findall(r'(\+?\d{1,4}[-.\s]?)?\(?(\d{3})\)?[-.\s]?(\d{3})[-.\s]?(\d{4})', text)
+    for pattern in [r'name[:\s]+(.+)', r'(.+?)(?:\s*\n|\s*email|\s*phone|\s*address)']:
+        re.search(pattern, text, re.IGNORECASE)
+    re.search(r'(?i)(location|address)[:\s]+(.+?)(?:\n|$)', text)
+    for pattern in SECTION_PATTERNS.values():
+        list(re.finditer(pattern, text, re.MULTILINE | re.IGNORECASE))
+    re.findall(r'\b(19|20)\d{2}\b', text)
+    # Inline (?i) moved to a flag: mid-pattern global flags are an error on Python 3.11+
+    for pattern in [r'(developer|engineer|manager|analyst|specialist|coordinator|director|lead)',
+                    r'(software|web|frontend|backend|full.?stack|data|systems)']:
+        re.findall(f'.{{0,20}}{pattern}.{{0,20}}', text, re.IGNORECASE)
+    for pattern in [r'(?i)(bachelor|master|phd|doctorate|diploma|certificate).{0,50}(computer|software|engineering|science|technology)',
+                    r'(?i)(b\.?s\.?|m\.?s\.?|m\.?a\.?|b\.?a\.?|ph\.?d\.?)']:
+        re.findall(pattern, text)
+
+
+def parser_extract(parser, text):
+    view = parser.view(text)
+    parser.personal_info(view)
+    parser.sections(view)
+    parser.experience(view)
+    parser.education(view)
+
+
+def timed(func):
+    best = float('inf')
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    rng = random.Random(42)
+    parser = ResumeParser()
+
+    print(f"{'document':<22} {'chars':>9} {'legacy ms':>11} {'parser ms':>11} {'speedup':>8}")
+    cases = [(f'{pages} page resume', pages, make_resume(pages, rng)) for pages in PAGES]
+    cases += [(f'{pages} page adversarial', pages, make_adversarial(pages)) for pages in PAGES]
+    for name, pages, text in cases:
+        new = timed(lambda: parser_extract(parser, text))
+        if 'adversarial' in name and pages > LEGACY_ADVERSARIAL_MAX_PAGES:
+            print(f"{name:<22} {len(text):>9} {'-':>11} {new:>11.2f} {'-':>8}")
+            continue
+        old = timed(lambda: legacy_extract(text))
+        print(f"{name:<22} {len(text):>9} {old:>11.2f} {new:>11.2f} {old / new:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
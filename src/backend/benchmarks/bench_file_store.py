@@ -0,0 +1,92 @@
+"""
+Benchmark: flat {uuid}_{filename} upload folder vs. the content-addressed file store
+Saves N uploads (a share of them re-uploads of earlier files) both ways, then
+compares files and bytes on disk, the largest directory, and random-open latency
+Run from the backend directory: python benchmarks/bench_file_store.py [--files 50000]
+"""
+
+import argparse
+import hashlib
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from storage import LocalFileStore
+
+
+def save_flat(folder, uploads):
+    paths = []
+    for filename, content in uploads:
+        path = os.path.join(folder, f"{uuid.uuid4()}_{filename}")
+        with open(path, 'wb') as fh:
+            fh.write(content)
+        paths.append(path)
+    return paths
+
+
+def save_store(store, uploads):
+    paths = []
+    for filename, content in uploads:
+        temp_path = store.temp_path()
+        with open(temp_path, 'wb') as fh:
+            fh.write(content)
+        location = store.location(hashlib.sha256(content).hexdigest(), os.path.splitext(filename)[1])
+        store.put(temp_path, location)
+        paths.append(location)
+    return paths
+
+
+def disk_usage(folder):
+    files = size = largest = 0
+    for dirpath, dirs, names in os.walk(folder):
+        files += len(names)
+        largest = max(largest, len(names) + len(dirs))
+        size += sum(os.path.getsize(os.path.join(dirpath, name)) for name in names)
+    return files, size, largest
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--files', type=int, default=50000)
+    parser.add_argument('--size-kb', type=int, default=8)
+    parser.add_argument('--duplicates', type=float, default=0.2, help='share of uploads that repeat a file')
+    parser.add_argument('--reads', type=int, default=5000)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    distinct = [rng.randbytes(args.size_kb * 1024) for _ in range(int(args.files * (1 - args.duplicates)))]
+    contents = distinct + [rng.choice(distinct) for _ in range(args.files - len(distinct))]
+    rng.shuffle(contents)
+    uploads = [(f'resume_{index}.pdf', content) for index, content in enumerate(contents)]
+
+    with tempfile.TemporaryDirectory() as root:
+        flat_folder = os.path.join(root, 'flat')
+        os.makedirs(flat_folder)
+        store = LocalFileStore(os.path.join(root, 'store'))
+
+        print(f"{args.files} uploads x {args.size_kb} KB, {args.duplicates:.0%} re-uploads\n")
+        print(f"{'layout':<8} {'save s':>8} {'files':>8} {'MB':>8} {'max dir':>8} {'open+read us':>13}")
+        for name, save, folder in (('flat', lambda: save_flat(flat_folder, uploads), flat_folder),
+                                   ('store', lambda: save_store(store, uploads), store.root)):
+            start = time.perf_counter()
+            paths = save()
+            elapsed = time.perf_counter() - start
+
+            sample = rng.sample(paths, min(args.reads, len(paths)))
+            start = time.perf_counter()
+            for path in sample:
+                with store.open(path) as document:
+                    document.getvalue()
+            read_us = (time.perf_counter() - start) / len(sample) * 1e6
+
+            files, size, largest = disk_usage(folder)
+            print(f"{name:<8} {elapsed:>8.2f} {files:>8} {size / 1024 / 1024:>8.1f} {largest:>8} {read_us:>13.1f}")
+
+
+if __name__ == '__main__':
+    main()
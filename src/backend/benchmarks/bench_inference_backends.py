@@ -0,0 +1,98 @@
+"""
+Benchmark: embedding inference backends, speed vs. agreement with the fp32 baseline
+For each backend, times the per-resume keyword stage (document embedding + KeyBERT)
+and a batched pass, then compares its output with fp32 torch: cosine similarity of
+the document embeddings and overlap of the top-20 KeyBERT keywords and of the
+keywords kept as skills (score > 0.3). Backends whose packages are missing are skipped.
+Run from the backend directory: python benchmarks/bench_inference_backends.py [--backends torch,torch-int8,onnx,onnx-int8] [--threads 4]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ats_processor import ATSProcessor
+from inference import BACKENDS, DEFAULT_ONNX_DIR
+from model_registry import ModelRegistry
+
+SKILLS = ['Python', 'JavaScript', 'React', 'Node.js', 'PostgreSQL', 'Docker', 'Kubernetes', 'AWS',
+          'Django', 'Flask', 'TensorFlow', 'PyTorch', 'Redis', 'GraphQL', 'TypeScript', 'Spark']
+PHRASES = ['Designed and shipped', 'Led a team building', 'Maintained services using',
+           'Migrated legacy systems to', 'Optimized pipelines with', 'Mentored engineers on']
+
+
+def make_resume(rng):
+    lines = ['Experience']
+    for _ in range(rng.randint(15, 40)):
+        lines.append(f"{rng.choice(PHRASES)} {rng.choice(SKILLS)} and {rng.choice(SKILLS)} for {rng.randint(2, 9)} years")
+    lines.append('Skills')
+    lines.append(', '.join(rng.sample(SKILLS, 8)))
+    return '\n'.join(lines)
+
+
+def overlap(found, baseline):
+    """Share of the baseline's keywords the backend also found (1.0 when both are empty)"""
+    return len(found & baseline) / len(baseline) if baseline else float(not found)
+
+
+def run(backend, texts, args):
+    processor = ATSProcessor(models=ModelRegistry(torch_threads=args.threads, backend=backend,
+                                                  onnx_dir=args.onnx_dir))
+    processor.models.get('keybert')
+    processor.extract_keywords_batch(texts[:2])  # warm up kernels
+
+    start = time.perf_counter()
+    results = [processor.extract_keywords(text) for text in texts]
+    single = (time.perf_counter() - start) / len(texts)
+
+    start = time.perf_counter()
+    processor.extract_keywords_batch(texts, processor.embed_documents(texts))
+    batched = len(texts) / (time.perf_counter() - start)
+    return single, batched, results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--resumes', type=int, default=64)
+    parser.add_argument('--backends', default=','.join(BACKENDS))
+    parser.add_argument('--threads', type=int, default=None)
+    parser.add_argument('--onnx-dir', default=DEFAULT_ONNX_DIR)
+    args = parser.parse_args()
+
+    import numpy as np
+
+    rng = random.Random(7)
+    texts = [make_resume(rng) for _ in range(args.resumes)]
+
+    print(f"{args.resumes} resumes, {args.threads or 'default'} threads\n")
+    print(f"{'backend':<11} {'ms/resume':>10} {'batched/s':>10} {'speedup':>8} {'cosine':>8} "
+          f"{'top-20':>7} {'skills':>7}")
+    baseline = None
+    for backend in ['torch'] + [name for name in args.backends.split(',') if name != 'torch']:
+        try:
+            single, batched, results = run(backend, texts, args)
+        except ImportError as e:
+            print(f"{backend:<11} skipped: {e}")
+            if baseline is None:
+                return
+            continue
+        if baseline is None:
+            baseline = (single, results)
+
+        cosines, top_overlaps, skill_overlaps = [], [], []
+        for (keywords, embedding), (base_keywords, base_embedding) in zip(results, baseline[1]):
+            cosines.append(float(np.dot(embedding, base_embedding) /
+                                 (np.linalg.norm(embedding) * np.linalg.norm(base_embedding))))
+            top_overlaps.append(overlap({word for word, _ in keywords}, {word for word, _ in base_keywords}))
+            skill_overlaps.append(overlap({word for word, score in keywords if score > 0.3},
+                                          {word for word, score in base_keywords if score > 0.3}))
+        print(f"{backend:<11} {single * 1000:>10.1f} {batched:>10.1f} {baseline[0] / single:>7.2f}x "
+              f"{np.mean(cosines):>8.4f} {np.mean(top_overlaps):>7.1%} {np.mean(skill_overlaps):>7.1%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark: batch upload ingestion, per-file save + hash + insert vs. the streaming pipeline
+Builds one multipart body with N resumes (some duplicated) and times parsing it,
+writing the files, hashing them and registering the rows in a throwaway database
+Run from the backend directory: python benchmarks/bench_ingestion.py [--files 200]
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import uuid
+from io import BytesIO
+
+from werkzeug.formparser import parse_form_data
+from werkzeug.test import EnvironBuilder
+from werkzeug.utils import secure_filename
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database
+from analysis_cache import file_sha256
+from ingestion import receive_uploads, register_uploads
+from storage import LocalFileStore
+
+
+def allowed_file(filename):
+    return filename.rsplit('.', 1)[-1].lower() in ('pdf', 'doc', 'docx')
+
+
+def make_body(files, size, duplicates, rng):
+    contents = [rng.randbytes(size) for _ in range(files - duplicates)]
+    contents += rng.sample(contents, duplicates)
+    data = {'jobProfileId': 'fullstack',
+            'resumes': [(BytesIO(content), f'resume_{index}.pdf') for index, content in enumerate(contents)]}
+    environ = EnvironBuilder(method='POST', data=data).get_environ()
+    return environ['CONTENT_TYPE'], environ['wsgi.input'].read()
+
+
+def legacy_ingest(content_type, body, folder):
+    """The original route: parse to spooled files, save each, hash it again, one insert per file"""
+    environ = {'REQUEST_METHOD': 'POST', 'CONTENT_TYPE': content_type, 'CONTENT_LENGTH': str(len(body)),
+               'wsgi.input': BytesIO(body)}
+    _, form, files = parse_form_data(environ)
+    for file in files.getlist('resumes'):
+        if allowed_file(file.filename):
+            resume_id = str(uuid.uuid4())
+            filename = secure_filename(file.filename)
+            file_path = os.path.join(folder, f"{resume_id}_{filename}")
+            file.save(file_path)
+            database.add_resume(resume_id, filename, file_path, 'processing', form.get('jobProfileId'))
+            file_sha256(file_path)
+
+
+def streaming_ingest(content_type, body, folder):
+    boundary = content_type.split('boundary=', 1)[1].strip('"')
+    fields, uploads, _ = receive_uploads(BytesIO(body), boundary, LocalFileStore(folder), 'resumes', allowed_file)
+    return register_uploads(uploads, fields.get('jobProfileId'))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--files', type=int, default=200)
+    parser.add_argument('--size-kb', type=int, default=200)
+    parser.add_argument('--duplicates', type=int, default=20)
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    content_type, body = make_body(args.files, args.size_kb * 1024, args.duplicates, rng)
+    print(f"{args.files} files x {args.size_kb} KB ({len(body) / 1024 / 1024:.1f} MB body, "
+          f"{args.duplicates} duplicates)")
+
+    with tempfile.TemporaryDirectory() as root:
+        database.DATABASE_PATH = os.path.join(root, 'bench.db')
+        database.init_db()
+
+        for name, ingest in (('per-file', legacy_ingest), ('streaming', streaming_ingest)):
+            best = float('inf')
+            for _ in range(args.repeats):
+                folder = tempfile.mkdtemp(dir=root)
+                start = time.perf_counter()
+                result = ingest(content_type, body, folder)
+                best = min(best, time.perf_counter() - start)
+                shutil.rmtree(folder)
+            queued = len(result[0]) if result else args.files
+            print(f"{name:<10} {best * 1000:9.1f} ms   {queued} resumes to queue")
+
+        database.close_connection()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""
+Benchmark: eager vs. lazy model loading (startup time and RSS)
+Each mode runs in a fresh interpreter so imports and caches do not leak between runs
+Run from the backend directory: python benchmarks/bench_model_loading.py [--workers 4]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD_SCRIPT = r'''
+import json, os, resource, sys, time
+sys.path.insert(0, {backend_dir!r})
+
+start = time.perf_counter()
+from ats_processor import ATSProcessor
+processor = ATSProcessor()
+if {mode!r} == 'eager':
+    processor.models.warm_up(freeze=False)
+startup = time.perf_counter() - start
+
+start = time.perf_counter()
+processor.kw_model.extract_keywords("Senior Python developer with Flask, React and AWS experience", top_n=5)
+first_call = time.perf_counter() - start
+
+print(json.dumps({{
+    'startup_s': round(startup, 3),
+    'first_keybert_call_s': round(first_call, 3),
+    'max_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    'models': processor.models.loaded()
+}}))
+'''
+
+# Preload in the parent, then fork workers that use the models; on Linux,
+# smaps_rollup splits each child's resident memory into shared and private pages
+PREFORK_SCRIPT = r'''
+import json, os, sys
+sys.path.insert(0, {backend_dir!r})
+from ats_processor import ATSProcessor
+
+processor = ATSProcessor()
+if {preload!r}:
+    processor.models.warm_up()
+
+def rollup():
+    fields = {{}}
+    with open('/proc/self/smaps_rollup') as fh:
+        for line in fh:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == 'kB':
+                fields[parts[0].rstrip(':')] = int(parts[1])
+    return fields
+
+pipes = []
+for _ in range({workers}):
+    read_fd, write_fd = os.pipe()
+    if os.fork() == 0:
+        os.close(read_fd)
+        processor.kw_model.extract_keywords("Data scientist with PyTorch and SQL", top_n=5)
+        info = rollup()
+        os.write(write_fd, json.dumps({{
+            'private_mb': round((info.get('Private_Clean', 0) + info.get('Private_Dirty', 0)) / 1024, 1),
+            'shared_mb': round((info.get('Shared_Clean', 0) + info.get('Shared_Dirty', 0)) / 1024, 1)
+        }}).encode())
+        os._exit(0)
+    os.close(write_fd)
+    pipes.append(read_fd)
+
+children = []
+for fd in pipes:
+    children.append(json.loads(os.read(fd, 4096)))
+    os.wait()
+print(json.dumps(children))
+'''
+
+
+def run(script):
+    output = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+
+    print("Startup (single process)")
+    for mode in ('eager', 'lazy'):
+        result = run(CHILD_SCRIPT.format(backend_dir=BACKEND_DIR, mode=mode))
+        print(f"  {mode:>5}: startup {result['startup_s']}s, first KeyBERT call "
+              f"{result['first_keybert_call_s']}s, max RSS {result['max_rss_mb']} MB, loaded {result['models']}")
+
+    if not os.path.exists('/proc/self/smaps_rollup'):
+        print("Skipping prefork comparison (needs Linux /proc/self/smaps_rollup)")
+        return
+
+    print(f"Prefork memory ({args.workers} workers)")
+    for preload in (True, False):
+        children = run(PREFORK_SCRIPT.format(backend_dir=BACKEND_DIR, preload=preload, workers=args.workers))
+        private = sum(child['private_mb'] for child in children)
+        shared = sum(child['shared_mb'] for child in children) / len(children)
+        label = 'preload' if preload else 'per-worker'
+        print(f"  {label:>10}: total private {private:.1f} MB, avg shared per worker {shared:.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
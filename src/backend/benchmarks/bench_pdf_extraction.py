@@ -0,0 +1,131 @@
+"""
+Benchmark: pdfplumber-first extraction vs. PDFExtractor on synthetic resumes
+Generates single- and two-column PDFs with PyMuPDF, then compares throughput and
+text fidelity (word-sequence similarity to the text that was written)
+Run from the backend directory: python benchmarks/bench_pdf_extraction.py
+"""
+
+import argparse
+import difflib
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fitz  # PyMuPDF
+import pdfplumber
+
+from pdf_extraction import PDFExtractor
+from storage import MappedFile
+
+WORDS = ('python developed services team project built aws docker kubernetes react '
+         'led migration pipeline data analysis reduced latency improved customers '
+         'university bachelor science engineering managed deployed api design').split()
+
+
+def make_line(rng, words=8):
+    return ' '.join(rng.choice(WORDS) for _ in range(words))
+
+
+def make_pdf(path, pages, two_column_ratio, rng):
+    """Write a synthetic resume; returns the words in reading order"""
+    doc = fitz.open()
+    expected = []
+    for _ in range(pages):
+        page = doc.new_page()
+        if rng.random() < two_column_ratio:
+            for x in (50, 310):
+                y = 60
+                while y < 780:
+                    line = make_line(rng, 5)
+                    page.insert_text((x, y), line, fontsize=9)
+                    expected.extend(line.split())
+                    y += 14
+        else:
+            y = 60
+            while y < 780:
+                line = make_line(rng, 12)
+                page.insert_text((50, y), line, fontsize=10)
+                expected.extend(line.split())
+                y += 14
+    doc.save(path)
+    doc.close()
+    return expected
+
+
+def legacy_extract(file_path):
+    """The original strategy: pdfplumber over every page, PyMuPDF reparse if little text"""
+    text = ""
+    try:
+        with pdfplumber.open(file_path) as pdf:
+            for page in pdf.pages:
+                page_text = page.extract_text()
+                if page_text:
+                    text += page_text + "\n"
+    except Exception as e:
+        print(f"pdfplumber failed: {e}")
+
+    if len(text.strip()) < 100:
+        doc = fitz.open(file_path)
+        text = ""
+        for page in doc:
+            text += page.get_text() + "\n"
+        doc.close()
+    return text.strip()
+
+
+def mapped(extract):
+    """Call extract on the file opened the way the file store opens it"""
+    def extract_mapped(file_path):
+        with MappedFile(file_path) as document:
+            return extract(document)
+    return extract_mapped
+
+
+def fidelity(expected, text):
+    return difflib.SequenceMatcher(None, expected, text.split(), autojunk=False).ratio()
+
+
+def run(name, extract, corpus):
+    start = time.perf_counter()
+    texts = [extract(path) for path, _ in corpus]
+    elapsed = time.perf_counter() - start
+    scores = [fidelity(expected, text) for (_, expected), text in zip(corpus, texts)]
+    return elapsed, sum(scores) / len(scores)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--docs', type=int, default=20, help='documents per page count')
+    parser.add_argument('--pages', default='1,2,5,20', help='comma separated page counts')
+    parser.add_argument('--two-column', type=float, default=0.3, help='share of two-column pages')
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    page_counts = [int(value) for value in args.pages.split(',')]
+    engines = [
+        ('pdfplumber-first', legacy_extract),
+        ('PDFExtractor', mapped(PDFExtractor(max_pages=0, workers=1).extract)),
+        (f'PDFExtractor x{args.workers}', mapped(PDFExtractor(max_pages=0, workers=args.workers).extract))
+    ]
+
+    with tempfile.TemporaryDirectory() as folder:
+        print(f"{'pages':>6} {'engine':>18} {'docs/s':>9} {'pages/s':>9} {'fidelity':>9}")
+        for pages in page_counts:
+            corpus = []
+            for index in range(args.docs):
+                path = os.path.join(folder, f'resume_{pages}_{index}.pdf')
+                corpus.append((path, make_pdf(path, pages, args.two_column, rng)))
+
+            for name, extract in engines:
+                elapsed, score = run(name, extract, corpus)
+                print(f"{pages:>6} {name:>18} {len(corpus) / elapsed:>9.1f} "
+                      f"{len(corpus) * pages / elapsed:>9.1f} {score:>9.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark: one FIFO queue vs. the interactive / bulk scheduler under a bulk batch
+Simulates workers with sleeps: a large batch is queued as chunks, a second batch
+arrives later, and single interactive uploads trickle in while both run. Reports
+interactive wait percentiles and when each batch finished.
+Run from the backend directory: python benchmarks/bench_scheduler.py [--chunks 300]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from metrics import Histogram, MemorySink
+from scheduler import INTERACTIVE, BULK, QueueMetrics, SlotScheduler
+
+
+def work(seconds):
+    time.sleep(seconds)
+    return time.perf_counter()
+
+
+def run(mode, args):
+    pool = ThreadPoolExecutor(args.workers)
+    scheduler = SlotScheduler(pool.submit, args.workers, metrics=QueueMetrics(MemorySink()))
+    rng = random.Random(7)
+    interactive_waits = Histogram()
+    start = time.perf_counter()
+
+    def submit(queue, seconds, key=''):
+        if mode == 'fifo':
+            return pool.submit(work, seconds)
+        return scheduler.submit(queue, work, seconds, key=key)
+
+    def queue_batch(key, chunks):
+        return [submit(BULK, args.chunk_ms / 1000, key) for _ in range(chunks)]
+
+    first = queue_batch('first', args.chunks)
+    interactive = []
+    # A smaller batch lands shortly after the large one, then interactive uploads trickle in
+    time.sleep(args.chunk_ms / 1000)
+    second = queue_batch('second', args.chunks // 10)
+    for _ in range(args.uploads):
+        time.sleep(rng.expovariate(1000 / args.upload_interval_ms))
+        queued = time.perf_counter()
+        future = submit(INTERACTIVE, args.upload_ms / 1000)
+        interactive.append((queued, future))
+
+    wait(first + second + [future for _, future in interactive])
+    for queued, future in interactive:
+        # Finish time minus queued time minus the work itself is the wait
+        interactive_waits.observe(future.result() - queued - args.upload_ms / 1000)
+    pool.shutdown()
+
+    return (interactive_waits.summary(), max(f.result() for f in first) - start,
+            max(f.result() for f in second) - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--chunks', type=int, default=300, help='chunks in the large batch')
+    parser.add_argument('--chunk-ms', type=float, default=40)
+    parser.add_argument('--uploads', type=int, default=100)
+    parser.add_argument('--upload-ms', type=float, default=5)
+    parser.add_argument('--upload-interval-ms', type=float, default=20)
+    args = parser.parse_args()
+
+    print(f"{args.workers} workers, {args.chunks} + {args.chunks // 10} chunks x {args.chunk_ms:.0f} ms, "
+          f"{args.uploads} interactive uploads\n")
+    print(f"{'mode':<10} {'p50 wait ms':>12} {'p95 wait ms':>12} {'batch 1 s':>10} {'batch 2 s':>10}")
+    for mode in ('fifo', 'scheduler'):
+        waits, first_done, second_done = run(mode, args)
+        print(f"{mode:<10} {waits['p50_ms']:>12.1f} {waits['p95_ms']:>12.1f} {first_done:>10.2f} {second_done:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
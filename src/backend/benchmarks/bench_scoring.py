@@ -0,0 +1,95 @@
+"""
+Benchmark: per-candidate calculate_job_match vs. vectorized MatchScorer.score_matrix
+Scores random candidates against the built-in profiles plus edge cases (skills
+listed twice, no preferred skills, mixed case) both ways, checks that every
+score_matrix entry equals calculate_job_match's matchPercentage, and times both.
+Run from the backend directory: python benchmarks/bench_scoring.py [--candidates 5000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ats_processor import ATSProcessor
+from profile_store import ProfileStore
+from scoring import DEFAULT_JOB_PROFILES
+
+EDGE_PROFILES = {
+    'duplicates': {
+        'title': 'Skills Listed Twice',
+        'required_skills': ['python', 'sql', 'python', 'docker'],
+        'preferred_skills': ['aws', 'aws', 'redis'],
+        'weights': {'required': 0.7, 'preferred': 0.3}
+    },
+    'no-preferred': {
+        'title': 'No Preferred Skills',
+        'required_skills': ['javascript', 'react', 'css'],
+        'preferred_skills': [],
+        'weights': {'required': 0.8, 'preferred': 0.2}
+    },
+    'mixed-case': {
+        'title': 'Mixed Case Skills',
+        'required_skills': ['Python', 'PostgreSQL', 'Node.js', 'python'],
+        'preferred_skills': ['Kubernetes', 'GraphQL', 'kubernetes'],
+        'weights': {'required': 0.6, 'preferred': 0.4}
+    },
+    'uneven-weights': {
+        'title': 'Uneven Weights',
+        'required_skills': ['machine learning', 'statistics', 'r'],
+        'preferred_skills': ['spark', 'tensorflow', 'pytorch', 'sql', 'aws', 'docker', 'go'],
+        'weights': {'required': 0.55, 'preferred': 0.45}
+    }
+}
+
+# Skills no profile lists; they must not change any score
+UNKNOWN_SKILLS = ['cobol', 'fortran', 'excel', 'figma', 'jira']
+
+
+def make_candidates(count, rng, skills):
+    """Random skill lists with random casing, repeated skills and skills outside every profile"""
+    candidates = []
+    for _ in range(count):
+        names = rng.sample(skills, rng.randint(0, min(len(skills), 14)))
+        names += rng.sample(names, min(len(names), rng.randint(0, 3)))
+        names += rng.sample(UNKNOWN_SKILLS, rng.randint(0, 2))
+        names = [rng.choice([name, name.upper(), name.title()]) for name in names]
+        candidates.append(names)
+    return candidates
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--candidates', type=int, default=5000)
+    args = parser.parse_args()
+
+    profiles = {**DEFAULT_JOB_PROFILES, **EDGE_PROFILES}
+    processor = ATSProcessor(profile_store=ProfileStore(profiles=profiles))
+    scorer = processor.match_scorer
+    skills = sorted({skill.lower() for profile in profiles.values()
+                     for skill in profile['required_skills'] + profile['preferred_skills']})
+
+    rng = random.Random(42)
+    candidates = make_candidates(args.candidates, rng, skills)
+
+    start = time.perf_counter()
+    expected = [[processor.calculate_job_match([{'name': name} for name in names], profile_id)['matchPercentage']
+                 for profile_id in scorer.profile_ids] for names in candidates]
+    loop_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    scores = scorer.score(candidates)
+    matrix_time = time.perf_counter() - start
+
+    assert scores.tolist() == expected
+
+    print(f"{len(candidates)} candidates x {len(profiles)} profiles: scores match")
+    print(f"{'loop ms':>10} {'matrix ms':>10} {'speedup':>8}")
+    print(f"{loop_time * 1000:>10.1f} {matrix_time * 1000:>10.1f} {loop_time / matrix_time:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark: per-skill regex loop vs. single-pass SkillMatcher
+Run from the backend directory: python benchmarks/bench_skill_matcher.py
+"""
+
+import os
+import random
+import re
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from skill_matcher import SkillMatcher
+
+TAXONOMY_SIZES = [70, 1000, 10000]
+RESUME_WORDS = 600
+REPEATS = 5
+
+
+def make_taxonomy(size, rng):
+    """Build a synthetic taxonomy of single and two-word skills"""
+    taxonomy = {}
+    seen = set()
+    while len(seen) < size:
+        length = rng.randint(2, 10)
+        skill = ''.join(rng.choice(string.ascii_lowercase) for _ in range(length))
+        if rng.random() < 0.2:
+            skill += ' ' + ''.join(rng.choice(string.ascii_lowercase) for _ in range(4))
+        if skill in seen:
+            continue
+        seen.add(skill)
+        taxonomy.setdefault(f'category_{len(seen) % 12}', []).append(skill)
+    return taxonomy
+
+
+def make_resume(taxonomy, rng):
+    skills = [skill for skill_list in taxonomy.values() for skill in skill_list]
+    filler = ['experience', 'developed', 'team', 'project', 'built', 'services', 'using', 'and']
+    words = [rng.choice(skills) if rng.random() < 0.1 else rng.choice(filler) for _ in range(RESUME_WORDS)]
+    return ' '.join(words)
+
+
+def loop_match(taxonomy, text):
+    """The original extract_skills strategy: one regex search per skill"""
+    text_lower = text.lower()
+    found = {}
+    for category, skill_list in taxonomy.items():
+        found[category] = [skill for skill in skill_list
+                           if re.search(r'\b' + re.escape(skill.lower()) + r'\b', text_lower)]
+    return found
+
+
+def timed(func):
+    best = float('inf')
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    rng = random.Random(42)
+    print(f"{'skills':>8} {'loop ms':>10} {'matcher ms':>11} {'compile ms':>11} {'speedup':>8}")
+
+    for size in TAXONOMY_SIZES:
+        taxonomy = make_taxonomy(size, rng)
+        text = make_resume(taxonomy, rng)
+
+        start = time.perf_counter()
+        matcher = SkillMatcher(taxonomy)
+        matcher.pattern
+        compile_time = time.perf_counter() - start
+
+        loop_time, expected = timed(lambda: loop_match(taxonomy, text))
+        matcher_time, found = timed(lambda: matcher.match(text))
+
+        got = {category: [skill['name'] for skill in skills] for category, skills in found.items()}
+        assert got == {category: skills for category, skills in expected.items() if skills}
+
+        print(f"{size:>8} {loop_time * 1000:>10.2f} {matcher_time * 1000:>11.2f} "
+              f"{compile_time * 1000:>11.2f} {loop_time / matcher_time:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
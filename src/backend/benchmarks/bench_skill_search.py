@@ -0,0 +1,102 @@
+"""
+Benchmark: boolean skill search through the skill index
+Fills a throwaway database with synthetic analyses, then times cold and warm
+queries and the catch-up after a burst of new analyses
+Run from the backend directory: python benchmarks/bench_skill_search.py [--resumes 1000000]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database
+from skill_index import SkillIndex
+
+POPULAR = ['python', 'javascript', 'java', 'sql', 'docker', 'aws', 'react', 'kubernetes', 'git', 'linux']
+QUERIES = [
+    'python',
+    'kubernetes AND python AND NOT java',
+    '(react OR "vue") AND NOT angular',
+    'machine learning AND (pytorch OR tensorflow)',
+    'skill_0042 OR skill_1337'
+]
+
+
+def make_skills(rng, rare):
+    names = rng.sample(POPULAR, rng.randint(2, 6)) + rng.sample(rare, rng.randint(3, 12))
+    return [{'name': name, 'confidence': 0.9, 'category': 'other'} for name in names]
+
+
+def fill(resumes, rng):
+    rare = ['vue', 'angular', 'machine learning', 'pytorch', 'tensorflow'] + [f'skill_{i:04d}' for i in range(5000)]
+    with database.transaction() as cursor:
+        rows = []
+        for index in range(resumes):
+            score = rng.randint(20, 100)
+            analysis = {'overallScore': score, 'skills': make_skills(rng, rare)}
+            rows.append((str(uuid.uuid4()), f'resume_{index}.pdf', '', 'completed', json.dumps(analysis), score))
+            if len(rows) == 10000:
+                cursor.executemany('''
+                    INSERT INTO resumes (id, filename, file_path, status, analysis, overall_score)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                ''', rows)
+                rows = []
+        cursor.executemany('''
+            INSERT INTO resumes (id, filename, file_path, status, analysis, overall_score)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', rows)
+    database.convert_json_analyses()
+    database.rebuild_skill_index()
+    return rare
+
+
+def timed_search(index, query, **kwargs):
+    start = time.perf_counter()
+    total, _ = index.search(query, **kwargs)
+    return (time.perf_counter() - start) * 1000, total
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--resumes', type=int, default=200000)
+    parser.add_argument('--updates', type=int, default=1000)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    with tempfile.TemporaryDirectory() as folder:
+        database.DATABASE_PATH = os.path.join(folder, 'bench.db')
+        database.init_db()
+
+        start = time.perf_counter()
+        rare = fill(args.resumes, rng)
+        print(f"indexed {args.resumes} resumes in {time.perf_counter() - start:.1f}s")
+
+        index = SkillIndex()
+        elapsed, total = timed_search(index, '')
+        print(f"cold load (scores):           {elapsed:9.2f} ms")
+
+        print(f"{'query':<48} {'cold ms':>9} {'warm ms':>9} {'hits':>9}")
+        for query in QUERIES:
+            cold, total = timed_search(index, query)
+            warm, _ = timed_search(index, query, min_score=60, offset=100, limit=50)
+            print(f"{query:<48} {cold:>9.2f} {warm:>9.2f} {total:>9}")
+
+        cursor = database.get_connection().cursor()
+        cursor.execute('SELECT id FROM resumes ORDER BY RANDOM() LIMIT ?', (args.updates,))
+        for (resume_id,) in cursor.fetchall():
+            score = rng.randint(20, 100)
+            database.update_resume_analysis(resume_id, {'overallScore': score, 'skills': make_skills(rng, rare)})
+
+        elapsed, _ = timed_search(index, QUERIES[1])
+        print(f"catch up after {args.updates} re-analyses: {elapsed:9.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
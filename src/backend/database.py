@@ -5,82 +5,600 @@ Uses SQLite for simplicity, can be easily switched to PostgreSQL
 
 import sqlite3
 import json
+import threading
+from contextlib import contextmanager
 from datetime import datetime
 import os
 
+from analysis_storage import ANALYSIS_COLUMNS, SECTION_COLUMNS, pack_analysis, unpack_analysis
+
 DATABASE_PATH = 'ats.db'
 
+# Connection tuning: WAL lets readers run alongside a writer, busy_timeout makes
+# concurrent writers wait instead of failing with "database is locked"
+BUSY_TIMEOUT_MS = 30000
+MMAP_SIZE = 256 * 1024 * 1024
+CACHE_SIZE_KB = 16000
+STATEMENT_CACHE_SIZE = 256
+
+# One connection per thread, reopened after fork (Celery prefork / gunicorn workers)
+_local = threading.local()
+
+def _connect():
+    conn = sqlite3.connect(DATABASE_PATH, timeout=BUSY_TIMEOUT_MS / 1000,
+                           cached_statements=STATEMENT_CACHE_SIZE)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute(f'PRAGMA busy_timeout={BUSY_TIMEOUT_MS}')
+    conn.execute(f'PRAGMA mmap_size={MMAP_SIZE}')
+    conn.execute(f'PRAGMA cache_size=-{CACHE_SIZE_KB}')
+    conn.execute('PRAGMA temp_store=MEMORY')
+    return conn
+
+def get_connection():
+    """Get this thread's pooled connection, opening it on first use
+    
+    Statements are prepared once per connection and reused from sqlite3's
+    statement cache, so the queries below keep their SQL text constant.
+    """
+    key = (os.getpid(), DATABASE_PATH)
+    if getattr(_local, 'key', None) != key:
+        _local.conn = _connect()
+        _local.key = key
+    return _local.conn
+
+def close_connection():
+    """Close this thread's pooled connection"""
+    if getattr(_local, 'key', None) and _local.key[0] == os.getpid():
+        _local.conn.close()
+    _local.conn = None
+    _local.key = None
+
+@contextmanager
+def transaction():
+    """Yield a cursor in a transaction that commits on success and rolls back on error"""
+    conn = get_connection()
+    with conn:
+        yield conn.cursor()
+
 def init_db():
     """Initialize database with required tables"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    # Resumes table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS resumes (
-            id TEXT PRIMARY KEY,
-            filename TEXT NOT NULL,
-            file_path TEXT NOT NULL,
-            upload_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            status TEXT DEFAULT 'pending',
-            analysis TEXT,
-            job_profile_id TEXT
+    with transaction() as cursor:
+        # Resumes table
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS resumes (
+                id TEXT PRIMARY KEY,
+                filename TEXT NOT NULL,
+                file_path TEXT NOT NULL,
+                upload_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                status TEXT DEFAULT 'pending',
+                analysis TEXT,
+                job_profile_id TEXT
+            )
+        ''')
+        
+        # Job profiles table
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS job_profiles (
+                id TEXT PRIMARY KEY,
+                title TEXT NOT NULL,
+                required_skills TEXT,
+                preferred_skills TEXT,
+                minimum_experience INTEGER,
+                description TEXT,
+                created_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
+        # Analysis jobs table (for tracking batch processing)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS analysis_jobs (
+                id TEXT PRIMARY KEY,
+                status TEXT DEFAULT 'pending',
+                total_resumes INTEGER,
+                completed_resumes INTEGER DEFAULT 0,
+                created_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                completed_date TIMESTAMP
+            )
+        ''')
+        
+        # Content-addressed analysis cache (see analysis_cache.py)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS analysis_cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                created_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS analysis_cache_stats (
+                name TEXT PRIMARY KEY,
+                count INTEGER DEFAULT 0
+            )
+        ''')
+        
+        _migrate_score_columns(cursor)
+        _create_aggregates(cursor)
+        _migrate_analysis_storage(cursor)
+        _create_skill_index(cursor)
+        _migrate_job_profiles(cursor)
+        
+        # SHA-256 of the uploaded file, for dropping duplicate uploads (ingestion.py)
+        if 'content_hash' not in _column_names(cursor, 'resumes'):
+            cursor.execute('ALTER TABLE resumes ADD COLUMN content_hash TEXT')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_resumes_content_hash ON resumes (content_hash)')
+        _create_file_refcounts(cursor)
+        
+        job_columns = _column_names(cursor, 'analysis_jobs')
+        if 'failed_resumes' not in job_columns:
+            cursor.execute('ALTER TABLE analysis_jobs ADD COLUMN failed_resumes INTEGER DEFAULT 0')
+        if 'job_type' not in job_columns:
+            # 'analysis' (uploads) or 'rescore' (rescoring.py), with the rescore throughput
+            cursor.execute("ALTER TABLE analysis_jobs ADD COLUMN job_type TEXT DEFAULT 'analysis'")
+            cursor.execute('ALTER TABLE analysis_jobs ADD COLUMN job_profile_id TEXT')
+            cursor.execute('ALTER TABLE analysis_jobs ADD COLUMN rows_per_second REAL')
+
+def _column_names(cursor, table):
+    cursor.execute(f'PRAGMA table_info({table})')
+    return {row[1] for row in cursor.fetchall()}
+
+def _table_exists(cursor, table):
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,))
+    return cursor.fetchone() is not None
+
+def _create_file_refcounts(cursor):
+    """Number of resumes rows per stored file location, kept current by triggers on resumes
+    
+    Identical uploads share one file in the content-addressed store (storage.py),
+    so a file is only removed when delete_resume takes its count to zero.
+    """
+    rebuild = not _table_exists(cursor, 'stored_files')
+    
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS stored_files (
+            location TEXT PRIMARY KEY,
+            refcount INTEGER NOT NULL
+        ) WITHOUT ROWID
+    ''')
+    
+    if rebuild:
+        cursor.execute('''
+            INSERT INTO stored_files (location, refcount)
+            SELECT file_path, COUNT(*) FROM resumes GROUP BY file_path
+        ''')
+    
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_resumes_files_insert AFTER INSERT ON resumes
+        BEGIN
+            INSERT INTO stored_files (location, refcount) VALUES (NEW.file_path, 1)
+            ON CONFLICT (location) DO UPDATE SET refcount = refcount + 1;
+        END
+    ''')
+    
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_resumes_files_delete AFTER DELETE ON resumes
+        BEGIN
+            UPDATE stored_files SET refcount = refcount - 1 WHERE location = OLD.file_path;
+        END
+    ''')
+
+def _migrate_score_columns(cursor):
+    """Promote score fields out of the analysis JSON into indexed columns"""
+    columns = _column_names(cursor, 'resumes')
+    added = False
+    for column in ('overall_score', 'job_match_percentage', 'skill_count'):
+        if column not in columns:
+            cursor.execute(f'ALTER TABLE resumes ADD COLUMN {column} INTEGER')
+            added = True
+    
+    if added:
+        # Backfill rows analyzed before the columns existed
+        cursor.execute('''
+            UPDATE resumes SET
+                overall_score = json_extract(analysis, '$.overallScore'),
+                job_match_percentage = json_extract(analysis, '$.jobMatch.matchPercentage'),
+                skill_count = json_array_length(analysis, '$.skills')
+            WHERE status = 'completed' AND analysis IS NOT NULL AND json_valid(analysis)
+        ''')
+    
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_resumes_status ON resumes (status)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_resumes_profile_score ON resumes (job_profile_id, overall_score)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_resumes_overall_score ON resumes (overall_score)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_resumes_upload_date ON resumes (upload_date)')
+
+def _create_aggregates(cursor):
+    """Running per-profile aggregates, kept current by triggers on resumes
+    
+    A resume counts as analyzed once overall_score is set; '' is the key for
+    resumes uploaded without a job profile. Score buckets are 0-9, 10-19, ..., 90-100.
+    """
+    rebuild = not _table_exists(cursor, 'analysis_aggregates')
+    
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS analysis_aggregates (
+            job_profile_id TEXT PRIMARY KEY,
+            total_resumes INTEGER DEFAULT 0,
+            completed_count INTEGER DEFAULT 0,
+            score_sum INTEGER DEFAULT 0,
+            match_sum INTEGER DEFAULT 0,
+            skill_sum INTEGER DEFAULT 0
         )
     ''')
     
-    # Job profiles table
     cursor.execute('''
-        CREATE TABLE IF NOT EXISTS job_profiles (
-            id TEXT PRIMARY KEY,
-            title TEXT NOT NULL,
-            required_skills TEXT,
-            preferred_skills TEXT,
-            minimum_experience INTEGER,
-            description TEXT,
-            created_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        CREATE TABLE IF NOT EXISTS score_histogram (
+            job_profile_id TEXT,
+            bucket INTEGER,
+            count INTEGER DEFAULT 0,
+            PRIMARY KEY (job_profile_id, bucket)
         )
     ''')
     
-    # Analysis jobs table (for tracking batch processing)
+    if rebuild:
+        _rebuild_aggregates(cursor)
+    
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_resumes_stats_insert AFTER INSERT ON resumes
+        BEGIN
+            INSERT INTO analysis_aggregates (job_profile_id, total_resumes, completed_count, score_sum, match_sum, skill_sum)
+            VALUES (COALESCE(NEW.job_profile_id, ''), 1, NEW.overall_score IS NOT NULL,
+                    COALESCE(NEW.overall_score, 0), COALESCE(NEW.job_match_percentage, 0), COALESCE(NEW.skill_count, 0))
+            ON CONFLICT (job_profile_id) DO UPDATE SET
+                total_resumes = total_resumes + 1,
+                completed_count = completed_count + excluded.completed_count,
+                score_sum = score_sum + excluded.score_sum,
+                match_sum = match_sum + excluded.match_sum,
+                skill_sum = skill_sum + excluded.skill_sum;
+            INSERT INTO score_histogram (job_profile_id, bucket, count)
+            SELECT COALESCE(NEW.job_profile_id, ''), MIN(NEW.overall_score / 10, 9), 1
+            WHERE NEW.overall_score IS NOT NULL
+            ON CONFLICT (job_profile_id, bucket) DO UPDATE SET count = count + 1;
+        END
+    ''')
+    
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_resumes_stats_delete AFTER DELETE ON resumes
+        BEGIN
+            UPDATE analysis_aggregates SET
+                total_resumes = total_resumes - 1,
+                completed_count = completed_count - (OLD.overall_score IS NOT NULL),
+                score_sum = score_sum - COALESCE(OLD.overall_score, 0),
+                match_sum = match_sum - COALESCE(OLD.job_match_percentage, 0),
+                skill_sum = skill_sum - COALESCE(OLD.skill_count, 0)
+            WHERE job_profile_id = COALESCE(OLD.job_profile_id, '');
+            UPDATE score_histogram SET count = count - 1
+            WHERE OLD.overall_score IS NOT NULL
+              AND job_profile_id = COALESCE(OLD.job_profile_id, '')
+              AND bucket = MIN(OLD.overall_score / 10, 9);
+        END
+    ''')
+    
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_resumes_stats_update
+        AFTER UPDATE OF overall_score, job_match_percentage, skill_count, job_profile_id ON resumes
+        BEGIN
+            UPDATE analysis_aggregates SET
+                total_resumes = total_resumes - 1,
+                completed_count = completed_count - (OLD.overall_score IS NOT NULL),
+                score_sum = score_sum - COALESCE(OLD.overall_score, 0),
+                match_sum = match_sum - COALESCE(OLD.job_match_percentage, 0),
+                skill_sum = skill_sum - COALESCE(OLD.skill_count, 0)
+            WHERE job_profile_id = COALESCE(OLD.job_profile_id, '');
+            UPDATE score_histogram SET count = count - 1
+            WHERE OLD.overall_score IS NOT NULL
+              AND job_profile_id = COALESCE(OLD.job_profile_id, '')
+              AND bucket = MIN(OLD.overall_score / 10, 9);
+            INSERT INTO analysis_aggregates (job_profile_id, total_resumes, completed_count, score_sum, match_sum, skill_sum)
+            VALUES (COALESCE(NEW.job_profile_id, ''), 1, NEW.overall_score IS NOT NULL,
+                    COALESCE(NEW.overall_score, 0), COALESCE(NEW.job_match_percentage, 0), COALESCE(NEW.skill_count, 0))
+            ON CONFLICT (job_profile_id) DO UPDATE SET
+                total_resumes = total_resumes + 1,
+                completed_count = completed_count + excluded.completed_count,
+                score_sum = score_sum + excluded.score_sum,
+                match_sum = match_sum + excluded.match_sum,
+                skill_sum = skill_sum + excluded.skill_sum;
+            INSERT INTO score_histogram (job_profile_id, bucket, count)
+            SELECT COALESCE(NEW.job_profile_id, ''), MIN(NEW.overall_score / 10, 9), 1
+            WHERE NEW.overall_score IS NOT NULL
+            ON CONFLICT (job_profile_id, bucket) DO UPDATE SET count = count + 1;
+        END
+    ''')
+
+def _rebuild_aggregates(cursor):
+    """Recompute aggregates from the resumes table (one full scan, used on migration)"""
+    cursor.execute('DELETE FROM analysis_aggregates')
+    cursor.execute('DELETE FROM score_histogram')
+    cursor.execute('''
+        INSERT INTO analysis_aggregates (job_profile_id, total_resumes, completed_count, score_sum, match_sum, skill_sum)
+        SELECT COALESCE(job_profile_id, ''), COUNT(*), COUNT(overall_score),
+               COALESCE(SUM(overall_score), 0), COALESCE(SUM(job_match_percentage), 0), COALESCE(SUM(skill_count), 0)
+        FROM resumes
+        GROUP BY COALESCE(job_profile_id, '')
+    ''')
+    cursor.execute('''
+        INSERT INTO score_histogram (job_profile_id, bucket, count)
+        SELECT COALESCE(job_profile_id, ''), MIN(overall_score / 10, 9), COUNT(*)
+        FROM resumes
+        WHERE overall_score IS NOT NULL
+        GROUP BY COALESCE(job_profile_id, ''), MIN(overall_score / 10, 9)
+    ''')
+
+def rebuild_analysis_aggregates():
+    """Recompute the materialized stats from scratch"""
+    with transaction() as cursor:
+        _rebuild_aggregates(cursor)
+
+def _migrate_job_profiles(cursor):
+    """Skill weights on job profiles, plus a version number bumped on every change
+    
+    Processes cache compiled profiles (profile_store.py) and only reload them
+    when job_profiles_version moves.
+    """
+    columns = _column_names(cursor, 'job_profiles')
+    if 'required_weight' not in columns:
+        cursor.execute('ALTER TABLE job_profiles ADD COLUMN required_weight REAL DEFAULT 0.7')
+        cursor.execute('ALTER TABLE job_profiles ADD COLUMN preferred_weight REAL DEFAULT 0.3')
+        cursor.execute('ALTER TABLE job_profiles ADD COLUMN updated_date TIMESTAMP')
+    
     cursor.execute('''
-        CREATE TABLE IF NOT EXISTS analysis_jobs (
-            id TEXT PRIMARY KEY,
-            status TEXT DEFAULT 'pending',
-            total_resumes INTEGER,
-            completed_resumes INTEGER DEFAULT 0,
-            created_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            completed_date TIMESTAMP
+        CREATE TABLE IF NOT EXISTS job_profiles_version (
+            id INTEGER PRIMARY KEY CHECK (id = 0),
+            version INTEGER NOT NULL
         )
     ''')
+    cursor.execute('INSERT OR IGNORE INTO job_profiles_version (id, version) VALUES (0, 0)')
     
-    conn.commit()
-    conn.close()
+    for event in ('INSERT', 'UPDATE', 'DELETE'):
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_job_profiles_version_{event.lower()} AFTER {event} ON job_profiles
+            BEGIN
+                UPDATE job_profiles_version SET version = version + 1 WHERE id = 0;
+            END
+        ''')
 
-def add_resume(resume_id, filename, file_path, status='pending', job_profile_id=None):
-    """Add a new resume to the database"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
+def _migrate_analysis_storage(cursor):
+    """Columnar analysis layout (see analysis_storage.py) and conversion of JSON analyses
+    
+    Skills go to resume_skills (one row per extracted skill, in order), scores
+    and the job match to resumes columns and the rest to analysis_extra. The
+    old analysis TEXT column is cleared once a row is converted.
+    """
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS skills (
+            id INTEGER PRIMARY KEY,
+            name TEXT UNIQUE NOT NULL
+        )
+    ''')
+    
+    # name is only stored when it differs from skills.name (or there is no skill_id)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS resume_skills (
+            resume_id TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            skill_id INTEGER,
+            category TEXT,
+            confidence REAL,
+            name TEXT,
+            PRIMARY KEY (resume_id, position)
+        ) WITHOUT ROWID
+    ''')
+    
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_resumes_skills_delete AFTER DELETE ON resumes
+        BEGIN
+            DELETE FROM resume_skills WHERE resume_id = OLD.id;
+        END
+    ''')
+    
+    if 'analysis_extra' not in _column_names(cursor, 'resumes'):
+        cursor.execute('ALTER TABLE resumes ADD COLUMN job_match TEXT')
+        for column in SECTION_COLUMNS.values():
+            cursor.execute(f'ALTER TABLE resumes ADD COLUMN {column} INTEGER')
+        cursor.execute('ALTER TABLE resumes ADD COLUMN analysis_extra BLOB')
+        # Bumped on every analysis write; bulk rescoring only overwrites the version it read
+        cursor.execute('ALTER TABLE resumes ADD COLUMN analysis_seq INTEGER DEFAULT 0')
+        _convert_json_analyses(cursor)
+
+def _convert_json_analyses(cursor, chunk_size=500):
+    """Move analyses still stored as JSON text into the columnar layout"""
+    converted = 0
+    last_rowid = 0
+    while True:
+        cursor.execute('''
+            SELECT rowid, id, analysis FROM resumes
+            WHERE rowid > ? AND analysis IS NOT NULL AND analysis_extra IS NULL
+            ORDER BY rowid
+            LIMIT ?
+        ''', (last_rowid, chunk_size))
+        rows = cursor.fetchall()
+        if not rows:
+            return converted
+        for _, resume_id, analysis in rows:
+            try:
+                analysis = json.loads(analysis)
+            except ValueError:
+                continue  # Left as text; get_resume_analysis still reads it
+            if isinstance(analysis, dict):
+                # The skill index is rebuilt from resume_skills if it does not exist yet
+                _store_analysis(cursor, resume_id, analysis, status=None, index=False)
+                converted += 1
+        last_rowid = rows[-1][0]
+
+def convert_json_analyses():
+    """Convert analyses written as JSON text (older databases, bulk loads); returns how many"""
+    with transaction() as cursor:
+        return _convert_json_analyses(cursor)
+
+def normalize_skill(name):
+    """Canonical skill name used as the skill index key"""
+    return ' '.join(name.lower().split())
+
+def _create_skill_index(cursor):
+    """Skill inverted index: one posting per (skill, resume rowid), clustered by skill
+    
+    Every posting and score change is appended to skill_index_log by triggers so
+    in-memory bitmap caches (skill_index.py) catch up incrementally. Implicit
+    rowids can change on VACUUM; call rebuild_skill_index() afterwards.
+    """
+    rebuild = not _table_exists(cursor, 'skill_postings')
+    
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS skill_postings (
+            skill_id INTEGER NOT NULL,
+            doc_id INTEGER NOT NULL,
+            PRIMARY KEY (skill_id, doc_id)
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_skill_postings_doc ON skill_postings (doc_id)')
+    
+    # added: 1 = posting added, 0 = posting removed, NULL skill_id = score changed, -1 = index rebuilt
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS skill_index_log (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            skill_id INTEGER,
+            doc_id INTEGER NOT NULL,
+            added INTEGER NOT NULL
+        )
+    ''')
+    
+    _create_posting_triggers(cursor)
+    
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_resumes_index_score AFTER UPDATE OF overall_score ON resumes
+        WHEN OLD.overall_score IS NOT NEW.overall_score
+        BEGIN
+            INSERT INTO skill_index_log (skill_id, doc_id, added) VALUES (NULL, NEW.rowid, 1);
+        END
+    ''')
+    
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_resumes_index_delete AFTER DELETE ON resumes
+        BEGIN
+            DELETE FROM skill_postings WHERE doc_id = OLD.rowid;
+            INSERT INTO skill_index_log (skill_id, doc_id, added) VALUES (NULL, OLD.rowid, 0);
+        END
+    ''')
     
+    if rebuild:
+        _rebuild_skill_index(cursor)
+
+def _create_posting_triggers(cursor):
     cursor.execute('''
-        INSERT INTO resumes (id, filename, file_path, status, job_profile_id)
-        VALUES (?, ?, ?, ?, ?)
-    ''', (resume_id, filename, file_path, status, job_profile_id))
+        CREATE TRIGGER IF NOT EXISTS trg_skill_postings_insert AFTER INSERT ON skill_postings
+        BEGIN
+            INSERT INTO skill_index_log (skill_id, doc_id, added) VALUES (NEW.skill_id, NEW.doc_id, 1);
+        END
+    ''')
+    
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_skill_postings_delete AFTER DELETE ON skill_postings
+        BEGIN
+            INSERT INTO skill_index_log (skill_id, doc_id, added) VALUES (OLD.skill_id, OLD.doc_id, 0);
+        END
+    ''')
+
+def _skill_ids(cursor, names):
+    """Ids of normalized skill names, creating missing ones"""
+    names = sorted(names)
+    if not names:
+        return {}
+    cursor.executemany('INSERT OR IGNORE INTO skills (name) VALUES (?)', [(name,) for name in names])
+    ids = {}
+    for start in range(0, len(names), 500):
+        chunk = names[start:start + 500]
+        cursor.execute(f'SELECT name, id FROM skills WHERE name IN ({", ".join("?" * len(chunk))})', chunk)
+        ids.update(cursor.fetchall())
+    return ids
+
+def _index_resume_skills(cursor, doc_id, wanted):
+    """Bring a resume's postings in line with its skill ids (only the difference is written)"""
+    cursor.execute('SELECT skill_id FROM skill_postings WHERE doc_id = ?', (doc_id,))
+    current = {row[0] for row in cursor.fetchall()}
+    
+    cursor.executemany('DELETE FROM skill_postings WHERE skill_id = ? AND doc_id = ?',
+                       [(skill_id, doc_id) for skill_id in current - wanted])
+    cursor.executemany('INSERT INTO skill_postings (skill_id, doc_id) VALUES (?, ?)',
+                       [(skill_id, doc_id) for skill_id in wanted - current])
+
+def _rebuild_skill_index(cursor):
+    """Recreate all postings from the stored analyses (migration, or after VACUUM)"""
+    # Bulk rewrite without logging every posting; readers are reset by the marker below
+    cursor.execute('DROP TRIGGER IF EXISTS trg_skill_postings_insert')
+    cursor.execute('DROP TRIGGER IF EXISTS trg_skill_postings_delete')
+    cursor.execute('DROP INDEX IF EXISTS idx_skill_postings_doc')
+    cursor.execute('DELETE FROM skill_postings')
+    
+    cursor.execute('''
+        INSERT INTO skill_postings (skill_id, doc_id)
+        SELECT DISTINCT rs.skill_id, r.rowid
+        FROM resumes r JOIN resume_skills rs ON rs.resume_id = r.id
+        WHERE r.overall_score IS NOT NULL AND rs.skill_id IS NOT NULL
+        ORDER BY 1, 2
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_skill_postings_doc ON skill_postings (doc_id)')
+    _create_posting_triggers(cursor)
     
-    conn.commit()
-    conn.close()
+    # Readers holding caches start over instead of replaying the rebuild
+    cursor.execute('DELETE FROM skill_index_log')
+    cursor.execute('INSERT INTO skill_index_log (skill_id, doc_id, added) VALUES (NULL, 0, -1)')
+
+def rebuild_skill_index():
+    """Recreate the skill index from scratch"""
+    with transaction() as cursor:
+        _rebuild_skill_index(cursor)
+
+def add_resume(resume_id, filename, file_path, status='pending', job_profile_id=None):
+    """Add a new resume to the database"""
+    with transaction() as cursor:
+        cursor.execute('''
+            INSERT INTO resumes (id, filename, file_path, status, job_profile_id)
+            VALUES (?, ?, ?, ?, ?)
+        ''', (resume_id, filename, file_path, status, job_profile_id))
+
+def add_resumes(rows, place_files=None):
+    """Add many resumes in one transaction: rows of (id, filename, file_path, status, job_profile_id, content_hash)
+    
+    place_files, when given, runs after the insert and before the commit (moving
+    the uploads into the file store while their references are held).
+    """
+    if not rows:
+        return
+    with transaction() as cursor:
+        cursor.executemany('''
+            INSERT INTO resumes (id, filename, file_path, status, job_profile_id, content_hash)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', rows)
+        if place_files:
+            place_files()
+
+def find_analyzed_resumes(content_hashes, job_profile_id=None):
+    """{content_hash: resume_id} of completed analyses of these files for the same job profile"""
+    content_hashes = list(content_hashes)
+    found = {}
+    cursor = get_connection().cursor()
+    for start in range(0, len(content_hashes), 500):
+        chunk = content_hashes[start:start + 500]
+        cursor.execute(f'''
+            SELECT content_hash, id FROM resumes
+            WHERE content_hash IN ({', '.join('?' * len(chunk))})
+              AND status = 'completed' AND COALESCE(job_profile_id, '') = ?
+            ORDER BY rowid DESC
+        ''', chunk + [job_profile_id or ''])
+        for content_hash, resume_id in cursor.fetchall():
+            found.setdefault(content_hash, resume_id)
+    return found
 
 def get_resume(resume_id):
-    """Get resume by ID"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
+    """Get resume by ID (without its analysis, see get_resume_analysis)"""
+    cursor = get_connection().cursor()
     
     cursor.execute('''
-        SELECT id, filename, file_path, upload_date, status, analysis, job_profile_id
+        SELECT id, filename, file_path, upload_date, status, job_profile_id
         FROM resumes WHERE id = ?
     ''', (resume_id,))
     
     row = cursor.fetchone()
-    conn.close()
     
     if row:
         return {
@@ -89,29 +607,98 @@ def get_resume(resume_id):
             'file_path': row[2],
             'upload_date': row[3],
             'status': row[4],
-            'analysis': row[5],
-            'job_profile_id': row[6]
+            'job_profile_id': row[5]
         }
     return None
 
-def update_resume_analysis(resume_id, analysis_result):
-    """Update resume with analysis results"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
+def get_resume_analysis(resume_id):
+    """The full analysis result of a resume, or None if it has none"""
+    cursor = get_connection().cursor()
+    
+    cursor.execute(f'SELECT analysis, {", ".join(ANALYSIS_COLUMNS)} FROM resumes WHERE id = ?', (resume_id,))
+    row = cursor.fetchone()
+    if row is None:
+        return None
+    
+    columns = dict(zip(ANALYSIS_COLUMNS, row[1:]))
+    if columns['analysis_extra'] is None:
+        # Not converted (unparseable JSON text) or not analyzed yet
+        return json.loads(row[0]) if row[0] else None
     
     cursor.execute('''
-        UPDATE resumes 
-        SET analysis = ?, status = 'completed'
-        WHERE id = ?
-    ''', (json.dumps(analysis_result), resume_id))
+        SELECT COALESCE(rs.name, s.name), rs.category, rs.confidence
+        FROM resume_skills rs LEFT JOIN skills s ON s.id = rs.skill_id
+        WHERE rs.resume_id = ?
+        ORDER BY rs.position
+    ''', (resume_id,))
+    
+    return unpack_analysis(columns, cursor.fetchall())
+
+# UPDATE statement writing every analysis column (status left alone when NULL)
+STORE_ANALYSIS_SQL = f'''
+    UPDATE resumes
+    SET analysis = NULL, status = COALESCE(?, status), analysis_seq = analysis_seq + 1,
+        {', '.join(f'{column} = ?' for column in ANALYSIS_COLUMNS)}
+    WHERE id = ?
+'''
+
+def _store_analysis(cursor, resume_id, analysis_result, status='completed', index=True):
+    """Write an analysis as columns, resume_skills rows and the compressed remainder"""
+    columns, skills = pack_analysis(analysis_result)
+    cursor.execute(STORE_ANALYSIS_SQL, (status, *(columns[column] for column in ANALYSIS_COLUMNS), resume_id))
+    if cursor.rowcount == 0:
+        return
+    
+    keys = [normalize_skill(name) if isinstance(name, str) else '' for name, _, _ in skills]
+    ids = _skill_ids(cursor, set(keys) - {''})
+    
+    rows = []
+    for position, ((name, category, confidence), key) in enumerate(zip(skills, keys)):
+        skill_id = ids.get(key)
+        rows.append((resume_id, position, skill_id, category, confidence,
+                     None if skill_id is not None and name == key else name))
+    cursor.execute('DELETE FROM resume_skills WHERE resume_id = ?', (resume_id,))
+    cursor.executemany('''
+        INSERT INTO resume_skills (resume_id, position, skill_id, category, confidence, name)
+        VALUES (?, ?, ?, ?, ?, ?)
+    ''', rows)
+    
+    if index:
+        cursor.execute('SELECT rowid FROM resumes WHERE id = ?', (resume_id,))
+        _index_resume_skills(cursor, cursor.fetchone()[0], set(ids.values()))
+
+def update_resume_analysis(resume_id, analysis_result):
+    """Update resume with analysis results"""
+    with transaction() as cursor:
+        _store_analysis(cursor, resume_id, analysis_result)
+
+def update_resume_status(resume_id, status):
+    """Set a resume's processing status"""
+    with transaction() as cursor:
+        cursor.execute('UPDATE resumes SET status = ? WHERE id = ?', (status, resume_id))
+
+def delete_resume(resume_id, remove_file=None):
+    """Delete a resume and its analysis
     
-    conn.commit()
-    conn.close()
+    remove_file(location) is called, before the commit, when this was the last
+    resume referencing its file; returns True in that case.
+    """
+    with transaction() as cursor:
+        cursor.execute('SELECT file_path FROM resumes WHERE id = ?', (resume_id,))
+        row = cursor.fetchone()
+        cursor.execute('DELETE FROM resumes WHERE id = ?', (resume_id,))
+        if row is None or remove_file is None:
+            return False
+        
+        cursor.execute('DELETE FROM stored_files WHERE location = ? AND refcount <= 0', (row[0],))
+        if cursor.rowcount:
+            remove_file(row[0])
+            return True
+        return False
 
 def get_all_resumes(limit=100, offset=0):
     """Get all resumes with pagination"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
+    cursor = get_connection().cursor()
     
     cursor.execute('''
         SELECT id, filename, file_path, upload_date, status, job_profile_id
@@ -121,7 +708,6 @@ def get_all_resumes(limit=100, offset=0):
     ''', (limit, offset))
     
     rows = cursor.fetchall()
-    conn.close()
     
     resumes = []
     for row in rows:
@@ -136,109 +722,510 @@ def get_all_resumes(limit=100, offset=0):
     
     return resumes
 
-def add_job_profile(profile_id, title, required_skills, preferred_skills, minimum_experience, description):
+# Subquery listing a resumes row's skill names in extraction order
+RESUME_SKILL_NAMES = '''
+    SELECT COALESCE(rs.name, s.name) AS name
+    FROM resume_skills rs LEFT JOIN skills s ON s.id = rs.skill_id
+    WHERE rs.resume_id = resumes.id
+    ORDER BY rs.position
+'''
+
+# Columns needed by exports; skill names are joined inside SQLite from resume_skills
+# and missing skills come from the small job_match column, never the full analysis
+EXPORT_COLUMNS = f'''
+    id, filename, upload_date, overall_score, job_match_percentage,
+    skills_score, experience_score, education_score,
+    (SELECT group_concat(name, ', ') FROM ({RESUME_SKILL_NAMES})) AS detected_skills,
+    (SELECT group_concat(value, ', ') FROM json_each(job_match, '$.missingSkills')) AS missing_skills
+'''
+
+EXPORT_FIELDS = ['filename', 'overall_score', 'skills_score', 'experience_score', 'education_score',
+                 'job_match', 'detected_skills', 'missing_skills', 'upload_date']
+
+def _export_row(row):
+    return {
+        'filename': row[1],
+        'overall_score': row[3],
+        'skills_score': row[5] or 0,
+        'experience_score': row[6] or 0,
+        'education_score': row[7] or 0,
+        'job_match': row[4],
+        'detected_skills': row[8] or '',
+        'missing_skills': row[9] or '',
+        'upload_date': row[2]
+    }
+
+def iter_export_rows(resume_ids=None, job_profile_id=None, date_from=None, date_to=None, chunk_size=500):
+    """Yield export rows for completed analyses, fetched in bulk chunks
+    
+    With resume_ids, rows come back in the requested order using fixed-size
+    IN (...) lookups; otherwise the table is walked by rowid with optional
+    profile / upload-date filters. Memory use is bounded by chunk_size.
+    """
+    cursor = get_connection().cursor()
+    
+    if resume_ids is not None:
+        # Pad every chunk to chunk_size placeholders so one prepared statement is reused
+        query = f'''
+            SELECT {EXPORT_COLUMNS} FROM resumes
+            WHERE id IN ({', '.join('?' * chunk_size)}) AND overall_score IS NOT NULL
+        '''
+        for start in range(0, len(resume_ids), chunk_size):
+            chunk = list(resume_ids[start:start + chunk_size])
+            cursor.execute(query, chunk + [None] * (chunk_size - len(chunk)))
+            rows = {row[0]: row for row in cursor.fetchall()}
+            for resume_id in chunk:
+                if resume_id in rows:
+                    yield _export_row(rows[resume_id])
+        return
+    
+    last_rowid = 0
+    while True:
+        cursor.execute(f'''
+            SELECT rowid, {EXPORT_COLUMNS} FROM resumes
+            WHERE rowid > ? AND overall_score IS NOT NULL
+              AND (? IS NULL OR job_profile_id = ?)
+              AND (? IS NULL OR upload_date >= ?)
+              AND (? IS NULL OR upload_date <= ?)
+            ORDER BY rowid
+            LIMIT ?
+        ''', (last_rowid, job_profile_id, job_profile_id, date_from, date_from, date_to, date_to, chunk_size))
+        rows = cursor.fetchall()
+        if not rows:
+            return
+        for row in rows:
+            yield _export_row(row[1:])
+        last_rowid = rows[-1][0]
+
+def iter_resume_skills(job_profile_id=None, chunk_size=1000):
+    """Yield (resume_id, filename, [skill names]) for completed analyses, walked by rowid
+    
+    Skill names come from resume_skills, gathered per resume inside SQLite.
+    """
+    cursor = get_connection().cursor()
+    
+    last_rowid = 0
+    while True:
+        cursor.execute(f'''
+            SELECT rowid, id, filename, (SELECT json_group_array(name) FROM ({RESUME_SKILL_NAMES}))
+            FROM resumes
+            WHERE rowid > ? AND overall_score IS NOT NULL
+              AND (? IS NULL OR job_profile_id = ?)
+            ORDER BY rowid
+            LIMIT ?
+        ''', (last_rowid, job_profile_id, job_profile_id, chunk_size))
+        rows = cursor.fetchall()
+        if not rows:
+            return
+        for row in rows:
+            yield row[1], row[2], [name for name in json.loads(row[3] or '[]') if name]
+        last_rowid = rows[-1][0]
+
+def _profile_filter(include_unassigned):
+    """WHERE clause for the resumes scored against one profile (plus those with none, for the default)"""
+    if include_unassigned:
+        return "(job_profile_id = ? OR job_profile_id IS NULL OR job_profile_id = '')"
+    return 'job_profile_id = ?'
+
+def count_profile_analyses(job_profile_id, include_unassigned=False):
+    """Number of completed analyses scored against a job profile"""
+    cursor = get_connection().cursor()
+    
+    cursor.execute(f'''
+        SELECT COUNT(*) FROM resumes
+        WHERE overall_score IS NOT NULL AND analysis_extra IS NOT NULL AND {_profile_filter(include_unassigned)}
+    ''', (job_profile_id,))
+    
+    return cursor.fetchone()[0]
+
+def iter_profile_analyses(job_profile_id, include_unassigned=False, chunk_size=500):
+    """Yield lists of (resume_id, analysis_seq, scoring fields) scored against a job profile, walked by rowid
+    
+    The scoring fields are the parts of the analysis the job match and overall
+    score depend on: skills (names only), section scores, jobMatch and overallScore.
+    """
+    cursor = get_connection().cursor()
+    
+    last_rowid = 0
+    while True:
+        cursor.execute(f'''
+            SELECT rowid, id, analysis_seq, overall_score, job_match, {', '.join(SECTION_COLUMNS.values())},
+                   (SELECT json_group_array(name) FROM ({RESUME_SKILL_NAMES}))
+            FROM resumes
+            WHERE rowid > ? AND overall_score IS NOT NULL AND analysis_extra IS NOT NULL
+              AND {_profile_filter(include_unassigned)}
+            ORDER BY rowid
+            LIMIT ?
+        ''', (last_rowid, job_profile_id, chunk_size))
+        rows = cursor.fetchall()
+        if not rows:
+            return
+        chunk = []
+        for row in rows:
+            scores = row[5:-1]
+            chunk.append((row[1], row[2], {
+                'overallScore': row[3],
+                'jobMatch': json.loads(row[4]) if row[4] else None,
+                'sections': [{'name': name, 'score': score}
+                             for name, score in zip(SECTION_COLUMNS, scores) if score is not None],
+                'skills': [{'name': name} for name in json.loads(row[-1] or '[]') if name]
+            }))
+        yield chunk
+        last_rowid = rows[-1][0]
+
+def update_rescored_analyses(rows):
+    """Write back rescored job matches in one transaction
+    
+    rows are (overall_score, job_match_percentage, job_match JSON, resume_id,
+    analysis_seq read); a resume re-analyzed since it was read is left alone.
+    Skills are unchanged, so resume_skills and the skill index are too.
+    """
+    with transaction() as cursor:
+        cursor.executemany('''
+            UPDATE resumes
+            SET overall_score = ?, job_match_percentage = ?, job_match = ?
+            WHERE id = ? AND analysis_seq = ?
+        ''', rows)
+
+def get_resume_skills(resume_id):
+    """Skill names of one analyzed resume, or None if it has no analysis"""
+    cursor = get_connection().cursor()
+    
+    cursor.execute(f'''
+        SELECT (SELECT json_group_array(name) FROM ({RESUME_SKILL_NAMES}))
+        FROM resumes WHERE id = ? AND analysis_extra IS NOT NULL
+    ''', (resume_id,))
+    
+    row = cursor.fetchone()
+    if row is None:
+        return None
+    return [name for name in json.loads(row[0] or '[]') if name]
+
+def add_job_profile(profile_id, title, required_skills, preferred_skills, minimum_experience, description,
+                    weights=None):
     """Add a new job profile"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
+    weights = weights or {'required': 0.7, 'preferred': 0.3}
+    with transaction() as cursor:
+        cursor.execute('''
+            INSERT INTO job_profiles (id, title, required_skills, preferred_skills, minimum_experience, description,
+                                      required_weight, preferred_weight)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (profile_id, title, json.dumps(required_skills), json.dumps(preferred_skills), minimum_experience, description,
+              weights['required'], weights['preferred']))
+
+def update_job_profile(profile_id, title, required_skills, preferred_skills, minimum_experience, description, weights):
+    """Replace a job profile's fields; returns False if it does not exist"""
+    with transaction() as cursor:
+        cursor.execute('''
+            UPDATE job_profiles SET
+                title = ?, required_skills = ?, preferred_skills = ?, minimum_experience = ?, description = ?,
+                required_weight = ?, preferred_weight = ?, updated_date = CURRENT_TIMESTAMP
+            WHERE id = ?
+        ''', (title, json.dumps(required_skills), json.dumps(preferred_skills), minimum_experience, description,
+              weights['required'], weights['preferred'], profile_id))
+        return cursor.rowcount > 0
+
+def seed_job_profiles(profiles):
+    """Insert the built-in job profiles that are not in the table yet (edits are kept)"""
+    with transaction() as cursor:
+        cursor.executemany('''
+            INSERT OR IGNORE INTO job_profiles (id, title, required_skills, preferred_skills, minimum_experience,
+                                                description, required_weight, preferred_weight)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', [
+            (profile_id, profile['title'], json.dumps(profile['required_skills']), json.dumps(profile['preferred_skills']),
+             profile.get('minimum_experience'), profile.get('description'),
+             profile['weights']['required'], profile['weights']['preferred'])
+            for profile_id, profile in profiles.items()
+        ])
+
+def _job_profile(row):
+    return {
+        'id': row[0],
+        'title': row[1],
+        'requiredSkills': json.loads(row[2]) if row[2] else [],
+        'preferredSkills': json.loads(row[3]) if row[3] else [],
+        'minimumExperience': row[4],
+        'description': row[5],
+        'weights': {'required': row[6], 'preferred': row[7]}
+    }
+
+def get_job_profile(profile_id):
+    """Get one job profile"""
+    cursor = get_connection().cursor()
     
     cursor.execute('''
-        INSERT INTO job_profiles (id, title, required_skills, preferred_skills, minimum_experience, description)
-        VALUES (?, ?, ?, ?, ?, ?)
-    ''', (profile_id, title, json.dumps(required_skills), json.dumps(preferred_skills), minimum_experience, description))
+        SELECT id, title, required_skills, preferred_skills, minimum_experience, description,
+               required_weight, preferred_weight
+        FROM job_profiles WHERE id = ?
+    ''', (profile_id,))
     
-    conn.commit()
-    conn.close()
+    row = cursor.fetchone()
+    return _job_profile(row) if row else None
 
 def get_job_profiles():
     """Get all job profiles"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
+    cursor = get_connection().cursor()
     
     cursor.execute('''
-        SELECT id, title, required_skills, preferred_skills, minimum_experience, description
+        SELECT id, title, required_skills, preferred_skills, minimum_experience, description,
+               required_weight, preferred_weight
         FROM job_profiles
-        ORDER BY created_date DESC
+        ORDER BY created_date DESC, rowid
     ''')
     
-    rows = cursor.fetchall()
-    conn.close()
-    
-    profiles = []
-    for row in rows:
-        profiles.append({
-            'id': row[0],
-            'title': row[1],
-            'requiredSkills': json.loads(row[2]) if row[2] else [],
-            'preferredSkills': json.loads(row[3]) if row[3] else [],
-            'minimumExperience': row[4],
-            'description': row[5]
-        })
-    
-    return profiles
+    return [_job_profile(row) for row in cursor.fetchall()]
+
+def get_job_profiles_version():
+    """Counter bumped by every insert, update or delete on job_profiles"""
+    cursor = get_connection().cursor()
+    cursor.execute('SELECT version FROM job_profiles_version WHERE id = 0')
+    row = cursor.fetchone()
+    return row[0] if row else 0
 
-def create_analysis_job(job_id, total_resumes):
+def create_analysis_job(job_id, total_resumes, job_type='analysis', job_profile_id=None):
     """Create a new analysis job for batch processing"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        INSERT INTO analysis_jobs (id, total_resumes)
-        VALUES (?, ?)
-    ''', (job_id, total_resumes))
-    
-    conn.commit()
-    conn.close()
+    with transaction() as cursor:
+        cursor.execute('''
+            INSERT INTO analysis_jobs (id, total_resumes, job_type, job_profile_id)
+            VALUES (?, ?, ?, ?)
+        ''', (job_id, total_resumes, job_type, job_profile_id))
 
 def update_job_progress(job_id, completed_resumes):
     """Update job progress"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        UPDATE analysis_jobs 
-        SET completed_resumes = ?
-        WHERE id = ?
-    ''', (completed_resumes, job_id))
-    
-    conn.commit()
-    conn.close()
+    with transaction() as cursor:
+        cursor.execute('''
+            UPDATE analysis_jobs 
+            SET completed_resumes = ?
+            WHERE id = ?
+        ''', (completed_resumes, job_id))
+
+def increment_job_progress(job_id, completed=0, failed=0, rows_per_second=None):
+    """Atomically add finished resumes to a job and close it once every resume is accounted for"""
+    with transaction() as cursor:
+        cursor.execute('''
+            UPDATE analysis_jobs SET
+                completed_resumes = completed_resumes + ?,
+                failed_resumes = failed_resumes + ?,
+                rows_per_second = COALESCE(?, rows_per_second),
+                status = CASE
+                    WHEN completed_resumes + failed_resumes + ? + ? < total_resumes THEN 'processing'
+                    WHEN completed_resumes + ? = 0 THEN 'failed'
+                    ELSE 'completed'
+                END,
+                completed_date = CASE
+                    WHEN completed_resumes + failed_resumes + ? + ? >= total_resumes THEN CURRENT_TIMESTAMP
+                END
+            WHERE id = ?
+        ''', (completed, failed, rows_per_second, completed, failed, completed, completed, failed, job_id))
 
-def get_analysis_stats():
-    """Get overall analysis statistics"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
+def finish_analysis_job(job_id, status='completed'):
+    """Close a job whose total was only an estimate (rows added or deleted while it ran)"""
+    with transaction() as cursor:
+        cursor.execute('''
+            UPDATE analysis_jobs SET status = ?, completed_date = CURRENT_TIMESTAMP,
+                total_resumes = completed_resumes + failed_resumes
+            WHERE id = ?
+        ''', (status, job_id))
+
+def get_analysis_job(job_id):
+    """Get a job's progress counters"""
+    cursor = get_connection().cursor()
     
-    # Total resumes
-    cursor.execute('SELECT COUNT(*) FROM resumes')
-    total_resumes = cursor.fetchone()[0]
+    cursor.execute('''
+        SELECT id, status, total_resumes, completed_resumes, failed_resumes, created_date, completed_date,
+               job_type, job_profile_id, rows_per_second
+        FROM analysis_jobs WHERE id = ?
+    ''', (job_id,))
     
-    # Completed analyses
-    cursor.execute('SELECT COUNT(*) FROM resumes WHERE status = "completed"')
-    completed_analyses = cursor.fetchone()[0]
+    row = cursor.fetchone()
     
-    # Average score (if analysis exists)
-    cursor.execute('''
-        SELECT analysis FROM resumes 
-        WHERE status = "completed" AND analysis IS NOT NULL
-    ''')
+    if row:
+        return {
+            'id': row[0],
+            'status': row[1],
+            'total': row[2],
+            'completed': row[3],
+            'failed': row[4],
+            'created_date': row[5],
+            'completed_date': row[6],
+            'job_type': row[7],
+            'job_profile_id': row[8],
+            'rows_per_second': row[9]
+        }
+    return None
+
+def get_analysis_stats(job_profile_id=None):
+    """Get overall analysis statistics from the materialized aggregates
     
-    analyses = cursor.fetchall()
-    scores = []
+    Cost depends on the number of job profiles, not on the number of resumes.
+    Pass '' for resumes uploaded without a job profile.
+    """
+    cursor = get_connection().cursor()
     
-    for (analysis_json,) in analyses:
-        try:
-            analysis = json.loads(analysis_json)
-            scores.append(analysis.get('overallScore', 0))
-        except:
-            continue
+    if job_profile_id is None:
+        cursor.execute('''
+            SELECT COALESCE(SUM(total_resumes), 0), COALESCE(SUM(completed_count), 0), COALESCE(SUM(score_sum), 0),
+                   COALESCE(SUM(match_sum), 0), COALESCE(SUM(skill_sum), 0)
+            FROM analysis_aggregates
+        ''')
+        totals = cursor.fetchone()
+        cursor.execute('SELECT bucket, SUM(count) FROM score_histogram GROUP BY bucket')
+    else:
+        cursor.execute('''
+            SELECT total_resumes, completed_count, score_sum, match_sum, skill_sum
+            FROM analysis_aggregates WHERE job_profile_id = ?
+        ''', (job_profile_id,))
+        totals = cursor.fetchone() or (0, 0, 0, 0, 0)
+        cursor.execute('SELECT bucket, count FROM score_histogram WHERE job_profile_id = ?', (job_profile_id,))
     
-    avg_score = sum(scores) / len(scores) if scores else 0
+    histogram = dict(cursor.fetchall())
+    total_resumes, completed_analyses, score_sum, match_sum, skill_sum = totals
     
-    conn.close()
+    def average(total):
+        return round(total / completed_analyses, 1) if completed_analyses else 0
     
     return {
         'totalResumes': total_resumes,
         'completedAnalyses': completed_analyses,
-        'averageScore': round(avg_score, 1),
+        'averageScore': average(score_sum),
+        'averageJobMatch': average(match_sum),
+        'averageSkillCount': average(skill_sum),
+        'scoreDistribution': [
+            {'range': f'{bucket * 10}-{bucket * 10 + 9 if bucket < 9 else 100}', 'count': histogram.get(bucket, 0)}
+            for bucket in range(10)
+        ],
         'processingRate': (completed_analyses / total_resumes * 100) if total_resumes > 0 else 0
-    }
\ No newline at end of file
+    }
+
+def get_cached_value(key):
+    """Get a cached value by key"""
+    cursor = get_connection().cursor()
+    
+    cursor.execute('SELECT value FROM analysis_cache WHERE key = ?', (key,))
+    row = cursor.fetchone()
+    
+    return row[0] if row else None
+
+def set_cached_value(key, value, stats=None):
+    """Insert or replace a cached value, adding any pending hit/miss counts in the same transaction"""
+    with transaction() as cursor:
+        cursor.execute('''
+            INSERT OR REPLACE INTO analysis_cache (key, value)
+            VALUES (?, ?)
+        ''', (key, value))
+        if stats:
+            _add_cache_stats(cursor, stats)
+
+def add_cache_stats(stats):
+    """Add {name: count} to the cache hit/miss counters"""
+    if not stats:
+        return
+    with transaction() as cursor:
+        _add_cache_stats(cursor, stats)
+
+def _add_cache_stats(cursor, stats):
+    cursor.executemany('''
+        INSERT INTO analysis_cache_stats (name, count) VALUES (?, ?)
+        ON CONFLICT(name) DO UPDATE SET count = count + excluded.count
+    ''', list(stats.items()))
+
+def get_cache_stats():
+    """Get cache counters and entry count"""
+    cursor = get_connection().cursor()
+    
+    cursor.execute('SELECT name, count FROM analysis_cache_stats')
+    stats = {name: count for name, count in cursor.fetchall()}
+    
+    cursor.execute('SELECT COUNT(*) FROM analysis_cache')
+    stats['entries'] = cursor.fetchone()[0]
+    
+    return stats
+
+def find_skill_ids(names):
+    """Ids of already indexed skills, by normalized name"""
+    names = sorted({normalize_skill(name) for name in names})
+    if not names:
+        return {}
+    cursor = get_connection().cursor()
+    cursor.execute(f'SELECT name, id FROM skills WHERE name IN ({", ".join("?" * len(names))})', names)
+    return dict(cursor.fetchall())
+
+def get_skill_postings(skill_id):
+    """Resume rowids that have a skill, in rowid order"""
+    cursor = get_connection().cursor()
+    cursor.execute('SELECT doc_id FROM skill_postings WHERE skill_id = ?', (skill_id,))
+    return [row[0] for row in cursor.fetchall()]
+
+def get_skill_index_changes(after_seq, limit=100000):
+    """Log entries (seq, skill_id, doc_id, added) after after_seq, and the oldest seq still kept"""
+    cursor = get_connection().cursor()
+    cursor.execute('SELECT MIN(seq) FROM skill_index_log')
+    oldest = cursor.fetchone()[0]
+    cursor.execute('''
+        SELECT seq, skill_id, doc_id, added FROM skill_index_log
+        WHERE seq > ? ORDER BY seq LIMIT ?
+    ''', (after_seq, limit))
+    return cursor.fetchall(), oldest
+
+def get_last_skill_index_seq():
+    cursor = get_connection().cursor()
+    cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = 'skill_index_log'")
+    row = cursor.fetchone()
+    return row[0] if row else 0
+
+def prune_skill_index_log(keep=1000000):
+    """Drop all but the newest keep log entries (readers further behind start over)"""
+    with transaction() as cursor:
+        cursor.execute('''
+            DELETE FROM skill_index_log
+            WHERE seq <= (SELECT seq FROM sqlite_sequence WHERE name = 'skill_index_log') - ?
+        ''', (keep,))
+
+def get_doc_scores(doc_ids=None):
+    """(rowid, overall_score) of analyzed resumes: all of them, or the given rowids"""
+    cursor = get_connection().cursor()
+    if doc_ids is None:
+        cursor.execute('SELECT rowid, overall_score FROM resumes WHERE overall_score IS NOT NULL')
+        return cursor.fetchall()
+    
+    scores = []
+    doc_ids = list(doc_ids)
+    for start in range(0, len(doc_ids), 500):
+        chunk = doc_ids[start:start + 500]
+        cursor.execute(f'SELECT rowid, overall_score FROM resumes WHERE rowid IN ({", ".join("?" * len(chunk))})', chunk)
+        scores.extend(cursor.fetchall())
+    return scores
+
+def _resume_summaries(key_column, keys):
+    """Resume summaries keyed by key_column ('rowid' or 'id')"""
+    if not keys:
+        return {}
+    cursor = get_connection().cursor()
+    cursor.execute(f'''
+        SELECT {key_column}, id, filename, upload_date, status, job_profile_id,
+               overall_score, job_match_percentage, skill_count
+        FROM resumes WHERE {key_column} IN ({', '.join('?' * len(keys))})
+    ''', list(keys))
+    
+    return {
+        row[0]: {
+            'id': row[1],
+            'filename': row[2],
+            'upload_date': row[3],
+            'status': row[4],
+            'job_profile_id': row[5],
+            'overallScore': row[6],
+            'jobMatchPercentage': row[7],
+            'skillCount': row[8]
+        }
+        for row in cursor.fetchall()
+    }
+
+def get_resumes_by_doc_ids(doc_ids):
+    """Resume summaries keyed by rowid"""
+    return _resume_summaries('rowid', doc_ids)
+
+def get_resume_summaries(resume_ids):
+    """Resume summaries keyed by resume id"""
+    return _resume_summaries('id', resume_ids)
@@ -0,0 +1,54 @@
+"""
+Deadlines - time budgets for interactive analyses
+A deadline is an absolute wall-clock time (seconds since the epoch), so it survives
+the trip through the broker and the queue wait counts against it. The processor
+runs its cheap stages first and adds the expensive optional one (KeyBERT keywords
+and the document embedding) only when its estimated cost still fits in the time
+left; otherwise the analysis is marked partial and completed on the bulk queue.
+"""
+
+import threading
+import time
+
+# Seconds per character of keyword text assumed until KeyBERT has been timed in this process
+DEFAULT_KEYWORD_RATE = 0.00005
+
+# Estimates are scaled by this before they are compared with the time left
+SAFETY_FACTOR = 1.25
+
+
+def deadline_after(budget_ms, now=None):
+    """The deadline budget_ms milliseconds from now, or None for no budget (0 or None)"""
+    if not budget_ms:
+        return None
+    return (time.time() if now is None else now) + budget_ms / 1000
+
+
+def time_left(deadline):
+    """Seconds until the deadline (negative once it has passed), or None without one"""
+    return None if deadline is None else deadline - time.time()
+
+
+class CostEstimator:
+    """Exponentially weighted moving average of a stage's seconds per unit of input (e.g. characters)"""
+
+    def __init__(self, initial_rate, alpha=0.2):
+        self.rate = initial_rate
+        self.alpha = alpha
+        self.samples = 0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds, size):
+        rate = seconds / max(size, 1)
+        with self._lock:
+            # The first measurement replaces the initial guess
+            self.rate = rate if not self.samples else self.alpha * rate + (1 - self.alpha) * self.rate
+            self.samples += 1
+
+    def estimate(self, size):
+        return self.rate * max(size, 1)
+
+    def fits(self, size, deadline, safety=SAFETY_FACTOR):
+        """Whether the stage is expected to finish before the deadline (always true without one)"""
+        left = time_left(deadline)
+        return left is None or self.estimate(size) * safety <= left
@@ -0,0 +1,244 @@
+"""
+Embedding store - compact, memory-mapped matrix of document embeddings
+Unit-normalized vectors are appended as float16 (or int8 with a per-row scale)
+rows next to a fixed-width key file, and searched by chunked brute-force dot
+product (or an hnswlib index when installed and enabled). Writers in several
+processes append under a file lock; readers pick up new rows on each search.
+"""
+
+import base64
+import fcntl
+import os
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+
+KEY_BYTES = 64
+DTYPES = {'float16': np.float16, 'int8': np.int8}
+
+
+def normalize(vectors):
+    vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def encode_vector(vector):
+    """Compact JSON-safe form of an embedding (base64 float16), e.g. for cached features"""
+    return base64.b64encode(normalize(vector)[0].astype(np.float16).tobytes()).decode('ascii')
+
+
+def decode_vector(text):
+    return np.frombuffer(base64.b64decode(text), dtype=np.float16).astype(np.float32)
+
+
+class EmbeddingStore:
+    def __init__(self, path, dim=384, dtype='float16', chunk_rows=16384, use_ann=False):
+        if dtype not in DTYPES:
+            raise ValueError(f"Unsupported embedding dtype: {dtype}")
+        self.path = path
+        self.dim = dim
+        self.dtype = dtype
+        self.chunk_rows = chunk_rows
+        self.use_ann = use_ann
+        self.row_bytes = dim * np.dtype(DTYPES[dtype]).itemsize
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._rows = 0
+        self._matrix = None
+        self._scales = None
+        self._keys = []
+        self._row_of = {}
+        self._valid = np.zeros(0, dtype=bool)
+        self._deleted_offset = 0
+        self._ann = None
+
+    def _file(self, suffix):
+        return f"{self.path}.{suffix}"
+
+    @contextmanager
+    def _write_lock(self):
+        with open(self._file('lock'), 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _file_rows(self):
+        """Rows completely written to every file (a crashed append leaves a shorter tail)"""
+        rows = min(self._size('vec') // self.row_bytes, self._size('keys') // KEY_BYTES)
+        if self.dtype == 'int8':
+            rows = min(rows, self._size('scale') // 4)
+        return rows
+
+    def _size(self, suffix):
+        try:
+            return os.path.getsize(self._file(suffix))
+        except FileNotFoundError:
+            return 0
+
+    def add(self, keys, vectors):
+        """Append vectors under keys; a key added again supersedes its earlier row"""
+        vectors = normalize(vectors)
+        if vectors.shape[1] != self.dim:
+            raise ValueError(f"Expected {self.dim}-dimensional vectors, got {vectors.shape[1]}")
+        encoded_keys = []
+        for key in keys:
+            encoded = key.encode('utf-8')
+            if len(encoded) > KEY_BYTES:
+                raise ValueError(f"Embedding key longer than {KEY_BYTES} bytes: {key}")
+            encoded_keys.append(encoded.ljust(KEY_BYTES, b'\0'))
+
+        if self.dtype == 'int8':
+            scales = np.maximum(np.abs(vectors).max(axis=1), 1e-12) / 127
+            rows = np.round(vectors / scales[:, None]).astype(np.int8)
+        else:
+            rows = vectors.astype(np.float16)
+
+        with self._write_lock():
+            # Drop any partial tail so the files stay row-aligned
+            rows_written = self._file_rows()
+            suffixes = ('vec', 'keys', 'scale') if self.dtype == 'int8' else ('vec', 'keys')
+            for suffix, width in zip(suffixes, (self.row_bytes, KEY_BYTES, 4)):
+                with open(self._file(suffix), 'ab') as handle:
+                    handle.truncate(rows_written * width)
+
+            with open(self._file('vec'), 'ab') as handle:
+                handle.write(rows.tobytes())
+            if self.dtype == 'int8':
+                with open(self._file('scale'), 'ab') as handle:
+                    handle.write(scales.astype(np.float32).tobytes())
+            with open(self._file('keys'), 'ab') as handle:
+                handle.write(b''.join(encoded_keys))
+
+    def remove(self, key):
+        """Hide the key's current row from searches"""
+        with self._lock:
+            self._refresh()
+            row = self._row_of.get(key)
+        if row is None:
+            return
+        with self._write_lock():
+            with open(self._file('deleted'), 'a') as handle:
+                handle.write(f"{row}\n")
+
+    def _refresh(self):
+        """Map rows and deletions appended (by any process) since the last call"""
+        rows = self._file_rows()
+        if rows > self._rows:
+            with open(self._file('keys'), 'rb') as handle:
+                handle.seek(self._rows * KEY_BYTES)
+                raw = handle.read((rows - self._rows) * KEY_BYTES)
+
+            valid = np.zeros(rows, dtype=bool)
+            valid[:self._rows] = self._valid
+            valid[self._rows:] = True
+            for offset in range(0, len(raw), KEY_BYTES):
+                key = raw[offset:offset + KEY_BYTES].rstrip(b'\0').decode('utf-8')
+                row = self._rows + offset // KEY_BYTES
+                previous = self._row_of.get(key)
+                if previous is not None:
+                    valid[previous] = False
+                self._row_of[key] = row
+                self._keys.append(key)
+
+            self._matrix = np.memmap(self._file('vec'), dtype=DTYPES[self.dtype], mode='r', shape=(rows, self.dim))
+            if self.dtype == 'int8':
+                self._scales = np.memmap(self._file('scale'), dtype=np.float32, mode='r', shape=(rows,))
+            self._valid = valid
+            self._rows = rows
+
+        if self._size('deleted') > self._deleted_offset:
+            with open(self._file('deleted')) as handle:
+                handle.seek(self._deleted_offset)
+                lines = handle.read()
+            complete = lines[:lines.rfind('\n') + 1]
+            for line in complete.splitlines(keepends=True):
+                row = int(line)
+                if row >= self._rows:
+                    # Appended after the rows were sampled: read this deletion again next time
+                    break
+                self._deleted_offset += len(line.encode('utf-8'))
+                self._valid[row] = False
+                if self._row_of.get(self._keys[row]) == row:
+                    del self._row_of[self._keys[row]]
+
+        if self.use_ann:
+            self._sync_ann()
+
+    def _sync_ann(self):
+        try:
+            import hnswlib
+        except ImportError:
+            self.use_ann = False
+            return
+        if self._ann is None:
+            self._ann = hnswlib.Index(space='ip', dim=self.dim)
+            self._ann.init_index(max_elements=max(self._rows, 1024), ef_construction=200, M=16)
+            self._ann_rows = 0
+            self._ann_deleted = set()
+        if self._rows > self._ann_rows:
+            if self._rows > self._ann.get_max_elements():
+                self._ann.resize_index(max(self._rows, self._ann.get_max_elements() * 2))
+            labels = np.arange(self._ann_rows, self._rows)
+            self._ann.add_items(self._vectors(self._ann_rows, self._rows), labels)
+            self._ann_rows = self._rows
+        for row in np.flatnonzero(~self._valid):
+            if row not in self._ann_deleted:
+                self._ann.mark_deleted(int(row))
+                self._ann_deleted.add(row)
+
+    def _vectors(self, start, stop):
+        block = np.asarray(self._matrix[start:stop], dtype=np.float32)
+        if self.dtype == 'int8':
+            block *= self._scales[start:stop, None]
+        return block
+
+    def __len__(self):
+        with self._lock:
+            self._refresh()
+            return int(self._valid.sum())
+
+    def get(self, key):
+        """The stored (dequantized) vector of a key, or None"""
+        with self._lock:
+            self._refresh()
+            row = self._row_of.get(key)
+            return None if row is None else self._vectors(row, row + 1)[0]
+
+    def search(self, vector, k=10):
+        """Top-k (key, cosine similarity) pairs, most similar first"""
+        query = normalize(vector)[0]
+        with self._lock:
+            self._refresh()
+            rows, valid, keys = self._rows, self._valid, self._keys
+
+            if self.use_ann and self._ann is not None:
+                count = min(k, int(valid.sum()))
+                if not count:
+                    return []
+                self._ann.set_ef(max(count * 2, 50))
+                labels, distances = self._ann.knn_query(query, k=count)
+                return [(keys[row], float(1 - distance)) for row, distance in zip(labels[0], distances[0])]
+
+            scores = np.empty(rows, dtype=np.float32)
+            for start in range(0, rows, self.chunk_rows):
+                stop = min(start + self.chunk_rows, rows)
+                block = np.asarray(self._matrix[start:stop], dtype=np.float32)
+                scores[start:stop] = block @ query
+                if self.dtype == 'int8':
+                    scores[start:stop] *= self._scales[start:stop]
+
+        scores[~valid] = -np.inf
+        count = min(k, int(valid.sum()))
+        if not count:
+            return []
+        top = np.argpartition(-scores, count - 1)[:count]
+        top = top[np.argsort(-scores[top])]
+        return [(keys[row], float(scores[row])) for row in top]
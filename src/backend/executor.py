@@ -0,0 +1,365 @@
+"""
+Analysis executors - where queued resume analyses run
+CeleryExecutor sends jobs to the broker. ProcessPoolAnalysisExecutor runs them on a
+local process pool with one ATSProcessor per worker, so a single node can use every
+core without Redis or Celery; job status is then kept in a shared in-memory store.
+Both split work into interactive and bulk queues (see scheduler.py).
+"""
+
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from analysis_tasks import (ProgressReporter, build_processor, complete_analysis, run_resume_analysis,
+                            run_batch_analysis, write_export)
+from metrics import MemorySink
+from rescoring import rescore_profile
+from scheduler import INTERACTIVE, BULK, BrokerScheduler, QueueMetrics, SlotScheduler, fair_share_key
+
+# Finished single-job statuses kept by the process pool executor
+MAX_TRACKED_JOBS = 10000
+
+# Per-process state of a pool worker, set by _init_worker
+_worker = {}
+
+
+def _init_worker(settings, store, workers):
+    """Pool initializer: build this worker's processor (models load on first use unless preloaded)"""
+    redis_client = None
+    if settings.get('REDIS_URL'):
+        try:
+            import redis
+            redis_client = redis.Redis.from_url(settings['REDIS_URL'], decode_responses=True)
+            redis_client.ping()
+        except Exception as e:
+            print(f"❌ Worker Redis connection failed: {e}")
+            redis_client = None
+
+    # Split the cores between workers instead of every worker using all of them
+    settings = dict(settings, PDF_WORKERS=1)
+    if not settings.get('TORCH_THREADS'):
+        settings['TORCH_THREADS'] = max(1, (os.cpu_count() or 1) // workers)
+
+    # Stage timings and profiles go back to the API process with each result
+    processor = build_processor(settings, redis_client, buffer_metrics=True)
+    if settings.get('PRELOAD_MODELS'):
+        processor.models.warm_up(freeze=False)
+
+    _worker.update(processor=processor, redis_client=redis_client, store=store)
+
+
+def _ping():
+    return os.getpid()
+
+
+def _with_metrics(result, profile_key=None):
+    """Attach the stage timings (and cProfile report) this worker buffered during the task"""
+    instrumentation = _worker['processor'].instrumentation
+    result['metrics'] = instrumentation.drain()
+    if profile_key is not None:
+        result['profileReport'] = (profile_key, instrumentation.get_profile(profile_key))
+    return result
+
+
+def _run_resume(job_id, args):
+    reporter = ProgressReporter(job_id, _worker['redis_client'], store=_worker['store'])
+    resume_id, profile = args[0], args[4]
+    return _with_metrics(run_resume_analysis(_worker['processor'], reporter, *args),
+                         resume_id if profile else None)
+
+
+def _run_completion(resume_id, file_path, job_profile_id, content_hash):
+    return _with_metrics(complete_analysis(_worker['processor'], resume_id, file_path, job_profile_id,
+                                           content_hash))
+
+
+def _run_batch(job_id, items, job_profile_id, batch_id):
+    reporter = ProgressReporter(job_id, store=_worker['store'])
+    return _with_metrics(run_batch_analysis(_worker['processor'], reporter, items, job_profile_id, batch_id,
+                                            _worker['redis_client']))
+
+
+def _run_export(job_id, format_type, filters, export_folder):
+    store = _worker['store']
+    store[job_id] = {'status': 'processing'}
+    try:
+        store[job_id] = write_export(format_type, filters, job_id, export_folder)
+    except Exception as e:
+        store[job_id] = {'status': 'failed', 'error': str(e)}
+
+
+def _run_rescore(job_id, job_profile_id):
+    return rescore_profile(_worker['processor'], job_profile_id, job_id, redis_client=_worker['redis_client'])
+
+
+class CeleryExecutor:
+    name = 'celery'
+
+    def __init__(self, resume_task, batch_task, rescore_task, completion_task, export_task, scheduler=None,
+                 fair_share='batch'):
+        self.resume_task = resume_task
+        self.batch_task = batch_task
+        self.rescore_task = rescore_task
+        self.completion_task = completion_task
+        self.export_task = export_task
+        self.scheduler = scheduler or BrokerScheduler()
+        self.fair_share = fair_share
+
+    def submit_resume(self, resume_id, file_path, job_profile_id=None, content_hash=None, profile=False,
+                      deadline=None):
+        """Queue one resume on the interactive queue; returns the job id"""
+        args = (resume_id, file_path, job_profile_id, content_hash, profile, time.time(), deadline)
+        return self.resume_task.apply_async(args, queue=INTERACTIVE).id
+
+    def submit_completion(self, resume_id, file_path, job_profile_id=None, content_hash=None):
+        """Queue the full analysis of a resume whose analysis was cut short by its deadline"""
+        args = (resume_id, file_path, job_profile_id, content_hash, time.time())
+        self.completion_task.apply_async(args, queue=BULK)
+
+    def submit_batch(self, items, job_profile_id=None, batch_id=None):
+        """Queue a chunk of (resume_id, file_path, content_hash) items on the bulk queue"""
+        return self.batch_task.apply_async((items, job_profile_id, batch_id, time.time()), queue=BULK).id
+
+    def submit_batches(self, chunks, job_profile_id=None, batch_id=None):
+        """Queue a batch's chunks for fair-share release onto the bulk queue
+
+        Without Redis they are published at once, as one Celery group.
+        """
+        queued_at = time.time()
+        if self.scheduler.fair:
+            key = fair_share_key(self.fair_share, batch_id, job_profile_id)
+            self.scheduler.hold(key, [[items, job_profile_id, batch_id, queued_at] for items in chunks])
+            self.release_bulk()
+            return
+
+        from celery import group
+        group(self.batch_task.signature((items, job_profile_id, batch_id, queued_at), queue=BULK)
+              for items in chunks).apply_async()
+
+    def release_bulk(self):
+        """Move held chunks onto the broker's bulk queue while it is short"""
+        if self.scheduler.fair:
+            self.scheduler.release(lambda chunk: self.batch_task.apply_async(chunk, queue=BULK))
+
+    def task_started(self, queue, queued_at=None):
+        """Called by a task as it starts: records its wait, and a bulk task makes room for the next chunk"""
+        self.scheduler.task_started(queue, queued_at)
+        if queue == BULK:
+            self.release_bulk()
+
+    def queue_stats(self):
+        stats = self.scheduler.stats()
+        if self.scheduler.metrics:
+            for queue, summary in self.scheduler.metrics.waits().items():
+                stats[queue]['wait'] = summary
+        return stats
+
+    def submit_rescore(self, job_id, job_profile_id):
+        """Queue a rescoring job registered with rescoring.start_rescore"""
+        self.rescore_task.apply_async((job_id, job_profile_id), queue=BULK)
+
+    def submit_export(self, format_type, filters):
+        """Queue an Excel / PDF export; returns the export id"""
+        return self.export_task.delay(format_type, filters).id
+
+    def get_export(self, export_id):
+        """{'status': queued / processing / completed (with 'file_path') / failed (with 'error')}"""
+        task = self.export_task.AsyncResult(export_id)
+        if task.state == 'SUCCESS':
+            return task.result
+        if task.state == 'FAILURE':
+            return {'status': 'failed', 'error': str(task.info)}
+        return {'status': 'queued' if task.state == 'PENDING' else 'processing'}
+
+    def get_status(self, job_id):
+        """Status of a single resume job from the Celery result backend"""
+        task = self.resume_task.AsyncResult(job_id)
+
+        if task.state == 'PENDING':
+            return {
+                'status': 'queued',
+                'progress': 0,
+                'message': 'Analysis queued and waiting to start'
+            }
+        elif task.state == 'PROGRESS':
+            info = task.info or {}
+            return {
+                'status': 'processing',
+                'progress': info.get('progress', 0),
+                'message': info.get('message', 'Processing...')
+            }
+        elif task.state == 'SUCCESS':
+            return {
+                'status': 'completed',
+                'progress': 100,
+                'message': 'Analysis completed successfully'
+            }
+        elif task.state == 'FAILURE':
+            info = task.info or {}
+            return {
+                'status': 'failed',
+                'error': str(info.get('error', 'Unknown error')),
+                'message': info.get('message', 'Analysis failed')
+            }
+
+        return {
+            'status': 'unknown',
+            'message': 'Job status could not be determined'
+        }
+
+
+class ProcessPoolAnalysisExecutor:
+    name = 'process'
+
+    def __init__(self, settings, workers=None, interactive_workers=None, bulk_workers=None, fair_share='batch',
+                 instrumentation=None):
+        self.workers = workers or os.cpu_count() or 1
+        # Worker timings and profiles are recorded here, in the API process (see _record_metrics)
+        self.instrumentation = instrumentation
+        # Manager dict: written by pool workers, read by the API process
+        self._manager = multiprocessing.Manager()
+        self.store = self._manager.dict()
+        self.settings = dict(settings)
+        self._pool = self._new_pool()
+        self._futures = {}
+        self._lock = threading.Lock()
+        # Jobs wait in the scheduler until a worker is free, interactive ones first
+        self.fair_share = fair_share
+        self.metrics = QueueMetrics(MemorySink())
+        self.scheduler = SlotScheduler(self._submit, self.workers, interactive_workers, bulk_workers, self.metrics)
+
+    def _new_pool(self):
+        return ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                   initargs=(self.settings, self.store, self.workers))
+
+    def _submit(self, fn, *args):
+        try:
+            return self._pool.submit(fn, *args)
+        except BrokenProcessPool:
+            # A worker died earlier; its jobs were marked failed, start a fresh pool
+            print("❌ Analysis process pool was broken; restarting it")
+            self._pool = self._new_pool()
+            return self._pool.submit(fn, *args)
+
+    def start(self):
+        """Start every worker now instead of on the first submitted job"""
+        wait([self._submit(_ping) for _ in range(self.workers)])
+
+    def _track(self, job_id, future):
+        with self._lock:
+            self._futures[job_id] = future
+        future.add_done_callback(lambda done: self._finished(job_id, done))
+        future.add_done_callback(self._record_metrics)
+
+    def _record_metrics(self, future):
+        if self.instrumentation is None or future.exception() is not None:
+            return
+        result = future.result()
+        if not isinstance(result, dict):
+            return
+        if result.get('metrics'):
+            self.instrumentation.record(result['metrics'])
+        key, report = result.get('profileReport') or (None, None)
+        if report:
+            self.instrumentation.save_profile(key, report)
+
+    def _finished(self, job_id, future):
+        with self._lock:
+            self._futures.pop(job_id, None)
+        if future.exception() is not None:
+            # The worker itself died (e.g. killed by the OOM killer) before reporting
+            error = future.exception()
+            self.store[job_id] = {'status': 'failed', 'error': str(error),
+                                  'message': f'Analysis failed: {str(error)}'}
+
+    def _trim(self):
+        overflow = len(self.store) - MAX_TRACKED_JOBS
+        if overflow > 0:
+            for job_id in self.store.keys()[:overflow]:
+                self.store.pop(job_id, None)
+
+    def submit_resume(self, resume_id, file_path, job_profile_id=None, content_hash=None, profile=False,
+                      deadline=None):
+        """Queue one resume on the interactive queue; returns the job id
+
+        A partial result (deadline reached) queues its completion on the bulk queue.
+        """
+        job_id = str(uuid.uuid4())
+        self._trim()
+        self.store[job_id] = {'status': 'queued', 'progress': 0, 'message': 'Analysis queued and waiting to start'}
+        args = (resume_id, file_path, job_profile_id, content_hash, profile, deadline)
+        future = self.scheduler.submit(INTERACTIVE, _run_resume, job_id, args)
+        self._track(job_id, future)
+        future.add_done_callback(lambda done: self._complete_partial(done, *args[:4]))
+        return job_id
+
+    def _complete_partial(self, future, resume_id, file_path, job_profile_id, content_hash):
+        if future.exception() is None and future.result().get('partial'):
+            self.submit_completion(resume_id, file_path, job_profile_id, content_hash)
+
+    def submit_completion(self, resume_id, file_path, job_profile_id=None, content_hash=None):
+        """Queue the full analysis of a resume whose analysis was cut short by its deadline"""
+        # Completions share one fair-share key, so they take turns with batches instead of overtaking them
+        future = self.scheduler.submit(BULK, _run_completion, resume_id, file_path, job_profile_id, content_hash,
+                                       key='completion')
+        future.add_done_callback(self._record_metrics)
+
+    def submit_batch(self, items, job_profile_id=None, batch_id=None):
+        """Queue a chunk of (resume_id, file_path, content_hash) items on the bulk queue"""
+        job_id = str(uuid.uuid4())
+        self._trim()
+        key = fair_share_key(self.fair_share, batch_id, job_profile_id)
+        self._track(job_id, self.scheduler.submit(BULK, _run_batch, job_id, items, job_profile_id, batch_id, key=key))
+        return job_id
+
+    def submit_batches(self, chunks, job_profile_id=None, batch_id=None):
+        return [self.submit_batch(items, job_profile_id, batch_id) for items in chunks]
+
+    def submit_rescore(self, job_id, job_profile_id):
+        """Queue a rescoring job registered with rescoring.start_rescore (progress lives in analysis_jobs)"""
+        self._track(job_id, self.scheduler.submit(BULK, _run_rescore, job_id, job_profile_id,
+                                                  key=f'rescore:{job_profile_id}'))
+
+    def submit_export(self, format_type, filters):
+        """Queue an Excel / PDF export on the bulk queue; returns the export id"""
+        export_id = str(uuid.uuid4())
+        self._trim()
+        self.store[export_id] = {'status': 'queued'}
+        export_folder = self.settings.get('EXPORT_FOLDER', 'exports')
+        self._track(export_id, self.scheduler.submit(BULK, _run_export, export_id, format_type, filters, export_folder,
+                                                     key='export'))
+        return export_id
+
+    def get_export(self, export_id):
+        """Same shape as CeleryExecutor.get_export; None for an unknown export id"""
+        status = self.store.get(export_id)
+        return dict(status) if status is not None else None
+
+    def queue_stats(self):
+        stats = self.scheduler.stats()
+        for queue, summary in self.metrics.waits().items():
+            stats[queue]['wait'] = summary
+        return stats
+
+    def get_status(self, job_id):
+        status = self.store.get(job_id)
+        if status is None:
+            return {
+                'status': 'unknown',
+                'message': 'Job status could not be determined'
+            }
+        return dict(status)
+
+    def join(self, job_ids, timeout=None):
+        """Wait for the given jobs to finish (scripts and benchmarks)"""
+        with self._lock:
+            futures = [self._futures[job_id] for job_id in job_ids if job_id in self._futures]
+        wait(futures, timeout)
+
+    def shutdown(self, wait=True):
+        self._pool.shutdown(wait=wait)
+        self._manager.shutdown()
@@ -0,0 +1,84 @@
+"""
+Export writers for analysis results
+CSV / NDJSON are streamed row by row; Excel / PDF are written to a file by a background task
+"""
+
+import csv
+import io
+import json
+from datetime import datetime
+
+from database import EXPORT_FIELDS
+
+
+def stream_csv(rows):
+    """Yield CSV text one row at a time"""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+
+    writer.writeheader()
+    yield buffer.getvalue()
+
+    for row in rows:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerow(row)
+        yield buffer.getvalue()
+
+
+def stream_ndjson(rows):
+    """Yield one JSON document per line"""
+    for row in rows:
+        yield json.dumps(row) + '\n'
+
+
+def write_excel(rows, file_path):
+    """Write rows to an .xlsx file with openpyxl's constant-memory write-only mode"""
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('ATS Analysis')
+    sheet.append(EXPORT_FIELDS)
+    for row in rows:
+        sheet.append([row[field] for field in EXPORT_FIELDS])
+    workbook.save(file_path)
+
+
+def write_pdf(rows, file_path):
+    """Write a simple PDF report, page by page"""
+    from reportlab.pdfgen import canvas
+
+    p = canvas.Canvas(file_path)
+
+    # Simple PDF generation
+    y = 800
+    p.drawString(100, y, "ATS Analysis Report")
+    p.drawString(100, y-20, f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    y -= 60
+
+    for item in rows:
+        if y < 100:
+            p.showPage()
+            y = 800
+
+        p.drawString(100, y, f"File: {item['filename']}")
+        y -= 20
+        p.drawString(120, y, f"Overall Score: {item['overall_score']}%")
+        y -= 20
+        p.drawString(120, y, f"Job Match: {item['job_match']}%")
+        y -= 20
+        p.drawString(120, y, f"Top Skills: {item['detected_skills'][:60]}...")
+        y -= 40
+
+    p.save()
+
+
+STREAM_FORMATS = {
+    'csv': (stream_csv, 'text/csv', 'ats_analysis.csv'),
+    'ndjson': (stream_ndjson, 'application/x-ndjson', 'ats_analysis.ndjson')
+}
+
+FILE_FORMATS = {
+    'excel': (write_excel, 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', 'xlsx'),
+    'pdf': (write_pdf, 'application/pdf', 'pdf')
+}
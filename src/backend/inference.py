@@ -0,0 +1,209 @@
+"""
+Inference backends - how the MiniLM sentence embedding behind KeyBERT runs on CPU
+'torch' is the fp32 SentenceTransformer, 'torch-int8' the same model with its
+Linear layers dynamically quantized to int8, and 'onnx' / 'onnx-int8' the
+transformer exported once to ONNX (optionally int8-quantized) and run with ONNX
+Runtime, with tokenization, mean pooling and normalization outside the graph.
+Every backend exposes SentenceTransformer's encode(); intra-op threads are set
+per worker process.
+"""
+
+import json
+import os
+import shutil
+
+BACKENDS = ('torch', 'torch-int8', 'onnx', 'onnx-int8')
+DEFAULT_ONNX_DIR = os.path.join('models', 'onnx')
+
+ONNX_MODEL = 'model.onnx'
+ONNX_INT8_MODEL = 'model-int8.onnx'
+ONNX_SETTINGS = 'encoder.json'
+
+
+def set_torch_threads(threads):
+    """Intra-op threads for torch in this process; inter-op work stays on one thread"""
+    import torch
+    torch.set_num_threads(threads)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        # Only settable before the first inter-op parallel work in the process
+        pass
+
+
+def set_threads(model, threads):
+    """Apply a worker's intra-op thread count to a loaded encoder"""
+    if hasattr(model, 'set_threads'):
+        model.set_threads(threads)
+    else:
+        set_torch_threads(threads)
+
+
+def load_encoder(backend, model_name, threads=None, onnx_dir=DEFAULT_ONNX_DIR):
+    """Load model_name with one of BACKENDS"""
+    if backend in ('torch', 'torch-int8'):
+        return _load_torch(model_name, threads, quantize=backend == 'torch-int8')
+    if backend in ('onnx', 'onnx-int8'):
+        directory = onnx_export_dir(onnx_dir, model_name)
+        if not os.path.exists(os.path.join(directory, ONNX_SETTINGS)):
+            export_onnx(model_name, directory)
+        model_path = os.path.join(directory, ONNX_MODEL)
+        if backend == 'onnx-int8':
+            model_path = quantize_onnx(directory)
+        return OnnxEncoder(directory, model_path, threads)
+    raise ValueError(f"Unknown inference backend: {backend}")
+
+
+def keybert_model(model):
+    """The encoder as KeyBERT takes it: SentenceTransformers directly, other encoders wrapped"""
+    if 'sentence_transformers' in str(type(model)):
+        return model
+
+    from keybert.backend import BaseEmbedder
+
+    class EncoderBackend(BaseEmbedder):
+        def __init__(self, encoder):
+            super().__init__()
+            self.embedding_model = encoder
+
+        def embed(self, documents, verbose=False):
+            return self.embedding_model.encode(documents)
+
+    return EncoderBackend(model)
+
+
+def _load_torch(model_name, threads, quantize=False):
+    from sentence_transformers import SentenceTransformer
+    if threads:
+        set_torch_threads(threads)
+    if not quantize:
+        return SentenceTransformer(model_name)
+
+    import torch
+    # Dynamic quantization: int8 weights, activations quantized on the fly (CPU only)
+    model = SentenceTransformer(model_name, device='cpu')
+    torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+    return model
+
+
+def onnx_export_dir(onnx_dir, model_name):
+    return os.path.join(onnx_dir, model_name.replace('/', '--'))
+
+
+def export_onnx(model_name, directory, opset=14):
+    """Export a sentence-transformers model's transformer, tokenizer and pooling settings to directory
+
+    Several processes may export at once; each writes a private directory and
+    the first rename wins.
+    """
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    model = SentenceTransformer(model_name, device='cpu')
+    transformer, pooling = model[0], model[1]
+    if not getattr(pooling, 'pooling_mode_mean_tokens', False):
+        raise ValueError(f"ONNX backend supports mean pooling only: {model_name}")
+
+    print(f"🧠 Exporting {model_name} to ONNX: {directory}")
+    staging = f"{directory}.tmp{os.getpid()}"
+    os.makedirs(staging, exist_ok=True)
+    sample = transformer.tokenizer(['Senior Python developer'], return_tensors='pt')
+    input_names = [name for name in ('input_ids', 'attention_mask', 'token_type_ids') if name in sample]
+    dynamic_axes = {name: {0: 'batch', 1: 'sequence'} for name in input_names + ['last_hidden_state']}
+    with torch.no_grad():
+        torch.onnx.export(transformer.auto_model, tuple(sample[name] for name in input_names),
+                          os.path.join(staging, ONNX_MODEL), input_names=input_names,
+                          output_names=['last_hidden_state'], dynamic_axes=dynamic_axes,
+                          opset_version=opset, do_constant_folding=True)
+    transformer.tokenizer.save_pretrained(staging)
+    with open(os.path.join(staging, ONNX_SETTINGS), 'w') as fh:
+        json.dump({
+            'model': model_name,
+            'max_seq_length': transformer.max_seq_length,
+            'dimension': model.get_sentence_embedding_dimension(),
+            'normalize': any(type(module).__name__ == 'Normalize' for module in model)
+        }, fh)
+
+    try:
+        os.rename(staging, directory)
+    except OSError:
+        shutil.rmtree(staging, ignore_errors=True)
+    return directory
+
+
+def quantize_onnx(directory):
+    """Path of the int8 (dynamically quantized) copy of an exported model, created on first use"""
+    path = os.path.join(directory, ONNX_INT8_MODEL)
+    if not os.path.exists(path):
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        staging = f"{path}.tmp{os.getpid()}"
+        quantize_dynamic(os.path.join(directory, ONNX_MODEL), staging, weight_type=QuantType.QInt8)
+        os.replace(staging, path)
+    return path
+
+
+class OnnxEncoder:
+    """Mean-pooled sentence embeddings from an exported transformer on ONNX Runtime"""
+
+    def __init__(self, directory, model_path, threads=None):
+        from transformers import AutoTokenizer
+
+        with open(os.path.join(directory, ONNX_SETTINGS)) as fh:
+            settings = json.load(fh)
+        self.model_path = model_path
+        self.max_seq_length = settings['max_seq_length']
+        self.dimension = settings['dimension']
+        self.normalize = settings['normalize']
+        self.tokenizer = AutoTokenizer.from_pretrained(directory)
+        self.threads = threads
+        self._session = None
+        self._pid = None
+
+    def set_threads(self, threads):
+        if threads != self.threads:
+            self.threads = threads
+            self._session = None
+
+    @property
+    def session(self):
+        # One session per process: ONNX Runtime's thread pools do not survive fork
+        if self._session is None or self._pid != os.getpid():
+            import onnxruntime
+            options = onnxruntime.SessionOptions()
+            options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+            options.execution_mode = onnxruntime.ExecutionMode.ORT_SEQUENTIAL
+            options.inter_op_num_threads = 1
+            if self.threads:
+                options.intra_op_num_threads = self.threads
+            self._session = onnxruntime.InferenceSession(self.model_path, options,
+                                                         providers=['CPUExecutionProvider'])
+            self._inputs = [node.name for node in self._session.get_inputs()]
+            self._pid = os.getpid()
+        return self._session
+
+    def get_sentence_embedding_dimension(self):
+        return self.dimension
+
+    def encode(self, sentences, batch_size=32, normalize_embeddings=False, **kwargs):
+        """SentenceTransformer.encode for the arguments the processor and KeyBERT use"""
+        import numpy as np
+
+        single = isinstance(sentences, str)
+        if single:
+            sentences = [sentences]
+        session = self.session
+        embeddings = np.zeros((len(sentences), self.dimension), dtype=np.float32)
+        # Longest first, so each mini-batch pads to similar lengths
+        order = sorted(range(len(sentences)), key=lambda index: -len(sentences[index]))
+        for start in range(0, len(order), batch_size):
+            indexes = order[start:start + batch_size]
+            batch = self.tokenizer([sentences[index] for index in indexes], padding=True, truncation=True,
+                                   max_length=self.max_seq_length, return_tensors='np')
+            feeds = {name: batch[name].astype(np.int64) for name in self._inputs}
+            hidden = session.run(['last_hidden_state'], feeds)[0]
+            mask = batch['attention_mask'][..., None].astype(np.float32)
+            embeddings[indexes] = (hidden * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+
+        if self.normalize or normalize_embeddings:
+            embeddings /= np.maximum(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12)
+        return embeddings[0] if single else embeddings
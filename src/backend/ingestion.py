@@ -0,0 +1,167 @@
+"""
+Upload ingestion - multipart uploads streamed to disk, hashed and registered in bulk
+File parts are decoded straight off the request stream and written to the file
+store's temp folder in fixed-size chunks while their SHA-256 is computed, so a
+file is never spooled twice or read back for hashing. Exact duplicates (within
+the upload, or already analyzed for the same job profile) are dropped before
+anything is queued; the new resumes are inserted in one executemany transaction
+that also moves their files to their content-addressed locations (storage.py).
+"""
+
+import hashlib
+import os
+import uuid
+from itertools import chain
+
+from werkzeug.sansio.multipart import MultipartDecoder, Data, Epilogue, Field, File, NeedData
+from werkzeug.utils import secure_filename
+
+from database import add_resumes, find_analyzed_resumes
+
+# Bytes read from the request stream per step
+CHUNK_SIZE = 64 * 1024
+# Text fields (jobProfileId, profile) are tiny; anything larger is rejected
+MAX_FIELD_SIZE = 64 * 1024
+MAX_PARTS = 2000
+
+
+class Upload:
+    """One file part written to a temp file of the file store
+
+    file_path is its store location, known once the part is complete.
+    """
+
+    def __init__(self, filename, store, resume_id):
+        self.filename = filename
+        self.resume_id = resume_id
+        self.file_path = None
+        self.size = 0
+        self._store = store
+        self._digest = hashlib.sha256()
+        self._temp_path = store.temp_path()
+        self._file = open(self._temp_path, 'wb')
+
+    def write(self, data):
+        self._digest.update(data)
+        self._file.write(data)
+        self.size += len(data)
+
+    def close(self):
+        self._file.close()
+        self.content_hash = self._digest.hexdigest()
+        self.file_path = self._store.location(self.content_hash, os.path.splitext(self.filename)[1].lower())
+
+    def save(self):
+        """Move the file to its store location"""
+        self._store.put(self._temp_path, self.file_path)
+
+    def discard(self):
+        self._file.close()
+        if os.path.exists(self._temp_path):
+            os.remove(self._temp_path)
+
+
+class _Field:
+    def __init__(self, name):
+        self.name = name
+        self.chunks = []
+        self.size = 0
+
+    def write(self, data):
+        self.size += len(data)
+        if self.size > MAX_FIELD_SIZE:
+            raise ValueError(f'Form field {self.name} is too large')
+        self.chunks.append(data)
+
+
+class _Skipped:
+    """A file part that is read past without being stored"""
+
+    def write(self, data):
+        pass
+
+
+def receive_uploads(stream, boundary, store, file_field, allowed_file, max_files=None, chunk_size=CHUNK_SIZE):
+    """Decode a multipart/form-data body, streaming the file_field parts into temp files of store
+
+    Returns (fields, uploads, skipped): text fields by name, the saved Uploads in
+    body order, and the filenames of file_field parts that were not saved (empty
+    or disallowed names, or past max_files). Parts of other file fields are ignored.
+    """
+    decoder = MultipartDecoder(boundary.encode('latin-1'), max_parts=MAX_PARTS)
+    fields, uploads, skipped = {}, [], []
+    part = None
+
+    try:
+        for data in chain(iter(lambda: stream.read(chunk_size), b''), [None]):
+            decoder.receive_data(data)
+            event = decoder.next_event()
+            while not isinstance(event, (Epilogue, NeedData)):
+                if isinstance(event, Field):
+                    part = _Field(event.name)
+                elif isinstance(event, File):
+                    part = _Skipped()
+                    if event.name == file_field:
+                        if event.filename and allowed_file(event.filename) and \
+                                (max_files is None or len(uploads) < max_files):
+                            resume_id = str(uuid.uuid4())
+                            filename = secure_filename(event.filename)
+                            part = Upload(filename, store, resume_id)
+                        else:
+                            skipped.append(event.filename)
+                elif isinstance(event, Data):
+                    part.write(event.data)
+                    if not event.more_data:
+                        if isinstance(part, _Field):
+                            fields[part.name] = b''.join(part.chunks).decode('utf-8', 'replace')
+                        elif isinstance(part, Upload):
+                            part.close()
+                            uploads.append(part)
+                        part = None
+                event = decoder.next_event()
+
+        if part is not None:
+            raise ValueError('Upload ended in the middle of a part')
+    except Exception:
+        if isinstance(part, Upload):
+            part.discard()
+        for upload in uploads:
+            upload.discard()
+        raise
+
+    return fields, uploads, skipped
+
+
+def register_uploads(uploads, job_profile_id=None):
+    """Drop exact duplicates and insert the remaining resumes as 'processing'
+
+    A file duplicates an earlier part of the same upload, or a resume already
+    analyzed for the same job profile (in-flight ones are not matched, so a
+    failed analysis never swallows its re-upload). Returns (new uploads,
+    [(duplicate upload, resume_id it duplicates)]); new files are moved into
+    the store and duplicate ones deleted.
+    """
+    existing = find_analyzed_resumes({upload.content_hash for upload in uploads}, job_profile_id)
+
+    new, duplicates = [], []
+    for upload in uploads:
+        original = existing.get(upload.content_hash)
+        if original is not None:
+            upload.discard()
+            duplicates.append((upload, original))
+            continue
+        existing[upload.content_hash] = upload.resume_id
+        new.append(upload)
+
+    def place_files():
+        for upload in new:
+            upload.save()
+
+    try:
+        add_resumes([(upload.resume_id, upload.filename, upload.file_path, 'processing', job_profile_id,
+                      upload.content_hash) for upload in new], place_files)
+    except Exception:
+        for upload in new:
+            upload.discard()
+        raise
+    return new, duplicates
@@ -0,0 +1,96 @@
+"""
+Batch job tracking - O(1) progress counters for batch analysis jobs
+Workers increment completed/failed counters (Redis hash + analysis_jobs row) as
+resumes finish, so a status check is a single read instead of one per task
+"""
+
+from database import create_analysis_job, increment_job_progress, get_analysis_job
+from progress_events import publish_progress
+
+BATCH_TTL = 24 * 3600
+
+
+def _progress_key(job_id):
+    return f"batch:{job_id}:progress"
+
+
+def start_batch(redis_client, job_id, total):
+    """Register a batch before its tasks are queued"""
+    create_analysis_job(job_id, total)
+
+    if redis_client:
+        key = _progress_key(job_id)
+        pipe = redis_client.pipeline()
+        pipe.hset(key, mapping={'total': total, 'completed': 0, 'failed': 0})
+        pipe.expire(key, BATCH_TTL)
+        pipe.execute()
+        publish_progress(redis_client, job_id, describe_progress({'total': total, 'completed': 0, 'failed': 0}))
+
+
+def record_results(redis_client, job_id, completed=0, failed=0):
+    """Count finished resumes for a batch; safe to call concurrently from many workers"""
+    if not job_id or not (completed or failed):
+        return
+
+    increment_job_progress(job_id, completed, failed)
+
+    if redis_client:
+        key = _progress_key(job_id)
+        pipe = redis_client.pipeline()
+        pipe.hincrby(key, 'completed', completed)
+        pipe.hincrby(key, 'failed', failed)
+        pipe.hget(key, 'total')
+        completed_total, failed_total, total = pipe.execute()
+        publish_progress(redis_client, job_id, describe_progress({
+            'total': int(total or 0), 'completed': completed_total, 'failed': failed_total
+        }))
+
+
+def get_batch_progress(redis_client, job_id):
+    """Return {'total', 'completed', 'failed'} for a batch, or None if job_id is not a batch"""
+    if redis_client:
+        counters = redis_client.hgetall(_progress_key(job_id))
+        if counters:
+            return {name: int(counters.get(name, 0)) for name in ('total', 'completed', 'failed')}
+
+    # Redis unavailable or key expired: the analysis_jobs row holds the same counters
+    job = get_analysis_job(job_id)
+    if job:
+        progress = {'total': job['total'], 'completed': job['completed'], 'failed': job['failed']}
+        if job['rows_per_second'] is not None:
+            progress['rowsPerSecond'] = job['rows_per_second']
+        return progress
+    return None
+
+
+def describe_progress(progress):
+    """Build the status payload returned by /api/analysis/<job_id>/status"""
+    total = progress['total']
+    completed = progress['completed']
+    failed = progress['failed']
+    finished = completed + failed
+
+    if finished < total:
+        status = 'processing'
+    elif total and completed == 0:
+        status = 'failed'
+    else:
+        status = 'completed'
+
+    message = f'Processed {finished} of {total} resumes'
+    if failed:
+        message += f' ({failed} failed)'
+
+    payload = {
+        'status': status,
+        # A batch with nothing to analyze (e.g. only duplicates) is already done
+        'progress': (finished / total) * 100 if total > 0 else 100,
+        'completed': completed,
+        'failed': failed,
+        'total': total,
+        'message': message
+    }
+    # Rescoring jobs (rescoring.py) also report their throughput
+    if 'rowsPerSecond' in progress:
+        payload['rowsPerSecond'] = round(progress['rowsPerSecond'], 1)
+    return payload
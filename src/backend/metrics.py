@@ -0,0 +1,340 @@
+"""
+Metrics - stage-level timers and latency histograms for the analysis pipeline
+Timings are collected per analysis and emitted once to pluggable sinks (in-memory
+histograms, logging, Redis for multi-process workers). When disabled, every timer
+is a shared no-op object.
+"""
+
+import bisect
+import cProfile
+import io
+import logging
+import pstats
+import threading
+import time
+from collections import OrderedDict
+
+# Log-spaced bucket upper bounds from 50us to ~2min, 25% apart
+BUCKET_BOUNDS = []
+_bound = 0.00005
+while _bound < 120:
+    BUCKET_BOUNDS.append(round(_bound, 7))
+    _bound *= 1.25
+
+PERCENTILES = (0.5, 0.95, 0.99)
+LABEL_NAMES = ('stage', 'file_type', 'pages')
+MAX_PROFILES = 50
+
+logger = logging.getLogger('ats.metrics')
+
+
+def page_bucket(pages):
+    """Group page counts so histogram label cardinality stays small"""
+    if pages is None:
+        return 'unknown'
+    if pages <= 2:
+        return str(max(pages, 1))
+    if pages <= 5:
+        return '3-5'
+    if pages <= 10:
+        return '6-10'
+    return '11+'
+
+
+class Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(BUCKET_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def merge(self, other):
+        for index, value in enumerate(other.counts):
+            self.counts[index] += value
+        self.count += other.count
+        self.sum += other.sum
+
+    def percentile(self, q):
+        """Estimate the q-th quantile, interpolating linearly inside its bucket"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        cumulative = 0
+        for index, value in enumerate(self.counts):
+            if value and cumulative + value >= rank:
+                if index >= len(BUCKET_BOUNDS):
+                    return BUCKET_BOUNDS[-1]
+                lower = BUCKET_BOUNDS[index - 1] if index else 0.0
+                upper = BUCKET_BOUNDS[index]
+                return lower + (upper - lower) * (rank - cumulative) / value
+            cumulative += value
+        return BUCKET_BOUNDS[-1]
+
+    def summary(self):
+        result = {'count': self.count, 'mean_ms': round(self.sum / self.count * 1000, 3) if self.count else 0}
+        for q in PERCENTILES:
+            result[f'p{int(q * 100)}_ms'] = round(self.percentile(q) * 1000, 3)
+        return result
+
+
+class Timings:
+    """Stage durations of one analysis, emitted together once labels (file type, pages) are known"""
+
+    def __init__(self):
+        self.stages = []
+
+    def stage(self, name):
+        return _StageTimer(self, name)
+
+    def add(self, name, seconds):
+        self.stages.append((name, seconds))
+
+
+class _StageTimer:
+    __slots__ = ('timings', 'name', 'start')
+
+    def __init__(self, timings, name):
+        self.timings = timings
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.timings.add(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class _NullTimings:
+    """Shared no-op used when instrumentation is disabled"""
+    stages = ()
+
+    def stage(self, name):
+        return self
+
+    def add(self, name, seconds):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_TIMINGS = _NullTimings()
+
+
+class MemorySink:
+    """In-process histograms keyed by (stage, file_type, pages)"""
+
+    def __init__(self):
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def emit(self, observations):
+        with self._lock:
+            for labels, seconds in observations:
+                histogram = self._histograms.get(labels)
+                if histogram is None:
+                    histogram = self._histograms[labels] = Histogram()
+                histogram.observe(seconds)
+
+    def histograms(self):
+        with self._lock:
+            result = {}
+            for labels, histogram in self._histograms.items():
+                copy = result[labels] = Histogram()
+                copy.merge(histogram)
+            return result
+
+
+class BufferSink:
+    """Holds observations until drained, so a pool worker can hand its timings to the API process"""
+
+    def __init__(self):
+        self._observations = []
+        self._lock = threading.Lock()
+
+    def emit(self, observations):
+        with self._lock:
+            self._observations.extend(observations)
+
+    def drain(self):
+        with self._lock:
+            observations, self._observations = self._observations, []
+            return observations
+
+
+class LoggingSink:
+    """Logs one line per analysis with every stage duration"""
+
+    def emit(self, observations):
+        if observations:
+            _, file_type, pages = observations[0][0]
+            stages = ' '.join(f"{labels[0]}={seconds * 1000:.1f}ms" for labels, seconds in observations)
+            logger.info(f"analysis file_type={file_type} pages={pages} {stages}")
+
+
+class RedisSink:
+    """Histograms shared by the API and all Celery workers through Redis hashes"""
+
+    def __init__(self, client, prefix='metrics'):
+        self.client = client
+        self.prefix = prefix
+
+    def emit(self, observations):
+        pipe = self.client.pipeline(transaction=False)
+        for labels, seconds in observations:
+            key = f"{self.prefix}:hist:{'|'.join(labels)}"
+            pipe.sadd(f"{self.prefix}:keys", key)
+            pipe.hincrby(key, bisect.bisect_left(BUCKET_BOUNDS, seconds), 1)
+            pipe.hincrby(key, 'count', 1)
+            pipe.hincrbyfloat(key, 'sum', seconds)
+        pipe.execute()
+
+    def histograms(self):
+        keys = sorted(self.client.smembers(f"{self.prefix}:keys"))
+        pipe = self.client.pipeline(transaction=False)
+        for key in keys:
+            pipe.hgetall(key)
+
+        result = {}
+        for key, fields in zip(keys, pipe.execute()):
+            if not fields:
+                continue
+            histogram = Histogram()
+            for field, value in fields.items():
+                if field == 'count':
+                    histogram.count = int(value)
+                elif field == 'sum':
+                    histogram.sum = float(value)
+                else:
+                    histogram.counts[int(field)] = int(value)
+            result[tuple(key.split(':hist:', 1)[1].split('|'))] = histogram
+        return result
+
+
+class Instrumentation:
+    def __init__(self, sinks=None, redis_client=None):
+        self.sinks = list(sinks or [])
+        self.enabled = bool(self.sinks)
+        self.redis_client = redis_client
+        self._profiles = OrderedDict()
+
+    def timings(self):
+        """Per-analysis stage recorder (a no-op when disabled)"""
+        return Timings() if self.enabled else NULL_TIMINGS
+
+    def emit(self, timings, file_type='unknown', pages=None):
+        if not self.enabled or not timings.stages:
+            return
+        bucket = page_bucket(pages)
+        self.record([((name, file_type, bucket), seconds) for name, seconds in timings.stages])
+
+    def record(self, observations):
+        """Send labelled observations to every sink (e.g. ones drained from a pool worker)"""
+        for sink in self.sinks:
+            try:
+                sink.emit(observations)
+            except Exception as e:
+                print(f"❌ Metrics sink {type(sink).__name__} failed: {e}")
+
+    def drain(self):
+        """Observations held by BufferSinks since the last drain"""
+        return [observation for sink in self.sinks if isinstance(sink, BufferSink) for observation in sink.drain()]
+
+    def _reader(self):
+        # Prefer the shared Redis view so the API reports what the workers measured
+        readable = [sink for sink in self.sinks if hasattr(sink, 'histograms')]
+        readable.sort(key=lambda sink: not isinstance(sink, RedisSink))
+        return readable[0] if readable else None
+
+    def snapshot(self):
+        """p50/p95/p99 per stage, per stage and file type, and per stage and page count"""
+        reader = self._reader()
+        histograms = reader.histograms() if reader else {}
+        views = {'stage': {}, 'file_type': {}, 'pages': {}}
+
+        for (stage, file_type, pages), histogram in histograms.items():
+            for view, key in (('stage', stage), ('file_type', f'{stage}|{file_type}'), ('pages', f'{stage}|{pages}')):
+                merged = views[view].setdefault(key, Histogram())
+                merged.merge(histogram)
+
+        return {
+            'enabled': self.enabled,
+            'byStage': {key: h.summary() for key, h in sorted(views['stage'].items())},
+            'byFileType': {key: h.summary() for key, h in sorted(views['file_type'].items())},
+            'byPages': {key: h.summary() for key, h in sorted(views['pages'].items())}
+        }
+
+    def prometheus(self):
+        """Histograms in the Prometheus text exposition format"""
+        reader = self._reader()
+        histograms = reader.histograms() if reader else {}
+        lines = [
+            '# HELP ats_stage_seconds Duration of resume analysis stages',
+            '# TYPE ats_stage_seconds histogram'
+        ]
+        for labels, histogram in sorted(histograms.items()):
+            label_text = ','.join(f'{name}="{value}"' for name, value in zip(LABEL_NAMES, labels))
+            cumulative = 0
+            for bound, value in zip(BUCKET_BOUNDS, histogram.counts):
+                cumulative += value
+                lines.append(f'ats_stage_seconds_bucket{{{label_text},le="{bound}"}} {cumulative}')
+            lines.append(f'ats_stage_seconds_bucket{{{label_text},le="+Inf"}} {histogram.count}')
+            lines.append(f'ats_stage_seconds_sum{{{label_text}}} {histogram.sum}')
+            lines.append(f'ats_stage_seconds_count{{{label_text}}} {histogram.count}')
+        return '\n'.join(lines) + '\n'
+
+    def profile(self, func, *args, **kwargs):
+        """Run func under cProfile; returns (result, text report of the top functions)"""
+        profiler = cProfile.Profile()
+        result = profiler.runcall(func, *args, **kwargs)
+        output = io.StringIO()
+        pstats.Stats(profiler, stream=output).sort_stats('cumulative').print_stats(30)
+        return result, output.getvalue()
+
+    def save_profile(self, key, report, ttl=3600):
+        self._profiles[key] = report
+        while len(self._profiles) > MAX_PROFILES:
+            self._profiles.popitem(last=False)
+        if self.redis_client:
+            self.redis_client.set(f"profile:{key}", report, ex=ttl)
+
+    def get_profile(self, key):
+        if self.redis_client:
+            report = self.redis_client.get(f"profile:{key}")
+            if report:
+                return report
+        return self._profiles.get(key)
+
+
+def make_instrumentation(sink_names, redis_client=None, buffered=False):
+    """Build instrumentation from a comma separated list: memory, log, redis ('' disables)
+
+    buffered=True is for process pool workers: observations and profiles stay in
+    the worker and are returned with each task, and the API process records them
+    in its own sinks, so nothing is counted twice.
+    """
+    names = [name.strip() for name in sink_names.split(',') if name.strip()]
+    if buffered:
+        return Instrumentation([BufferSink()] if names else [])
+    sinks = []
+    for name in names:
+        if name == 'memory':
+            sinks.append(MemorySink())
+        elif name == 'log':
+            sinks.append(LoggingSink())
+        elif name == 'redis' and redis_client:
+            sinks.append(RedisSink(redis_client))
+    return Instrumentation(sinks, redis_client)
+
+
+# Disabled by default; app.py installs a configured instance on the processor
+default_instrumentation = Instrumentation()
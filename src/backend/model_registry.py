@@ -0,0 +1,129 @@
+"""
+Model Registry - lazy, shared loading of the NLP models used by the ATS processor
+Each model is loaded the first time a stage asks for it, and KeyBERT reuses the
+same MiniLM sentence-transformer instance as the embedding stage. The embedding
+model runs on a configurable inference backend (see inference.py)
+"""
+
+import gc
+import threading
+import time
+
+from inference import BACKENDS, DEFAULT_ONNX_DIR, keybert_model, load_encoder, set_threads
+
+DEFAULT_SPACY_MODEL = 'en_core_web_sm'
+DEFAULT_EMBEDDING_MODEL = 'sentence-transformers/all-MiniLM-L6-v2'
+
+
+class ModelRegistry:
+    def __init__(self, spacy_model=DEFAULT_SPACY_MODEL, embedding_model=DEFAULT_EMBEDDING_MODEL, torch_threads=None,
+                 backend='torch', onnx_dir=DEFAULT_ONNX_DIR):
+        self.spacy_model = spacy_model
+        self.embedding_model_name = embedding_model
+        self.torch_threads = torch_threads
+        self.backend = backend
+        self.onnx_dir = onnx_dir
+        self._models = {}
+        self._load_times = {}
+        self._background = set()
+        self._lock = threading.RLock()
+        self._loaders = {
+            'nlp': self._load_nlp,
+            'embedding': self._load_embedding,
+            'keybert': self._load_keybert
+        }
+
+    def get(self, name):
+        """Return a model by name, loading it on first use"""
+        model = self._models.get(name)
+        if model is not None or name in self._models:
+            return model
+
+        with self._lock:
+            if name not in self._models:
+                start = time.perf_counter()
+                self._models[name] = self._loaders[name]()
+                self._load_times[name] = round(time.perf_counter() - start, 3)
+                print(f"🧠 Model loaded: {name} ({self._load_times[name]}s)")
+            return self._models[name]
+
+    @property
+    def nlp(self):
+        return self.get('nlp')
+
+    @property
+    def embedding_model(self):
+        return self.get('embedding')
+
+    @property
+    def keybert(self):
+        return self.get('keybert')
+
+    def _load_nlp(self):
+        import spacy
+        try:
+            return spacy.load(self.spacy_model)
+        except OSError:
+            print(f"spaCy model '{self.spacy_model}' not found. Install with: python -m spacy download {self.spacy_model}")
+            return None
+
+    def set_torch_threads(self, threads):
+        """Limit intra-op threads used by embedding inference (torch or ONNX Runtime) in this process"""
+        self.torch_threads = threads
+        if threads and 'embedding' in self._models:
+            set_threads(self._models['embedding'], threads)
+
+    def set_backend(self, backend, onnx_dir=DEFAULT_ONNX_DIR):
+        """Select the inference backend; an embedding model loaded with another one is reloaded on next use"""
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown inference backend: {backend}")
+        with self._lock:
+            if (backend, onnx_dir) != (self.backend, self.onnx_dir):
+                self.backend = backend
+                self.onnx_dir = onnx_dir
+                for name in ('embedding', 'keybert'):
+                    self._models.pop(name, None)
+                    self._load_times.pop(name, None)
+
+    def _load_embedding(self):
+        return load_encoder(self.backend, self.embedding_model_name, self.torch_threads, self.onnx_dir)
+
+    def _load_keybert(self):
+        from keybert import KeyBERT
+        return KeyBERT(model=keybert_model(self.embedding_model))
+
+    def warm_up(self, names=None, freeze=True):
+        """Load models up front, e.g. in the master process before workers fork
+
+        With freeze=True the loaded objects are moved out of the garbage
+        collector's generations so forked children do not dirty (and copy)
+        their pages when the collector runs.
+        """
+        for name in names or self._loaders:
+            self.get(name)
+        if freeze and hasattr(gc, 'freeze'):
+            gc.collect()
+            gc.freeze()
+
+    def load_in_background(self, name):
+        """Start loading a model on a daemon thread, unless it is loaded or loading already"""
+        if name in self._models or name in self._background:
+            return
+        self._background.add(name)
+        threading.Thread(target=self._load_quietly, args=(name,), daemon=True).start()
+
+    def _load_quietly(self, name):
+        try:
+            self.get(name)
+        except Exception as e:
+            print(f"❌ Background model load failed: {name}: {e}")
+        finally:
+            self._background.discard(name)
+
+    def loaded(self):
+        """Names and load times (seconds) of the models loaded in this process"""
+        return dict(self._load_times)
+
+
+# Process-wide registry shared by every ATSProcessor instance
+default_registry = ModelRegistry()
@@ -0,0 +1,152 @@
+"""
+PDF Extraction - single-open, per-page strategy for resume PDFs
+PyMuPDF extracts every page first (fast); pdfplumber's slower layout analysis
+only reruns on pages that look like multi-column / table layouts or that
+PyMuPDF could not read. Large documents are split across a process pool and
+capped at max_pages. Files come in as read-only mapped files from the file
+store: PyMuPDF opens them once from memory and pdfplumber reads the mapping in
+place; pool workers map the file themselves rather than receive a copy.
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import fitz  # PyMuPDF
+import pdfplumber
+
+from storage import MappedFile
+
+# A page with less text than this is re-read with pdfplumber
+MIN_PAGE_CHARS = 20
+
+_executor = None
+_executor_workers = 0
+
+
+def _side_by_side(blocks):
+    """True when two text blocks share a horizontal band without overlapping (columns / tables)"""
+    text_blocks = [block for block in blocks if block[6] == 0 and block[4].strip()]
+    for index, a in enumerate(text_blocks):
+        for b in text_blocks[index + 1:]:
+            overlap = min(a[3], b[3]) - max(a[1], b[1])
+            height = min(a[3] - a[1], b[3] - b[1])
+            if height > 0 and overlap > height * 0.5 and (a[2] < b[0] or b[2] < a[0]):
+                return True
+    return False
+
+
+def _open_pdf(document):
+    # PyMuPDF 1.23 only takes bytes as a stream; this is the one copy of the file
+    return fitz.open(stream=document.getvalue(), filetype='pdf')
+
+
+def _extract_pages(document, doc, start, stop, detect_layout=True):
+    """Extract pages [start, stop) of a mapped file open as doc in PyMuPDF
+
+    Returns (page texts, number of pages re-read with pdfplumber).
+    """
+    texts = []
+    complex_pages = []
+
+    for number in range(start, stop):
+        page = doc[number]
+        text = page.get_text()
+        if len(text.strip()) < MIN_PAGE_CHARS or (detect_layout and _side_by_side(page.get_text('blocks'))):
+            complex_pages.append(number)
+        texts.append(text)
+
+    if complex_pages:
+        try:
+            with pdfplumber.open(document, pages=[number + 1 for number in complex_pages]) as pdf:
+                for number, page in zip(complex_pages, pdf.pages):
+                    page_text = page.extract_text()
+                    # Keep PyMuPDF's text if pdfplumber does no better
+                    if page_text and len(page_text.strip()) >= len(texts[number - start].strip()):
+                        texts[number - start] = page_text
+        except Exception as e:
+            print(f"pdfplumber failed: {e}")
+
+    return texts, len(complex_pages)
+
+
+def _extract_range(file_path, start, stop, detect_layout=True):
+    """_extract_pages in a process pool worker, which maps the file itself"""
+    with MappedFile(file_path) as document, _open_pdf(document) as doc:
+        return _extract_pages(document, doc, start, stop, detect_layout)
+
+
+def _get_executor(workers):
+    global _executor, _executor_workers
+    if _executor is None or _executor_workers != workers:
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+        _executor = ProcessPoolExecutor(max_workers=workers)
+        _executor_workers = workers
+    return _executor
+
+
+class PDFExtractor:
+    def __init__(self, max_pages=30, parallel_min_pages=8, workers=None, detect_layout=True):
+        self.max_pages = max_pages
+        self.parallel_min_pages = parallel_min_pages
+        self.workers = workers or min(4, os.cpu_count() or 1)
+        self.detect_layout = detect_layout
+
+    def _can_fork(self):
+        # Celery prefork children are daemonic and may not start their own pool
+        return self.workers > 1 and not multiprocessing.current_process().daemon
+
+    def extract(self, document, info=None):
+        """Extract text from a PDF; info receives page / fallback counts when given
+
+        document is a seekable file object from the file store; when its name is
+        a local path, long files are split across the process pool.
+        """
+        try:
+            doc = _open_pdf(document)
+        except Exception as e:
+            print(f"PyMuPDF failed: {e}")
+            return self._extract_with_pdfplumber(document, info)
+
+        with doc:
+            page_count = doc.page_count
+            pages = min(page_count, self.max_pages) if self.max_pages else page_count
+            file_path = getattr(document, 'name', None)
+
+            if pages >= self.parallel_min_pages and isinstance(file_path, str) and self._can_fork():
+                step = -(-pages // self.workers)
+                ranges = [(start, min(start + step, pages)) for start in range(0, pages, step)]
+                executor = _get_executor(self.workers)
+                futures = [executor.submit(_extract_range, file_path, start, stop, self.detect_layout)
+                           for start, stop in ranges]
+                texts = []
+                fallback_pages = 0
+                for future in futures:
+                    range_texts, range_fallbacks = future.result()
+                    texts.extend(range_texts)
+                    fallback_pages += range_fallbacks
+            else:
+                texts, fallback_pages = _extract_pages(document, doc, 0, pages, self.detect_layout)
+
+        if info is not None:
+            info['pages'] = page_count
+            info['pages_extracted'] = pages
+            info['layout_fallback_pages'] = fallback_pages
+
+        return '\n'.join(text.strip('\n') for text in texts).strip()
+
+    def _extract_with_pdfplumber(self, document, info=None):
+        """Last resort for files PyMuPDF cannot open"""
+        texts = []
+        try:
+            with pdfplumber.open(document) as pdf:
+                if info is not None:
+                    info['pages'] = len(pdf.pages)
+                for page in pdf.pages[:self.max_pages or None]:
+                    page_text = page.extract_text()
+                    if page_text:
+                        texts.append(page_text)
+        except Exception as e:
+            print(f"pdfplumber failed: {e}")
+        return '\n'.join(texts).strip()
@@ -0,0 +1,163 @@
+"""
+Profile store - job profiles from the job_profiles table, compiled once per version
+Every process keeps the profiles in matching form (normalized skill lists,
+MatchScorer vocabulary ids and weight vectors) and reloads them only when
+job_profiles_version changes, checked at most every check_interval seconds.
+"""
+
+import threading
+import time
+import uuid
+
+from database import (add_job_profile, update_job_profile, get_job_profile, get_job_profiles,
+                      get_job_profiles_version)
+from scoring import DEFAULT_JOB_PROFILES, DEFAULT_PROFILE_ID, MatchScorer
+
+DEFAULT_WEIGHTS = {'required': 0.7, 'preferred': 0.3}
+
+
+class ProfileError(ValueError):
+    pass
+
+
+def normalize_skills(skills):
+    """Lowercased, whitespace-collapsed skill names, order kept"""
+    if not isinstance(skills, list) or not all(isinstance(skill, str) for skill in skills):
+        raise ProfileError('Skills must be a list of strings')
+    return [' '.join(skill.lower().split()) for skill in skills if skill.strip()]
+
+
+def from_api(data, current=None):
+    """Validate an API payload (camelCase, partial when updating) into job_profiles fields"""
+    current = current or {}
+    title = data.get('title', current.get('title'))
+    if not isinstance(title, str) or not title.strip():
+        raise ProfileError('A profile needs a title')
+
+    required_skills = normalize_skills(data.get('requiredSkills', current.get('requiredSkills', [])))
+    if not required_skills:
+        raise ProfileError('A profile needs at least one required skill')
+    preferred_skills = normalize_skills(data.get('preferredSkills', current.get('preferredSkills', [])))
+
+    weights = {**DEFAULT_WEIGHTS, **(current.get('weights') or {}), **(data.get('weights') or {})}
+    try:
+        weights = {'required': float(weights['required']), 'preferred': float(weights['preferred'])}
+    except (TypeError, ValueError):
+        raise ProfileError('Weights must be numbers')
+    if weights['required'] < 0 or weights['preferred'] < 0:
+        raise ProfileError('Weights cannot be negative')
+
+    minimum_experience = data.get('minimumExperience', current.get('minimumExperience'))
+    if minimum_experience is not None and not isinstance(minimum_experience, int):
+        raise ProfileError('minimumExperience must be a whole number of years')
+
+    return {
+        'title': title.strip(),
+        'required_skills': required_skills,
+        'preferred_skills': preferred_skills,
+        'minimum_experience': minimum_experience,
+        'description': data.get('description', current.get('description')) or '',
+        'weights': weights
+    }
+
+
+class CompiledProfiles:
+    """One version of the profiles in matching form"""
+
+    def __init__(self, profiles, version):
+        self.version = version
+        self.profiles = profiles
+        self.scorer = MatchScorer(profiles)
+        # Lowercased names for calculate_job_match's membership tests
+        self.required_keys = {pid: [s.lower() for s in p['required_skills']] for pid, p in profiles.items()}
+        self.preferred_keys = {pid: [s.lower() for s in p['preferred_skills']] for pid, p in profiles.items()}
+        self.skill_keys = {pid: set(self.required_keys[pid] + self.preferred_keys[pid]) for pid in profiles}
+
+    def resolve(self, profile_id):
+        """The profile id to score against: profile_id if known, else the default profile"""
+        if profile_id and profile_id in self.profiles:
+            return profile_id
+        return DEFAULT_PROFILE_ID if DEFAULT_PROFILE_ID in self.profiles else next(iter(self.profiles))
+
+
+class ProfileStore:
+    def __init__(self, check_interval=2.0, profiles=None):
+        """profiles: a fixed {id: profile} dict served without a database (tools, benchmarks)"""
+        self.check_interval = check_interval
+        self._static = profiles
+        self._lock = threading.Lock()
+        self._compiled = CompiledProfiles(profiles, 0) if profiles is not None else None
+        self._checked = 0.0
+
+    def compiled(self):
+        """Current CompiledProfiles, reloaded when another process changed the table"""
+        if self._static is not None:
+            return self._compiled
+        now = time.monotonic()
+        if self._compiled is not None and now - self._checked < self.check_interval:
+            return self._compiled
+        with self._lock:
+            if self._compiled is None or now - self._checked >= self.check_interval:
+                self._reload()
+                self._checked = now
+        return self._compiled
+
+    def _reload(self):
+        try:
+            version = get_job_profiles_version()
+            if self._compiled is not None and version == self._compiled.version:
+                return
+            profiles = {}
+            for row in get_job_profiles():
+                profiles[row['id']] = {
+                    'title': row['title'],
+                    'required_skills': row['requiredSkills'],
+                    'preferred_skills': row['preferredSkills'],
+                    'minimum_experience': row['minimumExperience'],
+                    'description': row['description'] or '',
+                    'weights': row['weights']
+                }
+            if not profiles:
+                raise Exception('job_profiles is empty')
+            self._compiled = CompiledProfiles(profiles, version)
+        except Exception as e:
+            print(f"❌ Job profile load failed: {e}")
+            if self._compiled is None:
+                self._compiled = CompiledProfiles(DEFAULT_JOB_PROFILES, -1)
+
+    def invalidate(self):
+        """Reload on next use (this process's own writes take effect immediately)"""
+        self._checked = 0.0
+
+    @property
+    def profiles(self):
+        return self.compiled().profiles
+
+    @property
+    def scorer(self):
+        return self.compiled().scorer
+
+    def list(self):
+        return get_job_profiles()
+
+    def get(self, profile_id):
+        return get_job_profile(profile_id)
+
+    def create(self, data):
+        fields = from_api(data)
+        profile_id = str(uuid.uuid4())
+        add_job_profile(profile_id, fields['title'], fields['required_skills'], fields['preferred_skills'],
+                        fields['minimum_experience'], fields['description'], fields['weights'])
+        self.invalidate()
+        return get_job_profile(profile_id)
+
+    def update(self, profile_id, data):
+        """Apply a (partial) update; returns None if the profile does not exist"""
+        current = get_job_profile(profile_id)
+        if current is None:
+            return None
+        fields = from_api(data, current)
+        update_job_profile(profile_id, fields['title'], fields['required_skills'], fields['preferred_skills'],
+                           fields['minimum_experience'], fields['description'], fields['weights'])
+        self.invalidate()
+        return get_job_profile(profile_id)
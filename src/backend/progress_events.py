@@ -0,0 +1,109 @@
+"""
+Progress events - push-based job progress over Redis pub/sub
+Workers publish a versioned snapshot for each progress change; the API process
+runs a single pub/sub listener and wakes only the clients waiting on that job
+"""
+
+import json
+import threading
+import time
+
+CHANNEL_PREFIX = 'progress:'
+SNAPSHOT_TTL = 24 * 3600
+TERMINAL_STATUSES = ('completed', 'failed')
+
+
+def publish_progress(redis_client, job_id, payload):
+    """Store the latest progress snapshot for a job and notify subscribers"""
+    if not redis_client:
+        return None
+
+    try:
+        version = redis_client.incr(f"progress:{job_id}:version")
+        snapshot = json.dumps(dict(payload, version=version))
+
+        pipe = redis_client.pipeline()
+        pipe.expire(f"progress:{job_id}:version", SNAPSHOT_TTL)
+        pipe.set(f"progress:{job_id}:state", snapshot, ex=SNAPSHOT_TTL)
+        pipe.publish(f"{CHANNEL_PREFIX}{job_id}", snapshot)
+        pipe.execute()
+        return version
+    except Exception as e:
+        print(f"❌ Progress publish failed: {e}")
+        return None
+
+
+def get_snapshot(redis_client, job_id):
+    """Latest published snapshot for a job, or None"""
+    if not redis_client:
+        return None
+    snapshot = redis_client.get(f"progress:{job_id}:state")
+    return json.loads(snapshot) if snapshot else None
+
+
+class ProgressBroker:
+    """Fans one Redis pattern subscription out to every waiting request in this process"""
+
+    def __init__(self, redis_client):
+        self.redis_client = redis_client
+        self._lock = threading.Lock()
+        self._conditions = {}  # job_id -> Condition sharing self._lock
+        self._waiters = {}
+        self._latest = {}
+        self._thread = None
+
+    def _ensure_listener(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._listen, name='progress-broker', daemon=True)
+                self._thread.start()
+
+    def _listen(self):
+        while True:
+            try:
+                pubsub = self.redis_client.pubsub(ignore_subscribe_messages=True)
+                pubsub.psubscribe(f"{CHANNEL_PREFIX}*")
+                for message in pubsub.listen():
+                    self._dispatch(message['channel'][len(CHANNEL_PREFIX):], message['data'])
+            except Exception as e:
+                print(f"❌ Progress listener error: {e}; reconnecting")
+                time.sleep(1)
+
+    def _dispatch(self, job_id, data):
+        with self._lock:
+            condition = self._conditions.get(job_id)
+            if condition is None:
+                return  # nobody in this process is watching the job
+            self._latest[job_id] = json.loads(data)
+            condition.notify_all()
+
+    def wait(self, job_id, version, timeout):
+        """Block until a snapshot newer than version arrives; None on timeout"""
+        self._ensure_listener()
+        deadline = time.monotonic() + timeout
+
+        with self._lock:
+            condition = self._conditions.setdefault(job_id, threading.Condition(self._lock))
+            self._waiters[job_id] = self._waiters.get(job_id, 0) + 1
+        try:
+            # _dispatch dropped anything published before the condition was registered
+            stored = get_snapshot(self.redis_client, job_id)
+            with self._lock:
+                latest = self._latest.get(job_id)
+                if stored and stored.get('version', 0) > (latest or {}).get('version', 0):
+                    self._latest[job_id] = stored
+                while True:
+                    latest = self._latest.get(job_id)
+                    if latest and latest.get('version', 0) > version:
+                        return latest
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return None
+                    condition.wait(remaining)
+        finally:
+            with self._lock:
+                self._waiters[job_id] -= 1
+                if not self._waiters[job_id]:
+                    del self._waiters[job_id]
+                    del self._conditions[job_id]
+                    self._latest.pop(job_id, None)
@@ -0,0 +1,101 @@
+"""
+Rescoring - bring stored analyses up to date after a job profile changes
+Walks the profile's completed analyses in rowid chunks and reruns only
+calculate_job_match and calculate_overall_score on the stored skills and
+section scores: no files are read, no models load and the compressed part of
+each analysis is never opened. Changed rows are written back one transaction
+per chunk; progress and rows/sec are kept on the job's analysis_jobs row.
+"""
+
+import json
+import time
+import uuid
+
+from database import (create_analysis_job, count_profile_analyses, iter_profile_analyses,
+                      update_rescored_analyses, increment_job_progress, finish_analysis_job)
+from job_tracking import get_batch_progress, describe_progress
+from progress_events import publish_progress
+
+RESCORE_CHUNK_SIZE = 500
+
+
+def rescore_analysis(processor, analysis, job_profile_id):
+    """(job_match, overall_score) recomputed from the analysis's scoring fields, or None if neither changed
+
+    keywords.missing is read from the job match, so it follows along.
+    """
+    skills = analysis['skills']
+    job_match = processor.calculate_job_match(skills, job_profile_id)
+    overall_score = processor.calculate_overall_score(analysis['sections'], job_match['matchPercentage'],
+                                                      len(skills))
+
+    if job_match == analysis['jobMatch'] and overall_score == analysis['overallScore']:
+        return None
+    return job_match, overall_score
+
+
+def start_rescore(processor, job_profile_id, job_id=None):
+    """Register a rescoring job for a profile; returns (job_id, number of analyses to rescore)"""
+    job_id = job_id or str(uuid.uuid4())
+    include_unassigned = processor.profile_store.compiled().resolve(None) == job_profile_id
+    total = count_profile_analyses(job_profile_id, include_unassigned)
+    create_analysis_job(job_id, total, 'rescore', job_profile_id)
+    return job_id, total
+
+
+def rescore_profile(processor, job_profile_id, job_id, chunk_size=RESCORE_CHUNK_SIZE, redis_client=None):
+    """Rescore every analysis of a profile under an analysis_jobs row created by start_rescore
+
+    Returns {'rescored', 'unchanged', 'failed', 'rowsPerSecond'}.
+    """
+    # Pick up the profile change even if this process checked the version moments ago
+    processor.profile_store.invalidate()
+    include_unassigned = processor.profile_store.compiled().resolve(None) == job_profile_id
+
+    rescored = unchanged = failed = 0
+    rows_per_second = 0.0
+    started = time.perf_counter()
+    try:
+        for chunk in iter_profile_analyses(job_profile_id, include_unassigned, chunk_size):
+            updates = []
+            chunk_failed = 0
+            for resume_id, analysis_seq, analysis in chunk:
+                try:
+                    result = rescore_analysis(processor, analysis, job_profile_id)
+                except Exception as e:
+                    print(f"❌ Rescoring {resume_id} failed: {e}")
+                    chunk_failed += 1
+                    continue
+                if result is None:
+                    unchanged += 1
+                else:
+                    job_match, overall_score = result
+                    updates.append((overall_score, job_match['matchPercentage'], json.dumps(job_match),
+                                    resume_id, analysis_seq))
+
+            if updates:
+                update_rescored_analyses(updates)
+            rescored += len(updates)
+            failed += chunk_failed
+
+            rows_per_second = (rescored + unchanged + failed) / max(time.perf_counter() - started, 1e-9)
+            increment_job_progress(job_id, len(chunk) - chunk_failed, chunk_failed, rows_per_second)
+            _publish(redis_client, job_id)
+    except Exception:
+        finish_analysis_job(job_id, 'failed')
+        _publish(redis_client, job_id)
+        raise
+
+    finish_analysis_job(job_id, 'failed' if failed and not (rescored or unchanged) else 'completed')
+    _publish(redis_client, job_id)
+
+    print(f"✅ Rescored {rescored} analyses for {job_profile_id} "
+          f"({unchanged} unchanged, {failed} failed, {rows_per_second:.0f} rows/s)")
+    return {'rescored': rescored, 'unchanged': unchanged, 'failed': failed, 'rowsPerSecond': rows_per_second}
+
+
+def _publish(redis_client, job_id):
+    if redis_client:
+        progress = get_batch_progress(None, job_id)
+        if progress:
+            publish_progress(redis_client, job_id, describe_progress(progress))
@@ -0,0 +1,278 @@
+"""
+Resume parser - rule-based extractors sharing one view of the resume text
+Patterns are compiled once, the text is split into lines and section spans
+once per resume, and every extractor reads that view, scanning only the spans
+it needs. No pattern can backtrack past a fixed-size window, so extraction
+stays linear in the text length even on adversarial input (huge single lines,
+long runs without a match).
+"""
+
+import re
+from bisect import bisect_right
+from datetime import datetime
+from itertools import chain, islice
+
+# Common section headers (lowercase: matched against the lowercased text)
+SECTION_PATTERNS = {
+    'experience': r'(work\s+experience|professional\s+experience|employment|experience)',
+    'education': r'(education|academic|qualifications|degrees)',
+    'skills': r'(skills|technical\s+skills|competencies|expertise)',
+    'projects': r'(projects|portfolio|work\s+samples)',
+    'certifications': r'(certifications|certificates|licenses)',
+    'contact': r'(contact|personal\s+information|details)'
+}
+
+# A header keyword starts a section when it opens a line that is either short
+# (at most this long, not a sentence) or continues with a colon ("Skills: ...")
+MAX_HEADING_CHARS = 40
+# Sections fed to KeyBERT / the document embedding instead of the whole resume
+KEYWORD_SECTIONS = ('skills', 'experience')
+# Below this many characters of those sections, the whole text is used
+MIN_KEYWORD_TEXT = 100
+
+# Longest local part / domain an email match may span (RFC 5321 limits)
+MAX_EMAIL_LOCAL = 64
+MAX_EMAIL_DOMAIN = 255
+# Characters of context kept on each side of a position keyword
+TITLE_CONTEXT = 20
+
+_EMAIL_LOCAL_CHARS = frozenset('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789._%+-')
+_ASCII_LOWER = str.maketrans('ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')
+
+
+def _is_word(char):
+    return char.isalnum() or char == '_'
+
+
+class ResumeText:
+    """A resume's text with its line offsets, section headers and section spans, computed once
+
+    Spans are (start, end) offsets into text rather than slices, so extractors
+    scan them in place with pattern.finditer(text, start, end).
+    """
+
+    def __init__(self, text, section_patterns):
+        self.text = text
+        # Keyword patterns scan a lowercased copy: far faster than IGNORECASE
+        # alternations, and offsets still index text (ASCII-only fold if lower() changes lengths)
+        self.lower = text.lower()
+        if len(self.lower) != len(text):
+            self.lower = text.translate(_ASCII_LOWER)
+        self.line_starts = [0]
+        self.line_starts.extend(match.end() for match in ResumeParser.NEWLINE.finditer(text))
+        matches = {name: list(pattern.finditer(self.lower)) for name, pattern in section_patterns.items()}
+        self.section_headers = {name: [match.start() for match in found] for name, found in matches.items()}
+        self.section_spans = self._segment(matches)
+
+    def _segment(self, matches):
+        """Section body spans, each running from its heading keyword to the next heading line"""
+        headings = []
+        for name, found in matches.items():
+            for match in found:
+                start, end = self.line_bounds(match.start())
+                line = self.text[start:end]
+                heading = line.strip()
+                if match.start() != start + len(line) - len(line.lstrip()):
+                    continue
+                if (len(heading) <= MAX_HEADING_CHARS and not heading.endswith('.')) \
+                        or self.text.startswith(':', match.end()):
+                    headings.append((start, match.end(), name))
+        headings.sort()
+
+        spans = {}
+        for index, (start, body, name) in enumerate(headings):
+            if index and headings[index - 1][0] == start:
+                continue  # One heading line opens one section
+            stop = headings[index + 1][0] if index + 1 < len(headings) else len(self.text)
+            spans.setdefault(name, []).append((body, stop))
+        return spans
+
+    def section_length(self, name):
+        """Characters of body under the section's headings (0 when it has no heading)"""
+        return sum(end - start for start, end in self.section_spans.get(name, ()))
+
+    def ranges(self, *names):
+        """Sorted spans of the named sections, or the whole text when none of them has a heading"""
+        spans = sorted(chain.from_iterable(self.section_spans.get(name, ()) for name in names))
+        return spans or [(0, len(self.text))]
+
+    def keyword_text(self):
+        """Skills and experience sections joined, for KeyBERT and the document embedding"""
+        spans = sorted(chain.from_iterable(self.section_spans.get(name, ()) for name in KEYWORD_SECTIONS))
+        if sum(end - start for start, end in spans) < MIN_KEYWORD_TEXT:
+            return self.text
+        return '\n'.join(self.text[start:end] for start, end in spans)
+
+    def line_bounds(self, position):
+        """(start, end) of the line containing position, end excluding the newline"""
+        line = bisect_right(self.line_starts, position) - 1
+        start = self.line_starts[line]
+        end = self.line_starts[line + 1] - 1 if line + 1 < len(self.line_starts) else len(self.text)
+        return start, end
+
+
+class ResumeParser:
+    NEWLINE = re.compile(r'\n')
+    EMAIL = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+    PHONE = re.compile(r'(\+?\d{1,4}[-.\s]?)?\(?(\d{3})\)?[-.\s]?(\d{3})[-.\s]?(\d{4})')
+    YEAR = re.compile(r'\b(?:19|20)\d{2}\b')
+
+    # Case-insensitive keyword patterns, matched against ResumeText.lower
+    NAME_LABEL = re.compile(r'name[:\s]+(.+)')
+    # Zero-width so overlapping keywords ("phonemail") are all seen
+    CONTACT_KEYWORD = re.compile(r'(?=email|phone|address)')
+    LOCATION = re.compile(r'(location|address)[:\s]+(.+?)(?:\n|$)')
+    TITLE_KEYWORDS = (
+        re.compile(r'developer|engineer|manager|analyst|specialist|coordinator|director|lead'),
+        re.compile(r'software|web|frontend|backend|full.?stack|data|systems'),
+    )
+    DEGREES = (
+        re.compile(r'(bachelor|master|phd|doctorate|diploma|certificate).{0,50}'
+                   r'(computer|software|engineering|science|technology)'),
+        re.compile(r'(b\.?s\.?|m\.?s\.?|m\.?a\.?|b\.?a\.?|ph\.?d\.?)'),
+    )
+
+    def __init__(self, section_patterns=None):
+        self.section_patterns = {
+            name: re.compile(pattern)
+            for name, pattern in (section_patterns or SECTION_PATTERNS).items()
+        }
+
+    def view(self, text):
+        return ResumeText(text, self.section_patterns)
+
+    def personal_info(self, view):
+        """Email, phone, name and location"""
+        text = view.text
+        personal_info = {}
+
+        email = self._first_email(text)
+        if email:
+            personal_info['email'] = email
+
+        phone = self.PHONE.search(text)
+        if phone:
+            personal_info['phone'] = ''.join(phone.groups(''))
+
+        # "Name: ..." or else the first line, up to any contact keyword
+        for potential_name in (self._labeled_name(view), self._leading_name(view)):
+            if potential_name is None:
+                continue
+            potential_name = potential_name.strip()
+            if len(potential_name.split()) >= 2 and len(potential_name) < 50:
+                personal_info['name'] = potential_name
+                break
+
+        location = self.LOCATION.search(view.lower)
+        if location:
+            personal_info['location'] = text[location.start(2):location.end(2)].strip()
+
+        return personal_info
+
+    def _first_email(self, text):
+        """First EMAIL match, trying the regex only next to each '@'
+
+        A plain search restarts the local-part scan at every character of
+        long runs without an '@', which is quadratic.
+        """
+        at = text.find('@')
+        while at != -1:
+            start = at
+            while start > at - MAX_EMAIL_LOCAL and start > 0 and text[start - 1] in _EMAIL_LOCAL_CHARS:
+                start -= 1
+            end = min(len(text), at + MAX_EMAIL_DOMAIN + 1)
+            for position in range(start, at):
+                match = self.EMAIL.match(text, position, end)
+                if match:
+                    return match.group()
+                # Past the first word boundary every start gives the same outcome
+                before = _is_word(text[position - 1]) if position else False
+                if before != _is_word(text[position]):
+                    break
+            at = text.find('@', at + 1)
+        return None
+
+    def _labeled_name(self, view):
+        match = self.NAME_LABEL.search(view.lower)
+        return view.text[match.start(1):match.end(1)] if match else None
+
+    def _leading_name(self, view):
+        """The first line up to trailing space or a contact keyword
+
+        Same result as searching (.+?)(?:\\s*\\n|\\s*email|\\s*phone|\\s*address),
+        whose lazy group retries every start position of a line with no newline.
+        """
+        text = view.text
+        start = len(text) - len(text.lstrip('\n'))
+        if start == len(text):
+            return None
+        line_start, line_end = view.line_bounds(start)
+
+        for keyword in self.CONTACT_KEYWORD.finditer(view.lower, start, line_end):
+            position = keyword.start()
+            end = max(start + len(text[start:position].rstrip()), start + 1)
+            if end <= position:
+                return text[start:end]
+
+        if line_end < len(text):
+            return text[start:max(start + len(text[start:line_end].rstrip()), start + 1)]
+        return None
+
+    def sections(self, view):
+        """Which sections the resume has, where their headers are and how much body they hold"""
+        return {
+            name: {'found': bool(positions), 'positions': positions, 'length': view.section_length(name)}
+            for name, positions in view.section_headers.items()
+        }
+
+    def experience(self, view):
+        """Years of experience and position titles with their surrounding words"""
+        text = view.text
+        experience = {
+            'totalYears': 0,
+            'positions': []
+        }
+
+        # Years from the experience section only, so graduation dates do not count
+        years = [int(match.group()) for start, end in view.ranges('experience')
+                 for match in self.YEAR.finditer(text, start, end)]
+        if years:
+            current_year = datetime.now().year
+            min_year = min(years)
+            if min_year < current_year:
+                experience['totalYears'] = current_year - min_year
+
+        positions = []
+        for pattern in self.TITLE_KEYWORDS:
+            positions.extend(islice(self._keyword_contexts(view, pattern), 3))  # Limit to prevent noise
+
+        experience['positions'] = [{'title': pos.strip(), 'company': 'Unknown', 'duration': 'Unknown', 'skills': []}
+                                   for pos in positions[:5]]
+
+        return experience
+
+    def _keyword_contexts(self, view, pattern):
+        """Non-overlapping keyword matches widened by TITLE_CONTEXT characters within their line"""
+        text = view.text
+        covered = 0
+        for match in pattern.finditer(view.lower):
+            if match.start() < covered:
+                continue
+            line_start, line_end = view.line_bounds(match.start())
+            covered = min(match.end() + TITLE_CONTEXT, line_end)
+            yield text[max(match.start() - TITLE_CONTEXT, line_start):covered]
+
+    def education(self, view):
+        """Degree mentions"""
+        education = []
+        spans = view.ranges('education')
+        for pattern in self.DEGREES:
+            matches = chain.from_iterable(pattern.finditer(view.lower, start, end) for start, end in spans)
+            for match in islice(matches, 3):  # Limit results
+                groups = [view.text[match.start(group):match.end(group)] for group in range(1, pattern.groups + 1)]
+                education.append({
+                    'degree': ' '.join(groups),
+                    'institution': 'Unknown',
+                    'year': 'Unknown'
+                })
+        return education
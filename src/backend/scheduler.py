@@ -0,0 +1,284 @@
+"""
+Scheduler - interactive and bulk analysis queues with fair sharing between batches
+Single uploads go to the interactive queue and batch chunks to the bulk queue, so
+a large batch never sits in front of an interactive upload. Bulk chunks are held
+per batch (or per job profile) and released round-robin, a few at a time, so
+concurrent batches advance together instead of in arrival order. Queue waits
+(queued to started) and depths are recorded per queue for GET /api/queues.
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from queue import Queue
+
+from metrics import Histogram
+
+INTERACTIVE = 'interactive'
+BULK = 'bulk'
+QUEUES = (INTERACTIVE, BULK)
+
+# Bulk chunks kept waiting in the Celery broker; the rest stay held for fair sharing
+BROKER_BACKLOG = 2
+
+
+def fair_share_key(mode, batch_id=None, job_profile_id=None):
+    """The key bulk chunks are interleaved by: 'batch' or 'profile'"""
+    if mode == 'profile':
+        return job_profile_id or ''
+    return batch_id or ''
+
+
+class FairShareQueue:
+    """Round robin over per-key FIFO queues, in process memory"""
+
+    def __init__(self):
+        self._queues = OrderedDict()
+
+    def push(self, key, items):
+        self._queues.setdefault(key, deque()).extend(items)
+
+    def pop(self):
+        """Next item of the key that has waited longest since its last turn, or None"""
+        if not self._queues:
+            return None
+        key, items = next(iter(self._queues.items()))
+        item = items.popleft()
+        if items:
+            self._queues.move_to_end(key)
+        else:
+            del self._queues[key]
+        return item
+
+    def depth(self):
+        """(items held, keys with items)"""
+        return sum(len(items) for items in self._queues.values()), len(self._queues)
+
+
+# A key is in the rotation list exactly while its item list is non-empty
+_PUSH_SCRIPT = '''
+if redis.call('EXISTS', KEYS[2]) == 0 then
+    redis.call('RPUSH', KEYS[1], ARGV[1])
+end
+for index = 2, #ARGV do
+    redis.call('RPUSH', KEYS[2], ARGV[index])
+end
+'''
+
+_POP_SCRIPT = '''
+local key = redis.call('LPOP', KEYS[1])
+if not key then
+    return nil
+end
+local items = ARGV[1] .. key
+local item = redis.call('LPOP', items)
+if redis.call('LLEN', items) > 0 then
+    redis.call('RPUSH', KEYS[1], key)
+end
+return item
+'''
+
+
+class RedisFairShareQueue:
+    """The same round robin in Redis, shared by the API and the Celery workers (items are JSON)"""
+
+    def __init__(self, client, prefix='sched:bulk'):
+        self.client = client
+        self.rotation = f'{prefix}:keys'
+        self.prefix = f'{prefix}:items:'
+        self._push = client.register_script(_PUSH_SCRIPT)
+        self._pop = client.register_script(_POP_SCRIPT)
+
+    def push(self, key, items):
+        if items:
+            self._push(keys=[self.rotation, self.prefix + key], args=[key] + [json.dumps(item) for item in items])
+
+    def pop(self):
+        item = self._pop(keys=[self.rotation], args=[self.prefix])
+        return json.loads(item) if item is not None else None
+
+    def depth(self):
+        keys = self.client.lrange(self.rotation, 0, -1)
+        pipe = self.client.pipeline(transaction=False)
+        for key in keys:
+            pipe.llen(self.prefix + key)
+        return sum(pipe.execute()) if keys else 0, len(keys)
+
+
+class QueueMetrics:
+    """Wait-time histograms per queue, kept in a metrics sink (MemorySink, or RedisSink across workers)"""
+
+    def __init__(self, sink):
+        self.sink = sink
+
+    def observe_wait(self, queue, seconds):
+        try:
+            self.sink.emit([((queue,), max(seconds, 0.0))])
+        except Exception as e:
+            print(f"❌ Queue metrics failed: {e}")
+
+    def waits(self):
+        histograms = self.sink.histograms()
+        return {queue: histograms.get((queue,), Histogram()).summary() for queue in QUEUES}
+
+
+class _Job:
+    __slots__ = ('queue', 'fn', 'args', 'future', 'queued_at')
+
+    def __init__(self, queue, fn, args):
+        self.queue = queue
+        self.fn = fn
+        self.args = args
+        self.future = Future()
+        self.queued_at = time.perf_counter()
+
+
+class SlotScheduler:
+    """Feeds a fixed number of worker slots from the interactive and bulk queues
+
+    A freed slot goes to the oldest interactive job first, then to the bulk queue
+    round-robin across fair-share keys. Each queue can be capped to fewer slots
+    (a bulk cap below the slot count keeps workers free for interactive uploads).
+    Jobs only leave the scheduler when a slot is free, so the wait is measured here.
+
+    Only the dispatcher thread calls submit and resolves job futures. Completions
+    arrive on the executor's own thread (ProcessPoolExecutor's manager thread),
+    which must not submit work itself, so they are handed over through a queue.
+    """
+
+    def __init__(self, submit, slots, interactive_slots=None, bulk_slots=None, metrics=None):
+        self._submit = submit
+        self.slots = slots
+        self.limits = {INTERACTIVE: min(interactive_slots or slots, slots), BULK: min(bulk_slots or slots, slots)}
+        self.metrics = metrics
+        self._interactive = deque()
+        self._bulk = FairShareQueue()
+        self._running = {INTERACTIVE: 0, BULK: 0}
+        self._lock = threading.Lock()
+        # (job, finished future) for completions, None to wake the dispatcher after a submit
+        self._events = Queue()
+        self._dispatcher = None
+
+    def submit(self, queue, fn, *args, key=''):
+        """Queue fn(*args); returns a Future with its result"""
+        job = _Job(queue, fn, args)
+        with self._lock:
+            if queue == INTERACTIVE:
+                self._interactive.append(job)
+            else:
+                self._bulk.push(key, [job])
+            if self._dispatcher is None:
+                self._dispatcher = threading.Thread(target=self._run, name='slot-scheduler', daemon=True)
+                self._dispatcher.start()
+        self._events.put(None)
+        return job.future
+
+    def _run(self):
+        while True:
+            event = self._events.get()
+            try:
+                if event is not None:
+                    self._complete(*event)
+                self._dispatch()
+            except Exception as e:
+                print(f"❌ Scheduler dispatch failed: {e}")
+
+    def _next(self):
+        if sum(self._running.values()) >= self.slots:
+            return None
+        job = None
+        if self._interactive and self._running[INTERACTIVE] < self.limits[INTERACTIVE]:
+            job = self._interactive.popleft()
+        elif self._running[BULK] < self.limits[BULK]:
+            job = self._bulk.pop()
+        if job is not None:
+            self._running[job.queue] += 1
+        return job
+
+    def _dispatch(self):
+        while True:
+            with self._lock:
+                job = self._next()
+            if job is None:
+                return
+            self._start(job)
+
+    def _start(self, job):
+        if self.metrics:
+            self.metrics.observe_wait(job.queue, time.perf_counter() - job.queued_at)
+        try:
+            running = self._submit(job.fn, *job.args)
+        except Exception as e:
+            self._finished(job.queue)
+            job.future.set_exception(e)
+            return
+        running.add_done_callback(lambda done: self._events.put((job, done)))
+
+    def _complete(self, job, done):
+        self._finished(job.queue)
+        if done.exception() is not None:
+            job.future.set_exception(done.exception())
+        else:
+            job.future.set_result(done.result())
+
+    def _finished(self, queue):
+        with self._lock:
+            self._running[queue] -= 1
+
+    def stats(self):
+        with self._lock:
+            held, keys = self._bulk.depth()
+            return {
+                INTERACTIVE: {'depth': len(self._interactive), 'running': self._running[INTERACTIVE],
+                              'slots': self.limits[INTERACTIVE]},
+                BULK: {'depth': held, 'keys': keys, 'running': self._running[BULK], 'slots': self.limits[BULK]}
+            }
+
+
+class BrokerScheduler:
+    """Fair sharing in front of the Celery broker's bulk queue
+
+    Chunks are held in a RedisFairShareQueue and released round-robin whenever the
+    broker's bulk list is shorter than backlog; every bulk task releases more as it
+    starts. Without Redis, chunks are published straight away.
+    """
+
+    def __init__(self, pending=None, broker_client=None, metrics=None, backlog=BROKER_BACKLOG):
+        self.pending = pending
+        self.broker_client = broker_client
+        self.metrics = metrics
+        self.backlog = backlog
+
+    @property
+    def fair(self):
+        return self.pending is not None and self.broker_client is not None
+
+    def hold(self, key, chunks):
+        self.pending.push(key, chunks)
+
+    def release(self, send):
+        """Publish held chunks with send(chunk) until the broker's bulk list holds backlog of them"""
+        released = 0
+        while self.broker_client.llen(BULK) < self.backlog:
+            chunk = self.pending.pop()
+            if chunk is None:
+                break
+            send(chunk)
+            released += 1
+        return released
+
+    def task_started(self, queue, queued_at):
+        if self.metrics and queued_at:
+            self.metrics.observe_wait(queue, time.time() - queued_at)
+
+    def stats(self):
+        stats = {queue: {} for queue in QUEUES}
+        if self.broker_client is not None:
+            for queue in QUEUES:
+                stats[queue]['depth'] = self.broker_client.llen(queue)
+        if self.pending is not None:
+            held, keys = self.pending.depth()
+            stats[BULK].update(held=held, keys=keys)
+        return stats
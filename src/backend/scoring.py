@@ -0,0 +1,147 @@
+"""
+Job match scoring - vectorized required/preferred skill scoring
+Resumes and job profiles are encoded as sparse skill vectors over a shared
+vocabulary, so whole candidate x profile score matrices come from two sparse
+matrix products. Scores equal ATSProcessor.calculate_job_match's matchPercentage.
+"""
+
+import numpy as np
+from scipy import sparse
+
+# Built-in job profiles, seeded into the job_profiles table (see profile_store.py)
+DEFAULT_JOB_PROFILES = {
+    'fullstack': {
+        'title': 'Full Stack Developer',
+        'required_skills': ['javascript', 'react', 'node.js', 'html', 'css'],
+        'preferred_skills': ['python', 'typescript', 'postgresql', 'aws'],
+        'minimum_experience': 3,
+        'description': 'Full stack web developer with modern JavaScript technologies',
+        'weights': {'required': 0.7, 'preferred': 0.3}
+    },
+    'frontend': {
+        'title': 'Frontend Developer',
+        'required_skills': ['javascript', 'react', 'html', 'css'],
+        'preferred_skills': ['typescript', 'vue.js', 'sass', 'webpack'],
+        'minimum_experience': 2,
+        'description': 'Frontend developer focused on user interface development',
+        'weights': {'required': 0.8, 'preferred': 0.2}
+    },
+    'backend': {
+        'title': 'Backend Developer',
+        'required_skills': ['python', 'node.js', 'sql', 'api development'],
+        'preferred_skills': ['django', 'flask', 'postgresql', 'redis'],
+        'minimum_experience': 3,
+        'description': 'Backend developer for server-side applications',
+        'weights': {'required': 0.8, 'preferred': 0.2}
+    },
+    'datascientist': {
+        'title': 'Data Scientist',
+        'required_skills': ['python', 'machine learning', 'sql', 'statistics'],
+        'preferred_skills': ['tensorflow', 'pytorch', 'r', 'spark'],
+        'minimum_experience': 2,
+        'description': 'Data scientist with machine learning expertise',
+        'weights': {'required': 0.7, 'preferred': 0.3}
+    }
+}
+
+DEFAULT_PROFILE_ID = 'fullstack'
+
+
+def profile_text(profile):
+    """Free text describing a job profile, for semantic (embedding) matching"""
+    parts = [profile['title'], profile.get('description', '')]
+    parts.append('Required skills: ' + ', '.join(profile['required_skills']))
+    if profile['preferred_skills']:
+        parts.append('Preferred skills: ' + ', '.join(profile['preferred_skills']))
+    return '. '.join(part for part in parts if part)
+
+
+class SkillVocabulary:
+    """Maps lowercased skill names to column ids"""
+
+    def __init__(self, names=()):
+        self.ids = {}
+        for name in names:
+            self.add(name)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def add(self, name):
+        return self.ids.setdefault(name.lower(), len(self.ids))
+
+    def encode(self, names):
+        """Sorted, de-duplicated column ids of the known names (unknown names cannot match a profile)"""
+        return sorted({self.ids[key] for key in (name.lower() for name in names) if key in self.ids})
+
+
+class MatchScorer:
+    """Scores candidate x profile matrices in one shot"""
+
+    def __init__(self, profiles=None):
+        self.profiles = profiles if profiles is not None else DEFAULT_JOB_PROFILES
+        self.profile_ids = list(self.profiles)
+        self.index = {profile_id: row for row, profile_id in enumerate(self.profile_ids)}
+        self.vocabulary = SkillVocabulary(
+            skill for profile in self.profiles.values()
+            for skill in profile['required_skills'] + profile['preferred_skills'])
+
+        # Profile skill counts; a skill listed twice counts twice, as in calculate_job_match
+        self.required = self._profile_matrix('required_skills')
+        self.preferred = self._profile_matrix('preferred_skills')
+        self.required_counts = np.array([len(p['required_skills']) for p in self.profiles.values()], dtype=np.float64)
+        self.preferred_counts = np.array([len(p['preferred_skills']) for p in self.profiles.values()], dtype=np.float64)
+        self.required_weights = np.array([p['weights']['required'] for p in self.profiles.values()], dtype=np.float64)
+        self.preferred_weights = np.array([p['weights']['preferred'] for p in self.profiles.values()], dtype=np.float64)
+
+    def _profile_matrix(self, field):
+        rows, cols = [], []
+        for row, profile in enumerate(self.profiles.values()):
+            for skill in profile[field]:
+                rows.append(row)
+                cols.append(self.vocabulary.ids[skill.lower()])
+        data = np.ones(len(rows), dtype=np.float64)
+        # Transposed (vocabulary x profiles) so candidates @ matrix gives match counts
+        return sparse.csr_matrix((data, (cols, rows)), shape=(len(self.vocabulary), len(self.profile_ids)))
+
+    def encode(self, skill_lists):
+        """Binary candidates x vocabulary matrix from lists of skill names"""
+        indptr = [0]
+        indices = []
+        for names in skill_lists:
+            indices.extend(self.vocabulary.encode(names))
+            indptr.append(len(indices))
+        data = np.ones(len(indices), dtype=np.float64)
+        return sparse.csr_matrix((data, indices, indptr), shape=(len(skill_lists), len(self.vocabulary)))
+
+    def score_matrix(self, candidates):
+        """Integer match percentages, candidates x profiles"""
+        required_matches = (candidates @ self.required).toarray()
+        preferred_matches = (candidates @ self.preferred).toarray()
+
+        # Same operation order as calculate_job_match so float results (and int()) agree exactly
+        with np.errstate(divide='ignore', invalid='ignore'):
+            required_score = np.where(self.required_counts > 0,
+                                      (required_matches / self.required_counts) * 100, 0.0)
+            preferred_score = np.where(self.preferred_counts > 0,
+                                       (preferred_matches / self.preferred_counts) * 100, 0.0)
+        final_score = required_score * self.required_weights + preferred_score * self.preferred_weights
+        return final_score.astype(np.int64)
+
+    def score(self, skill_lists):
+        return self.score_matrix(self.encode(skill_lists))
+
+    def rank_candidates(self, profile_id, candidate_ids, skill_lists, limit=50, min_score=0):
+        """Best candidates for one profile: [(candidate_id, matchPercentage)], highest first"""
+        if profile_id not in self.index or not candidate_ids:
+            return []
+        scores = self.score(skill_lists)[:, self.index[profile_id]]
+        order = np.argsort(-scores, kind='stable')
+        order = order[scores[order] >= min_score][:limit]
+        return [(candidate_ids[row], int(scores[row])) for row in order]
+
+    def rank_profiles(self, skill_names, limit=None):
+        """Profiles ordered by fit for one resume: [(profile_id, matchPercentage)]"""
+        scores = self.score([skill_names])[0]
+        order = np.argsort(-scores, kind='stable')
+        return [(self.profile_ids[column], int(scores[column])) for column in order[:limit]]
@@ -0,0 +1,257 @@
+"""
+Skill index - boolean skill search over analyzed resumes
+Postings live in SQLite (database.skill_postings); each process keeps bitmaps
+(Python ints, bit n = resume rowid n) for recently queried skills plus a score
+array, both brought up to date from skill_index_log before every query.
+"""
+
+import re
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from database import (normalize_skill, find_skill_ids, get_skill_postings, get_skill_index_changes,
+                      get_last_skill_index_seq, prune_skill_index_log, get_doc_scores, get_resumes_by_doc_ids)
+
+# Log entries kept for readers that fall behind; more than this and they rebuild
+LOG_KEEP = 1000000
+# Changes applied incrementally per query; beyond this, caches are dropped and rebuilt lazily
+MAX_REPLAY = 200000
+
+_TOKEN = re.compile(r'\s*(?:(\()|(\))|"([^"]*)"|([^\s()"]+))')
+_OPERATORS = {'and': 'and', '&&': 'and', 'or': 'or', '||': 'or', 'not': 'not', '-': 'not'}
+
+
+class QueryError(ValueError):
+    pass
+
+
+def _tokenize(query):
+    tokens = []
+    position = 0
+    query = query.strip()
+    while position < len(query):
+        match = _TOKEN.match(query, position)
+        if not match or match.end() == position:
+            raise QueryError(f'Unexpected character at {position}')
+        position = match.end()
+        opening, closing, quoted, word = match.groups()
+        if opening:
+            tokens.append(('(', None, False))
+        elif closing:
+            tokens.append((')', None, False))
+        elif quoted is not None:
+            tokens.append(('skill', quoted, False))
+        elif word.lower() in _OPERATORS:
+            tokens.append((_OPERATORS[word.lower()], None, False))
+        elif word.startswith('-'):
+            # -java is shorthand for NOT java
+            tokens.append(('not', None, False))
+            tokens.append(('skill', word[1:], True))
+        elif tokens and tokens[-1][0] == 'skill' and tokens[-1][2]:
+            # Adjacent bare words form one multi-word skill: machine learning AND python
+            tokens[-1] = ('skill', f'{tokens[-1][1]} {word}', True)
+        else:
+            tokens.append(('skill', word, True))
+    return tokens
+
+
+def parse_query(query):
+    """Parse 'kubernetes AND python AND NOT java' into a tree of ('skill'|'and'|'or'|'not', ...)
+
+    NOT binds tighter than AND, AND tighter than OR; parentheses group and
+    quotes keep multi-word skills together.
+    """
+    tokens = _tokenize(query)
+    if not tokens:
+        return None
+    position = 0
+
+    def peek():
+        return tokens[position][0] if position < len(tokens) else None
+
+    def take(kind):
+        nonlocal position
+        if peek() != kind:
+            raise QueryError(f'Expected {kind} in skill query')
+        position += 1
+        return tokens[position - 1][1]
+
+    def parse_or():
+        node = parse_and()
+        while peek() == 'or':
+            take('or')
+            node = ('or', node, parse_and())
+        return node
+
+    def parse_and():
+        node = parse_not()
+        while peek() == 'and':
+            take('and')
+            node = ('and', node, parse_not())
+        return node
+
+    def parse_not():
+        if peek() == 'not':
+            take('not')
+            return ('not', parse_not())
+        if peek() == '(':
+            take('(')
+            node = parse_or()
+            take(')')
+            return node
+        return ('skill', normalize_skill(take('skill')))
+
+    tree = parse_or()
+    if position != len(tokens):
+        raise QueryError('Unexpected token in skill query')
+    return tree
+
+
+def _query_skills(node, names):
+    if node[0] == 'skill':
+        names.add(node[1])
+    else:
+        for child in node[1:]:
+            _query_skills(child, names)
+    return names
+
+
+def _bits(doc_ids, size):
+    """Bitmap int with the given bit positions set"""
+    flags = np.zeros(size, dtype=bool)
+    flags[np.asarray(doc_ids, dtype=np.int64)] = True
+    return int.from_bytes(np.packbits(flags, bitorder='little').tobytes(), 'little')
+
+
+class SkillIndex:
+    def __init__(self, max_cached_skills=256):
+        self.max_cached_skills = max_cached_skills
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._bitmaps = OrderedDict()  # skill_id -> bitmap, least recently used first
+        self._scores = None  # overall_score by rowid, -1 when not analyzed
+        self._seq = 0
+
+    def _load(self):
+        self._seq = get_last_skill_index_seq()
+        rows = get_doc_scores()
+        size = max((doc_id for doc_id, _ in rows), default=0) + 1
+        self._scores = np.full(size, -1, dtype=np.int16)
+        if rows:
+            doc_ids, scores = zip(*rows)
+            self._scores[list(doc_ids)] = scores
+
+    def _grow(self, size):
+        if size > len(self._scores):
+            grown = np.full(max(size, len(self._scores) * 2), -1, dtype=np.int16)
+            grown[:len(self._scores)] = self._scores
+            self._scores = grown
+
+    def _sync(self):
+        """Apply skill_index_log entries written since the last query"""
+        if self._scores is None:
+            self._load()
+            return
+
+        changes, oldest = get_skill_index_changes(self._seq, MAX_REPLAY + 1)
+        if not changes:
+            return
+        if len(changes) > MAX_REPLAY or (oldest is not None and oldest > self._seq + 1) \
+                or any(added == -1 for _, _, _, added in changes):
+            # Too far behind, log pruned past us, or index rebuilt: start over
+            self._reset()
+            self._load()
+            return
+
+        latest = {}
+        score_docs = set()
+        for _, skill_id, doc_id, added in changes:
+            if skill_id is None:
+                score_docs.add(doc_id)
+            elif skill_id in self._bitmaps:
+                latest[(skill_id, doc_id)] = added
+
+        if score_docs:
+            self._grow(max(score_docs) + 1)
+            self._scores[list(score_docs)] = -1
+            for doc_id, score in get_doc_scores(score_docs):
+                self._scores[doc_id] = score
+
+        per_skill = {}
+        for (skill_id, doc_id), added in latest.items():
+            per_skill.setdefault(skill_id, ([], []))[0 if added else 1].append(doc_id)
+        for skill_id, (added, removed) in per_skill.items():
+            size = max(added + removed) + 1
+            bitmap = self._bitmaps[skill_id]
+            if removed:
+                bitmap &= ~_bits(removed, size)
+            if added:
+                bitmap |= _bits(added, size)
+            self._bitmaps[skill_id] = bitmap
+
+        self._seq = changes[-1][0]
+        if oldest is not None and self._seq - oldest > LOG_KEEP + LOG_KEEP // 10:
+            prune_skill_index_log(LOG_KEEP)
+
+    def _bitmap(self, skill_id):
+        if skill_id is None:
+            return 0
+        bitmap = self._bitmaps.get(skill_id)
+        if bitmap is None:
+            doc_ids = get_skill_postings(skill_id)
+            bitmap = _bits(doc_ids, max(doc_ids) + 1) if doc_ids else 0
+            self._bitmaps[skill_id] = bitmap
+            while len(self._bitmaps) > self.max_cached_skills:
+                self._bitmaps.popitem(last=False)
+        else:
+            self._bitmaps.move_to_end(skill_id)
+        return bitmap
+
+    def _evaluate(self, node, skill_ids, universe):
+        kind = node[0]
+        if kind == 'skill':
+            return self._bitmap(skill_ids.get(node[1]))
+        if kind == 'not':
+            return universe & ~self._evaluate(node[1], skill_ids, universe)
+        left = self._evaluate(node[1], skill_ids, universe)
+        right = self._evaluate(node[2], skill_ids, universe)
+        return left & right if kind == 'and' else left | right
+
+    def search(self, query='', min_score=None, max_score=None, offset=0, limit=50, sort='recent'):
+        """Resumes matching a boolean skill query and score range
+
+        Returns (total, page of resume summaries); sort is 'recent' (newest
+        upload first) or 'score' (highest overall score first).
+        """
+        tree = parse_query(query) if query else None
+
+        with self._lock:
+            self._sync()
+            scores = self._scores
+
+            # Candidate set: analyzed resumes inside the score range
+            mask = scores >= max(min_score or 0, 0)
+            if max_score is not None:
+                mask &= scores <= max_score
+            universe = int.from_bytes(np.packbits(mask, bitorder='little').tobytes(), 'little')
+
+            result = universe
+            if tree is not None:
+                skill_ids = find_skill_ids(_query_skills(tree, set()))
+                result &= self._evaluate(tree, skill_ids, universe)
+
+            packed = np.frombuffer(result.to_bytes((len(scores) + 7) // 8, 'little'), dtype=np.uint8)
+            doc_ids = np.flatnonzero(np.unpackbits(packed, bitorder='little')[:len(scores)])
+
+            if sort == 'score':
+                doc_ids = doc_ids[np.lexsort((-doc_ids, -scores[doc_ids].astype(np.int64)))]
+            else:
+                doc_ids = doc_ids[::-1]
+
+        page = [int(doc_id) for doc_id in doc_ids[offset:offset + limit]]
+        rows = get_resumes_by_doc_ids(page)
+        return len(doc_ids), [rows[doc_id] for doc_id in page if doc_id in rows]
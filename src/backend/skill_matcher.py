@@ -0,0 +1,174 @@
+"""
+Skill Matcher - single-pass skill detection for the ATS processor
+Compiles the whole skill taxonomy into one trie-shaped regex so a resume is
+scanned once, no matter how many skills the taxonomy holds
+"""
+
+import re
+
+# Marks the end of a skill inside a trie node
+_END = ''
+
+
+class SkillMatcher:
+    def __init__(self, taxonomy=None):
+        # skill (lowercase) -> list of categories, in insertion order
+        self._categories = {}
+        # skill (lowercase) -> (category index, skill index) used to keep taxonomy order
+        self._order = {}
+        self._category_index = {}
+        self._trie = {}
+        self._pattern = None
+        self._prefixes = {}
+
+        for category, skills in (taxonomy or {}).items():
+            self.add_skills(category, skills)
+
+    def __len__(self):
+        return len(self._categories)
+
+    def __contains__(self, skill):
+        return skill.lower() in self._categories
+
+    def add_skills(self, category, skills):
+        """Add skills to a category; the regex is rebuilt lazily on next use"""
+        for skill in skills:
+            self.add_skill(category, skill)
+
+    def add_skill(self, category, skill):
+        """Add a single skill to the taxonomy"""
+        key = skill.lower()
+        if not key:
+            return
+
+        category_idx = self._category_index.setdefault(category, len(self._category_index))
+        categories = self._categories.setdefault(key, [])
+        if category in categories:
+            return
+        categories.append(category)
+        self._order.setdefault(key, (category_idx, len(self._order)))
+
+        node = self._trie
+        for char in key:
+            node = node.setdefault(char, {})
+        node[_END] = True
+        self._pattern = None
+
+    def remove_skill(self, skill, category=None):
+        """Remove a skill from one category (or from all when category is None)"""
+        key = skill.lower()
+        categories = self._categories.get(key)
+        if not categories:
+            return
+
+        if category is not None and category in categories:
+            categories.remove(category)
+        elif category is None:
+            categories.clear()
+
+        if categories:
+            return
+
+        del self._categories[key]
+        del self._order[key]
+        self._trie_remove(key)
+        self._pattern = None
+
+    def _trie_remove(self, key):
+        path = [self._trie]
+        for char in key:
+            path.append(path[-1][char])
+        del path[-1][_END]
+
+        # Prune branches that no longer lead to any skill
+        for depth in range(len(key), 0, -1):
+            if path[depth]:
+                break
+            del path[depth - 1][key[depth - 1]]
+
+    def _trie_to_regex(self, node):
+        """Turn a trie node into a regex fragment with shared prefixes factored out"""
+        branches = []
+        for char in sorted(c for c in node if c != _END):
+            branches.append(re.escape(char) + self._trie_to_regex(node[char]))
+
+        if not branches:
+            return ''
+
+        optional = _END in node
+        if len(branches) == 1 and not optional:
+            return branches[0]
+
+        # Longer continuations go first; the trailing \b makes the engine
+        # backtrack to shorter skills when a longer one does not end on a boundary
+        group = '(?:' + '|'.join(branches) + ')'
+        return group + '?' if optional else group
+
+    def _compile(self):
+        # Skills that are a prefix of other skills; a match on the longer skill
+        # has to be re-checked for these so overlapping skills are all reported
+        self._prefixes = {}
+        for key in self._categories:
+            node = self._trie
+            for depth, char in enumerate(key[:-1], start=1):
+                node = node[char]
+                if _END in node:
+                    self._prefixes.setdefault(key, []).append(key[:depth])
+
+        body = self._trie_to_regex(self._trie)
+        if not body:
+            self._pattern = re.compile(r'(?!)')
+        else:
+            # Zero-width lookahead lets finditer try every word boundary, so
+            # skills that overlap at different offsets are still found
+            self._pattern = re.compile(r'\b(?=(' + body + r')\b)')
+        return self._pattern
+
+    @property
+    def pattern(self):
+        return self._pattern or self._compile()
+
+    def find_all(self, text):
+        """Return every skill occurrence as (skill, categories, start, end) in one pass"""
+        text_lower = text.lower()
+        pattern = self.pattern
+        matches = []
+
+        for match in pattern.finditer(text_lower):
+            start = match.start()
+            skill = match.group(1)
+            matches.append((skill, self._categories[skill], start, start + len(skill)))
+
+            for prefix in self._prefixes.get(skill, ()):
+                end = start + len(prefix)
+                if _is_boundary(text_lower, end):
+                    matches.append((prefix, self._categories[prefix], start, end))
+
+        return matches
+
+    def match(self, text):
+        """Return found skills grouped by category, in taxonomy order, with their positions"""
+        positions = {}
+        for skill, _, start, end in self.find_all(text):
+            positions.setdefault(skill, []).append((start, end))
+
+        found = {}
+        for skill in sorted(positions, key=self._order.__getitem__):
+            for category in self._categories[skill]:
+                found.setdefault(category, []).append({
+                    'name': skill,
+                    'category': category,
+                    'positions': positions[skill]
+                })
+        return found
+
+
+def _is_word_char(char):
+    return char.isalnum() or char == '_'
+
+
+def _is_boundary(text, index):
+    """Mirror of the regex \\b assertion at text[index]"""
+    before = index > 0 and _is_word_char(text[index - 1])
+    after = index < len(text) and _is_word_char(text[index])
+    return before != after
@@ -0,0 +1,150 @@
+"""
+File storage - content-addressed, reference-counted storage for uploaded resumes
+Each distinct file is stored once, named by its SHA-256 and sharded by hash
+prefix (ab/cd/abcd...ef.pdf), so no directory grows past a few thousand entries
+however many resumes are uploaded. The resumes rows pointing at a location are
+counted in stored_files by triggers, and delete_resume removes the file with its
+last reference. Stored files are read through read-only memory maps.
+"""
+
+import io
+from abc import ABC, abstractmethod
+import mmap
+import os
+import uuid
+
+# Directory levels under the root, two hex characters of the hash each
+SHARD_DEPTH = 2
+
+
+class MappedFile(io.RawIOBase):
+    """Read-only, seekable file object over a memory-mapped file
+
+    zipfile (docx2txt) and pdfminer (pdfplumber) read it in place, and processes
+    mapping the same file share its pages in the OS page cache.
+    """
+
+    def __init__(self, path):
+        super().__init__()
+        self.name = path
+        self._pos = 0
+        with open(path, 'rb') as fh:
+            size = os.fstat(fh.fileno()).st_size
+            # Empty files cannot be mapped
+            self._map = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def read(self, size=-1):
+        end = len(self._map) if size is None or size < 0 else self._pos + size
+        data = self._map[self._pos:end]
+        self._pos += len(data)
+        return data
+
+    def readinto(self, buffer):
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += len(self._map)
+        if offset < 0:
+            raise ValueError('Negative seek position')
+        self._pos = offset
+        return offset
+
+    def tell(self):
+        return self._pos
+
+    def getvalue(self):
+        """The whole file as bytes (PyMuPDF only opens streams given as bytes)"""
+        return self._map[:]
+
+    def close(self):
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        super().close()
+
+
+class FileStore(ABC):
+    """Where uploaded files live
+
+    A location is an opaque string kept in resumes.file_path; the analysis
+    workers only ever open locations, so an object store can implement this
+    interface by downloading (or range-reading) in open().
+    """
+
+    @abstractmethod
+    def temp_path(self):
+        """A new local path to stream an incoming upload to"""
+
+    @abstractmethod
+    def location(self, content_hash, extension):
+        """Where the file with this SHA-256 and extension is stored"""
+
+    @abstractmethod
+    def put(self, temp_path, location):
+        """Move a finished upload to its location, or drop it when that content is already stored
+
+        Called inside the transaction that adds the resumes rows referencing the
+        location, so a concurrent delete of its last reference cannot remove the
+        file in between.
+        """
+
+    @abstractmethod
+    def open(self, location):
+        """A seekable, read-only file object with the stored file's bytes
+
+        Its name is a local path when the file has one (PDF page ranges are then
+        extracted in other processes).
+        """
+
+    @abstractmethod
+    def remove(self, location):
+        """Delete a stored file whose last reference is gone"""
+
+
+class LocalFileStore(FileStore):
+    """Files under a local directory, sharded by hash prefix and opened as memory maps"""
+
+    def __init__(self, root, shard_depth=SHARD_DEPTH):
+        self.root = root
+        self.shard_depth = shard_depth
+        self.temp_dir = os.path.join(root, 'tmp')
+
+    def temp_path(self):
+        os.makedirs(self.temp_dir, exist_ok=True)
+        return os.path.join(self.temp_dir, uuid.uuid4().hex)
+
+    def location(self, content_hash, extension):
+        shards = [content_hash[level * 2:level * 2 + 2] for level in range(self.shard_depth)]
+        return os.path.join(self.root, *shards, content_hash + extension)
+
+    def put(self, temp_path, location):
+        if os.path.exists(location):
+            os.remove(temp_path)
+            return
+        os.makedirs(os.path.dirname(location), exist_ok=True)
+        os.replace(temp_path, location)
+
+    def open(self, location):
+        # Locations are plain paths, so files saved before the sharded layout open too
+        return MappedFile(location)
+
+    def remove(self, location):
+        if os.path.exists(location):
+            os.remove(location)
+
+
+def make_file_store(kind, root):
+    """Build a file store from a config name: 'local'"""
+    if kind == 'local':
+        return LocalFileStore(root)
+    raise ValueError(f"Unknown file store: {kind}")